@@ -37,6 +37,7 @@ from cl.runtime.routers.tasks.run_response_item import handler_queue
 from cl.runtime.tasks.instance_method_task import InstanceMethodTask
 from cl.convince.llms.llm_key import LlmKey
 from cl.convince.retrievers.annotating_retrieval import AnnotatingRetrieval
+from cl.convince.retrievers.retriever_key import RetrieverKey
 from cl.tradeentry.entries.date_entry import DateEntry
 from cl.tradeentry.entries.number_entry import NumberEntry
 from cl.hackathon.hackathon_input import HackathonInput
@@ -170,10 +171,8 @@ class HackathonSolution(HackathonSolutionKey, RecordMixin[HackathonSolutionKey],
             filtered_retrievals = []
             for output in self.get_outputs():
                 current_retriever_id = f"{self.solution_id}::{self.trade_group}::{output.trade_id}::{output.trial_id}"
-                retrievals = context.load_all(AnnotatingRetrieval)
-                filtered_retrievals.extend(
-                    [retrieval for retrieval in retrievals if retrieval.retriever.retriever_id == current_retriever_id]
-                )
+                retrieval_filter = AnnotatingRetrieval(retriever=RetrieverKey(retriever_id=current_retriever_id))
+                filtered_retrievals.extend(context.load_filter(AnnotatingRetrieval, retrieval_filter))
 
             if filtered_retrievals:
                 return filtered_retrievals
@@ -207,24 +206,19 @@ class HackathonSolution(HackathonSolutionKey, RecordMixin[HackathonSolutionKey],
     def get_inputs(self) -> List[HackathonInput]:
         """Return the list of inputs specified by the trade list."""
 
-        # Refactor with loading by filter
-        inputs = Context.current().load_all(HackathonInput)
+        # Load inputs for trade_group
+        inputs = Context.current().load_filter(HackathonInput, HackathonInput(trade_group=self.trade_group))
 
-        # Filter inputs by trade_group and trade_ids
+        # Filter inputs by trade_ids
         trade_ids_list = self.get_trade_ids_list() if self.trade_ids is not None else None
-        result = [
-            x
-            for x in inputs
-            if x.trade_group == self.trade_group and ((trade_ids_list is None) or (int(x.trade_id) in trade_ids_list))
-        ]
+        result = [x for x in inputs if (trade_ids_list is None) or (int(x.trade_id) in trade_ids_list)]
         result = sorted(result, key=lambda x: int(x.trade_id))
         return result
 
     def get_outputs(self) -> List[HackathonOutput]:
         """Return the list of outputs (each with its score)."""
-        outputs = Context.current().load_all(HackathonOutput)
-        result = [x for x in outputs if x.solution.solution_id == self.solution_id]
-        result = sorted(result, key=lambda x: int(x.trade_id))
+        outputs = Context.current().load_filter(HackathonOutput, HackathonOutput(solution=self.get_key()))
+        result = sorted(outputs, key=lambda x: int(x.trade_id))
         return result
 
     @abstractmethod
@@ -544,8 +538,8 @@ class HackathonSolution(HackathonSolutionKey, RecordMixin[HackathonSolutionKey],
             )
 
         context = Context.current()
-        scoring_items = context.load_all(HackathonScoreItem)
-        filtered_scoring_items = [item for item in scoring_items if item.solution == self.get_key()]
+        scoring_items_filter = HackathonScoreItem(solution=self.get_key())
+        filtered_scoring_items = list(context.load_filter(HackathonScoreItem, scoring_items_filter))
         if len(filtered_scoring_items) == 0:
             raise UserError("Heatmap will be generated after running Analyze.")
 
@@ -612,8 +606,9 @@ class HackathonSolution(HackathonSolutionKey, RecordMixin[HackathonSolutionKey],
         context = Context.current()
         inputs = self.get_inputs()
 
-        # Load all hackathon outputs
-        all_outputs = context.load_all(HackathonOutput)
+        # Load hackathon outputs for this solution
+        self_key = self.get_key()
+        all_outputs = list(context.load_filter(HackathonOutput, HackathonOutput(solution=self_key)))
 
         # Identify fields to compare, excluding key fields and 'entry_text'
         first_output = all_outputs[0]
@@ -636,12 +631,10 @@ class HackathonSolution(HackathonSolutionKey, RecordMixin[HackathonSolutionKey],
             )
 
             # Filter outputs corresponding to the current input
-            self_key = self.get_key()
             filtered_outputs = [
                 output
                 for output in all_outputs
-                if output.solution == self_key
-                and output.trade_group == input_.trade_group
+                if output.trade_group == input_.trade_group
                 and output.trade_id == input_.trade_id
             ]
 
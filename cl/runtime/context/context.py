@@ -15,6 +15,8 @@
 import logging
 from contextvars import ContextVar
 from dataclasses import dataclass
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import Iterable
 from typing import List
@@ -24,6 +26,7 @@ from cl.convince.llms.llm_key import LlmKey
 from cl.runtime.backend.core.user_key import UserKey
 from cl.runtime.context.context_key import ContextKey
 from cl.runtime.db.db_key import DbKey
+from cl.runtime.db.db_page import DbPage
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.experiments.experiment_key import ExperimentKey
@@ -37,6 +40,7 @@ from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import is_key
 from cl.runtime.records.record_mixin import RecordMixin
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from cl.runtime.settings.context_settings import ContextSettings
 
 root_context_types_str = """
@@ -199,7 +203,15 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         # TODO: Support resource disposal for the database
         if self.db is not None:
             # TODO: Finalize approach to disposal self.db.disconnect()
-            pass
+            if exc_type is None:
+                # Write records buffered by the database
+                self.db.flush()
+            else:
+                try:
+                    self.db.flush()
+                except Exception:  # noqa
+                    # Propagate exception from the block, records that were not written remain buffered
+                    pass
 
         # Return False to propagate exception to the caller
         return False
@@ -308,6 +320,112 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             identity=identity,
         )
 
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        """
+        Load a page of records of the specified type and its subtypes sorted by key, starting after 'after_key'.
+        Pass 'next_token' of the returned page as 'after_key' to load the next page.
+
+        Args:
+            record_type: Record type to load, error if the result is not this type or its subclass
+            after_key: Key of the last record on the previous page or the token returned with it, None for first page
+            limit: Maximum number of records on the page
+            order: Sort order of the keys
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        return self.db.load_page(  # noqa
+            record_type,
+            after_key=after_key,
+            limit=limit,
+            order=order,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        """
+        Check if a record exists for each key without loading it, the result has the same order as 'keys'
+        and is False for None keys.
+
+        Args:
+            keys: Iterable of keys, may include keys of different types
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        return self.db.exists_many(  # noqa
+            keys,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Count records of the specified type and its subtypes without loading them, if 'filter_obj' is specified
+        count only the records where values of those fields that are set in the filter match the filter.
+
+        Args:
+            record_type: Record type to count
+            filter_obj: Optional instance of 'record_type' whose fields are used for the query
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        return self.db.count(  # noqa
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        """
+        Load up to 'limit' records of the specified type and its subtypes sorted by key, where one of the search fields
+        specified in SearchSettings for the record type contains 'query' as a case-insensitive substring.
+
+        Args:
+            record_type: Record type to search
+            query: Text to search for in the search fields
+            limit: Maximum number of records returned
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        return self.db.search(  # noqa
+            record_type,
+            query,
+            limit=limit,
+            dataset=dataset,
+            identity=identity,
+        )
+
     def save_one(
         self,
         record: RecordProtocol | None,
@@ -395,6 +513,205 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             identity=identity,
         )
 
+    async def aload_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        """Async counterpart of 'load_one', see 'load_one' for the description of arguments."""
+        return await self.db.aload_one(  # noqa
+            record_type,
+            record_or_key,
+            dataset=dataset,
+            identity=identity,
+            is_key_optional=is_key_optional,
+            is_record_optional=is_record_optional,
+        )
+
+    async def aload_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async counterpart of 'load_many' returning a list, see 'load_many' for the description of arguments."""
+        return await self.db.aload_many(  # noqa
+            record_type,
+            records_or_keys,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aload_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async counterpart of 'load_all' returning a list, see 'load_all' for the description of arguments."""
+        return await self.db.aload_all(  # noqa
+            record_type,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aload_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        """Async counterpart of 'load_filter' returning a list, see 'load_filter' for the description of arguments."""
+        return await self.db.aload_filter(  # noqa
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aload_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        """Async counterpart of 'load_page', see 'load_page' for the description of arguments."""
+        return await self.db.aload_page(  # noqa
+            record_type,
+            after_key=after_key,
+            limit=limit,
+            order=order,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aexists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        """Async counterpart of 'exists_many', see 'exists_many' for the description of arguments."""
+        return await self.db.aexists_many(  # noqa
+            keys,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def acount(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async counterpart of 'count', see 'count' for the description of arguments."""
+        return await self.db.acount(  # noqa
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def asearch(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        """Async counterpart of 'search', see 'search' for the description of arguments."""
+        return await self.db.asearch(  # noqa
+            record_type,
+            query,
+            limit=limit,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def asave_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'save_one', see 'save_one' for the description of arguments."""
+        await self.db.asave_one(  # noqa
+            record,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def asave_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'save_many', see 'save_many' for the description of arguments."""
+        await self.db.asave_many(  # noqa
+            records,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def adelete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'delete_one', see 'delete_one' for the description of arguments."""
+        await self.db.adelete_one(  # noqa
+            key_type,
+            key,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def adelete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'delete_many', see 'delete_many' for the description of arguments."""
+        await self.db.adelete_many(  # noqa
+            keys,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def run_in_executor(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a synchronous function that accesses the database in the executor of the context database
+        without blocking the event loop, the current context remains current inside the function.
+        """
+        return await self.db.run_in_executor(func, *args, **kwargs)  # noqa
+
     def delete_all_and_drop_db(self) -> None:
         """
         IMPORTANT: !!! DESTRUCTIVE - THIS WILL PERMANENTLY DELETE ALL RECORDS WITHOUT THE POSSIBILITY OF RECOVERY
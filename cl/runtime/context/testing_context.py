@@ -18,6 +18,7 @@ from cl.runtime.backend.core.user_key import UserKey
 from cl.runtime.context.context import Context
 from cl.runtime.context.env_util import EnvUtil
 from cl.runtime.db.dataset_util import DatasetUtil
+from cl.runtime.db.sql.in_memory_sqlite_db import InMemorySqliteDb
 from cl.runtime.experiments.experiment_key import ExperimentKey
 from cl.runtime.experiments.trial_key import TrialKey
 from cl.runtime.primitive.string_util import StringUtil
@@ -114,6 +115,10 @@ class TestingContext(Context):
 
         # Do not execute this code on deserialized context instances (e.g. when they are passed to a task queue)
         if not self.is_deserialized:
+            # Save in-memory database to disk for investigation if the test fails
+            if exc_type is not None and isinstance(self.db, InMemorySqliteDb):
+                self.db.backup_to_file()
+
             # Delete all data in temp database and drop DB to clean up
             self.db.delete_all_and_drop_db()  # noqa
 
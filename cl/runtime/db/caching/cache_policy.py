@@ -0,0 +1,26 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, kw_only=True)
+class CachePolicy:
+    """Caching rules for records of one key type in CachingDb."""
+
+    ttl: float | None = None
+    """Time in seconds after which a cached record is loaded again from the database, no expiry if None."""
+
+    is_pinned: bool = False
+    """If True, records are not evicted when the number of cached records exceeds the limit."""
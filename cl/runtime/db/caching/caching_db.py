@@ -0,0 +1,430 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import Type
+from typing import cast
+from typing_extensions import Self
+from cl.runtime.db.caching.cache_policy import CachePolicy
+from cl.runtime.db.dataset_util import DatasetUtil
+from cl.runtime.db.db import Db
+from cl.runtime.db.db_page import DbPage
+from cl.runtime.db.local.local_cache_stats import LocalCacheStats
+from cl.runtime.db.local.local_cache_table import get_key_tuple
+from cl.runtime.db.protocols import TKey
+from cl.runtime.db.protocols import TRecord
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+
+TTableKey = Tuple[str | None, Type]
+"""Dataset and key type of a cached table."""
+
+
+@dataclass(slots=True)
+class _CachedTable:
+    """Cached records of one key type in one dataset."""
+
+    entries: OrderedDict[Tuple, Tuple[RecordProtocol, float]] = field(default_factory=OrderedDict)
+    """Record and the time when it was cached by key tuple in the order of access from least to most recent."""
+
+    version: int | None = None
+    """Version stamp of the database table when the records were cached."""
+
+    version_checked_at: float | None = None
+    """Time when the version stamp was last compared with the database."""
+
+
+@dataclass(slots=True, kw_only=True)
+class CachingDb(Db):
+    """
+    Wraps another database to serve repeated loads by key from an in-process cache, saves and deletes
+    are written to the database and the cache together. Records written by other processes are detected
+    using table version stamps if supported by the wrapped database, and otherwise using TTL.
+
+    Notes:
+        - Cached records are returned without copying and must not be modified by the caller
+        - Methods other than load_one and load_many are passed to the wrapped database without caching
+    """
+
+    db: Db
+    """Wrapped database."""
+
+    default_policy: CachePolicy | None = field(default_factory=CachePolicy)
+    """Policy for key types not included in 'policies', records of these types are not cached if None."""
+
+    policies: Dict[Type, CachePolicy | None] = field(default_factory=dict)
+    """Policy for each key type, use set_policy to specify policy for a record type."""
+
+    max_records: int | None = None
+    """Maximum number of cached records for each key type which is not pinned, no limit if None."""
+
+    version_check_interval: float | None = 1.0
+    """
+    Minimum time in seconds between comparisons of table version stamp with the database,
+    zero to compare before every load, and None to skip comparisons. Writes by other processes
+    may remain unnoticed for up to this time.
+    """
+
+    __tables: Dict[TTableKey, _CachedTable] = field(default_factory=lambda: {})
+    """Cached records for each dataset and key type."""
+
+    __stats: LocalCacheStats = field(default_factory=LocalCacheStats)
+    """Counters for lookups and evictions."""
+
+    __lock: threading.RLock = field(default_factory=threading.RLock)
+    """Lock for access from multiple threads."""
+
+    def init(self) -> Self:
+        """Similar to __init__ but can use fields set after construction, return self to enable method chaining."""
+        if self.max_records is not None and self.max_records < 1:
+            raise RuntimeError(f"{type(self).__name__} field 'max_records' must be positive or None.")
+        return self
+
+    def set_policy(self, record_type: Type, policy: CachePolicy | None) -> None:
+        """Set policy for the key type of 'record_type', records of this type are not cached if policy is None."""
+        key_type = record_type.get_key_type()
+        with self.__lock:
+            self.policies[key_type] = policy
+            for table_key in [x for x in self.__tables if x[1] is key_type]:
+                del self.__tables[table_key]
+
+    def get_stats(self) -> LocalCacheStats:
+        """Copy of the counters for lookups and evictions."""
+        with self.__lock:
+            return LocalCacheStats(
+                hits=self.__stats.hits,
+                misses=self.__stats.misses,
+                evictions=self.__stats.evictions,
+            )
+
+    def clear_cache(self) -> None:
+        """Remove all cached records, they will be loaded from the database on next access."""
+        with self.__lock:
+            self.__tables.clear()
+
+    def load_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        # Check for an empty key
+        if record_or_key is None:
+            if is_key_optional:
+                return None
+            else:
+                raise UserError(f"Key is None when trying to load record type {record_type.__name__} from DB.")
+
+        result = self.load_many(record_type, [record_or_key], dataset=dataset, identity=identity)[0]
+
+        # Check if the record was not found
+        if not is_record_optional and result is None:
+            raise UserError(f"{record_type.__name__} record is not found for key {record_or_key}")
+        return result
+
+    def load_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        if records_or_keys is None:
+            return None
+
+        # Records with row-level security may differ by identity, do not cache
+        if identity is not None:
+            return self.db.load_many(record_type, records_or_keys, dataset=dataset, identity=identity)
+
+        # Compare version stamps once per table in each call before taking cached records
+        result = list(records_or_keys)
+        now = time.monotonic()
+        self._check_table_versions(
+            {
+                (dataset, x.get_key_type())
+                for x in result
+                if x is not None
+                and getattr(x, "get_key", None) is None
+                and getattr(x, "get_key_type", None) is not None
+            },
+            now,
+        )
+
+        # Take cached records and collect positions of the keys that must be loaded from the database
+        missing_positions: List[int] = []
+        with self.__lock:
+            for position, record_or_key in enumerate(result):
+                if record_or_key is None or getattr(record_or_key, "get_key", None) is not None:
+                    # Record or None, return without lookup
+                    continue
+                elif getattr(record_or_key, "get_key_type", None) is not None:
+                    key_type = record_or_key.get_key_type()
+                    if (policy := self._get_policy(key_type)) is None:
+                        # Not cached
+                        missing_positions.append(position)
+                        continue
+                    table = self._get_table((dataset, key_type))
+                    key_tuple = get_key_tuple(record_or_key)
+                    if (entry := table.entries.get(key_tuple, None)) is not None and (
+                        policy.ttl is None or now - entry[1] < policy.ttl
+                    ):
+                        table.entries.move_to_end(key_tuple)
+                        result[position] = entry[0]
+                        self.__stats.hits += 1
+                    else:
+                        missing_positions.append(position)
+                        self.__stats.misses += 1
+                else:
+                    raise RuntimeError(f"Type {record_or_key.__class__.__name__} is not a record or key.")
+
+        # Load the remaining keys from the database using a single call
+        if missing_positions:
+            loaded_records = self.db.load_many(
+                record_type, [result[position] for position in missing_positions], dataset=dataset
+            )
+            loaded_records = list(loaded_records)
+            for position, record in zip(missing_positions, loaded_records):
+                result[position] = record
+            self._put_records([x for x in loaded_records if x is not None], dataset, now)
+        return result
+
+    def load_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        return self.db.load_all(record_type, dataset=dataset, identity=identity)
+
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        return self.db.load_filter(record_type, filter_obj, dataset=dataset, identity=identity)
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        return self.db.exists_many(keys, dataset=dataset, identity=identity)
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        return self.db.count(record_type, filter_obj, dataset=dataset, identity=identity)
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        return self.db.search(record_type, query, limit=limit, dataset=dataset, identity=identity)
+
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        return self.db.load_page(
+            record_type, after_key=after_key, limit=limit, order=order, dataset=dataset, identity=identity
+        )
+
+    def save_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.save_many([record], dataset=dataset, identity=identity)
+
+    def save_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        # Write to the database first so that the cache is not updated if the write fails
+        records = [x for x in records if x is not None]
+        self.db.save_many(records, dataset=dataset, identity=identity)
+        if identity is None:
+            self._remove_records([x.get_key() for x in records], dataset)
+            self._put_records(records, dataset, time.monotonic())
+
+    def delete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.delete_many([key], dataset=dataset, identity=identity)
+
+    def delete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        if keys is None:
+            return
+        keys = [x for x in keys if x is not None]
+        self.db.delete_many(keys, dataset=dataset, identity=identity)
+        self._remove_records(keys, dataset)
+
+    def delete_all_and_drop_db(self) -> None:
+        self.db.delete_all_and_drop_db()
+        self.clear_cache()
+
+    def close_connection(self) -> None:
+        self.db.close_connection()
+
+    def flush(self) -> None:
+        self.db.flush()
+
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        return self.db.get_table_version(key_type, dataset=dataset)
+
+    def get_executor(self) -> Executor | None:
+        return self.db.get_executor()
+
+    def _get_policy(self, key_type: Type) -> CachePolicy | None:
+        """Policy for the key type, None if records of this type are not cached."""
+        return self.policies[key_type] if key_type in self.policies else self.default_policy
+
+    def _get_table(self, table_key: TTableKey) -> _CachedTable:
+        """Get cached table without comparing version stamp, create if it does not exist."""
+        if (result := self.__tables.get(table_key, None)) is None:
+            result = _CachedTable()
+            self.__tables[table_key] = result
+        return result
+
+    def _get_descendant_tables(self, dataset: str | None, key_type: Type) -> List[_CachedTable]:
+        """Get cached tables for the key type in the dataset and its descendant datasets."""
+        levels = DatasetUtil.to_levels(dataset)
+        return [
+            table
+            for (table_dataset, table_key_type), table in self.__tables.items()
+            if table_key_type is key_type and DatasetUtil.to_levels(table_dataset)[: len(levels)] == levels
+        ]
+
+    def _check_table_versions(self, table_keys: Iterable[TTableKey], now: float) -> None:
+        """
+        Clear cached records of the tables whose database version has changed since they were cached, comparing
+        only the tables for which version_check_interval has elapsed. The versions are queried outside the lock
+        and applied only to the tables that were not compared by another thread in the meantime.
+        """
+        if self.version_check_interval is None:
+            return
+
+        # Find the tables to compare and the time of their previous comparison
+        with self.__lock:
+            checked_at_dict = {}
+            for table_key in table_keys:
+                if self._get_policy(table_key[1]) is None:
+                    continue
+                table = self._get_table(table_key)
+                if table.version_checked_at is None or now - table.version_checked_at >= self.version_check_interval:
+                    checked_at_dict[table_key] = table.version_checked_at
+
+        # Query the versions without holding the lock so that other threads are not blocked by the database
+        versions = {x: self.db.get_table_version(x[1], dataset=x[0]) for x in checked_at_dict}
+
+        with self.__lock:
+            for table_key, version in versions.items():
+                table = self._get_table(table_key)
+                if table.version_checked_at != checked_at_dict[table_key]:
+                    # Another thread has compared the version in the meantime
+                    continue
+                if version != table.version:
+                    table.entries.clear()
+                    table.version = version
+                table.version_checked_at = now
+
+    def _remove_records(self, keys: Iterable[KeyProtocol], dataset: str | None) -> None:
+        """
+        Remove cached records for the keys written to the dataset, including the records cached for its
+        descendant datasets because they may have been found in this dataset by hierarchical lookup.
+        """
+        with self.__lock:
+            for key in keys:
+                key_tuple = get_key_tuple(key)
+                for table in self._get_descendant_tables(dataset, key.get_key_type()):
+                    table.entries.pop(key_tuple, None)
+
+    def _put_records(self, records: Iterable[RecordProtocol], dataset: str | None, now: float) -> None:
+        """
+        Add or replace cached records for the key types that are cached and evict records above the limit.
+
+        The version stamp is not updated here because another process may have written to the table
+        after these records were loaded or saved, they remain cached under the version observed earlier
+        and are cleared on the next comparison if the version has changed since then.
+        """
+        with self.__lock:
+            for record in records:
+                key_type = record.get_key_type()
+                if (policy := self._get_policy(key_type)) is None:
+                    continue
+                table = self._get_table((dataset, key_type))
+                key_tuple = get_key_tuple(record.get_key())
+                table.entries[key_tuple] = (cast(RecordProtocol, record), now)
+                table.entries.move_to_end(key_tuple)
+
+                # Evict the least recently used records
+                if self.max_records is not None and not policy.is_pinned:
+                    while len(table.entries) > self.max_records:
+                        table.entries.popitem(last=False)
+                        self.__stats.evictions += 1
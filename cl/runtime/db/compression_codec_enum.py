@@ -0,0 +1,28 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import IntEnum
+
+
+class CompressionCodecEnum(IntEnum):
+    """Codec used to compress large string and binary values stored in a database."""
+
+    NONE = 0
+    """Value is stored without compression."""
+
+    ZLIB = 1
+    """Deflate format from the Python standard library, slower than zstd with a lower compression ratio."""
+
+    ZSTD = 2
+    """Zstandard format, requires zstandard package."""
@@ -0,0 +1,106 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import zlib
+from typing import Any
+from cl.runtime.db.compression_codec_enum import CompressionCodecEnum
+from cl.runtime.settings.compression_settings import CompressionSettings
+
+compressed_value_prefix = b"\x00clz"
+"""Marks a stored value produced by CompressionUtil, followed by one byte for codec and one byte for value type."""
+
+_header_size = len(compressed_value_prefix) + 2
+"""Size of the prefix followed by codec and value type bytes."""
+
+_bytes_type_code = 0
+"""Value type code of a binary value."""
+
+_str_type_code = 1
+"""Value type code of a string value encoded as UTF-8."""
+
+
+class CompressionUtil:
+    """
+    Transparent compression of large string and binary values stored in a database. Compressed values are stored
+    as binary with a prefix identifying the codec, values stored without the prefix are read unchanged.
+    """
+
+    @classmethod
+    def compress_value(cls, value: Any) -> Any:
+        """
+        Compress str or bytes value whose size is at least the threshold specified in CompressionSettings,
+        return other values, and values for which compression does not reduce size, unchanged.
+        """
+        if isinstance(value, str):
+            type_code = _str_type_code
+        elif isinstance(value, bytes):
+            type_code = _bytes_type_code
+        else:
+            return value
+
+        compression_settings = CompressionSettings.instance()
+        if len(value) < compression_settings.threshold:
+            if type_code == _bytes_type_code and value.startswith(compressed_value_prefix):
+                # Binary value that would be mistaken for a compressed value is stored with a header
+                return cls._add_header(value, CompressionCodecEnum.NONE, type_code)
+            return value
+
+        data = value.encode("utf-8") if type_code == _str_type_code else value
+        codec = compression_settings.get_codec()
+        level = compression_settings.level
+        if codec == CompressionCodecEnum.ZSTD:
+            import zstandard
+
+            compressed_data = zstandard.compress(data, level if level is not None else 3)
+        elif codec == CompressionCodecEnum.ZLIB:
+            compressed_data = zlib.compress(data, level if level is not None else -1)
+        else:
+            compressed_data = None
+
+        if compressed_data is not None and len(compressed_data) + _header_size < len(data):
+            return cls._add_header(compressed_data, codec, type_code)
+        elif type_code == _bytes_type_code and value.startswith(compressed_value_prefix):
+            return cls._add_header(value, CompressionCodecEnum.NONE, type_code)
+        else:
+            return value
+
+    @classmethod
+    def decompress_value(cls, value: Any) -> Any:
+        """Restore the original str or bytes value if the value is compressed, otherwise return it unchanged."""
+        if not isinstance(value, bytes) or not value.startswith(compressed_value_prefix):
+            return value
+
+        codec = value[_header_size - 2]
+        type_code = value[_header_size - 1]
+        data = value[_header_size:]
+        if codec == CompressionCodecEnum.ZSTD:
+            import zstandard
+
+            data = zstandard.decompress(data)
+        elif codec == CompressionCodecEnum.ZLIB:
+            data = zlib.decompress(data)
+        elif codec != CompressionCodecEnum.NONE:
+            raise RuntimeError(f"Unknown compression codec {codec} in a value stored in the database.")
+
+        if type_code == _str_type_code:
+            return data.decode("utf-8")
+        elif type_code == _bytes_type_code:
+            return data
+        else:
+            raise RuntimeError(f"Unknown value type {type_code} in a compressed value stored in the database.")
+
+    @classmethod
+    def _add_header(cls, data: bytes, codec: CompressionCodecEnum, type_code: int) -> bytes:
+        """Add prefix followed by codec and value type bytes."""
+        return compressed_value_prefix + bytes((codec, type_code)) + data
@@ -13,21 +13,42 @@
 # limitations under the License.
 
 from __future__ import annotations
+import asyncio
+import contextvars
+import functools
+import heapq
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from typing import Any
+from typing import Callable
 from typing import ClassVar
+from typing import Dict
 from typing import Iterable
+from typing import List
 from typing import Type
+from cl.runtime.context.context import context_stack_var
 from cl.runtime.db.db_key import DbKey
+from cl.runtime.db.db_page import DbPage
+from cl.runtime.db.page_token_util import PageTokenUtil
+from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.records.class_info import ClassInfo
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import TKey
 from cl.runtime.records.protocols import TQuery
 from cl.runtime.records.protocols import TRecord
+from cl.runtime.records.protocols import is_key
 from cl.runtime.records.record_mixin import RecordMixin
+from cl.runtime.records.record_util import RecordUtil
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.serialization.string_serializer import StringSerializer
 from cl.runtime.settings.context_settings import ContextSettings
+from cl.runtime.settings.search_settings import SearchSettings
+
+_key_serializer = StringSerializer()
+"""Serializer for the keys used to sort records in the default implementation of load_page."""
 
 
 @dataclass(slots=True, kw_only=True)
@@ -119,6 +140,130 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
             identity: Identity token for database access and row-level security
         """
 
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        """
+        Load a page of records of the specified type and its subtypes sorted by key, starting after 'after_key'.
+        Pass 'next_token' of the returned page as 'after_key' to load the next page.
+
+        Notes:
+            The default implementation loads all records and selects the page in memory,
+            it should be overridden by databases that can query by key range.
+
+        Args:
+            record_type: Record type to load, error if the result is not this type or its subclass
+            after_key: Key of the last record on the previous page or the token returned with it, None for first page
+            limit: Maximum number of records on the page
+            order: Sort order of the keys
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        self._check_page_limit(limit)
+        records = self.load_all(record_type, dataset=dataset, identity=identity)
+        return self._select_page(record_type, records, after_key=after_key, limit=limit, order=order)
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        """
+        Check if a record exists for each key without loading it, the result has the same order as 'keys'
+        and is False for None keys.
+
+        Notes:
+            The default implementation loads the records and should be overridden
+            by databases that can check the keys without deserialization.
+
+        Args:
+            keys: Iterable of keys, may include keys of different types
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        keys = list(keys)
+        result = [False] * len(keys)
+        for key_type, positions in self._group_positions_by_key_type(keys).items():
+            records = self.load_many(key_type, [keys[x] for x in positions], dataset=dataset, identity=identity)
+            for position, record in zip(positions, records):
+                result[position] = record is not None
+        return result
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Count records of the specified type and its subtypes without loading them, if 'filter_obj' is specified
+        count only the records where values of those fields that are set in the filter match the filter.
+
+        Notes:
+            The default implementation loads the records and should be overridden
+            by databases that can count the records without deserialization.
+
+        Args:
+            record_type: Record type to count
+            filter_obj: Optional instance of 'record_type' whose fields are used for the query
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        if filter_obj is not None:
+            records = self.load_filter(record_type, filter_obj, dataset=dataset, identity=identity)
+        else:
+            records = self.load_all(record_type, dataset=dataset, identity=identity)
+        return sum(1 for record in records if record is not None)
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        """
+        Load up to 'limit' records of the specified type and its subtypes sorted by key, where one of the search fields
+        specified in SearchSettings for the record type contains 'query' as a case-insensitive substring.
+
+        Notes:
+            The default implementation loads all records and searches them in memory,
+            it should be overridden by databases that support a full-text search index.
+
+        Args:
+            record_type: Record type to search
+            query: Text to search for in the search fields
+            limit: Maximum number of records returned
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        self._check_search_query(record_type, query, limit)
+        search_settings = SearchSettings.instance()
+        folded_query = query.casefold()
+        result = []
+        for record in self.load_all(record_type, dataset=dataset, identity=identity):
+            if record is None:
+                continue
+            if any(
+                isinstance(value := getattr(record, field_name, None), str) and folded_query in value.casefold()
+                for field_name in search_settings.get_record_fields(type(record))
+            ):
+                result.append(record)
+        return RecordUtil.sort_records_by_key(result)[:limit]
+
     @abstractmethod
     def save_one(
         self,
@@ -189,6 +334,220 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
             identity: Identity token for database access and row-level security
         """
 
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        """
+        Version stamp of the table for the key type which changes on every write to this table,
+        including writes by other processes, or None if the database does not support version stamps.
+
+        Args:
+            key_type: Key type used to determine the database table
+            dataset: If specified, append to the root dataset of the database
+        """
+        return None
+
+    def get_executor(self) -> Executor | None:
+        """
+        Executor used by the async methods to run the synchronous methods without blocking the event loop,
+        or None to use the default executor of the running event loop.
+        """
+        return None
+
+    async def aload_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        """Async counterpart of 'load_one', see 'load_one' for the description of arguments."""
+        return await self.run_in_executor(
+            self.load_one,
+            record_type,
+            record_or_key,
+            dataset=dataset,
+            identity=identity,
+            is_key_optional=is_key_optional,
+            is_record_optional=is_record_optional,
+        )
+
+    async def aload_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async counterpart of 'load_many' returning a list, see 'load_many' for the description of arguments."""
+        return await self.run_in_executor(
+            _to_list,
+            self.load_many,
+            record_type,
+            records_or_keys,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aload_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async counterpart of 'load_all' returning a list, see 'load_all' for the description of arguments."""
+        return await self.run_in_executor(
+            _to_list,
+            self.load_all,
+            record_type,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aload_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        """Async counterpart of 'load_filter' returning a list, see 'load_filter' for the description of arguments."""
+        return await self.run_in_executor(
+            _to_list,
+            self.load_filter,
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aload_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        """Async counterpart of 'load_page', see 'load_page' for the description of arguments."""
+        return await self.run_in_executor(
+            self.load_page,
+            record_type,
+            after_key=after_key,
+            limit=limit,
+            order=order,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def aexists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        """Async counterpart of 'exists_many', see 'exists_many' for the description of arguments."""
+        return await self.run_in_executor(self.exists_many, keys, dataset=dataset, identity=identity)
+
+    async def acount(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async counterpart of 'count', see 'count' for the description of arguments."""
+        return await self.run_in_executor(self.count, record_type, filter_obj, dataset=dataset, identity=identity)
+
+    async def asearch(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        """Async counterpart of 'search', see 'search' for the description of arguments."""
+        return await self.run_in_executor(
+            self.search, record_type, query, limit=limit, dataset=dataset, identity=identity
+        )
+
+    async def asave_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'save_one', see 'save_one' for the description of arguments."""
+        await self.run_in_executor(self.save_one, record, dataset=dataset, identity=identity)
+
+    async def asave_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'save_many', see 'save_many' for the description of arguments."""
+        await self.run_in_executor(self.save_many, records, dataset=dataset, identity=identity)
+
+    async def adelete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'delete_one', see 'delete_one' for the description of arguments."""
+        await self.run_in_executor(self.delete_one, key_type, key, dataset=dataset, identity=identity)
+
+    async def adelete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async counterpart of 'delete_many', see 'delete_many' for the description of arguments."""
+        await self.run_in_executor(self.delete_many, keys, dataset=dataset, identity=identity)
+
+    async def run_in_executor(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a synchronous function in the executor of this database without blocking the event loop,
+        context variables of the caller including the current context are visible inside the function.
+        """
+        loop = asyncio.get_running_loop()
+        caller_context = self._copy_caller_context()
+        return await loop.run_in_executor(
+            self.get_executor(), functools.partial(caller_context.run, func, *args, **kwargs)
+        )
+
+    @classmethod
+    def _copy_caller_context(cls) -> contextvars.Context:
+        """
+        Copy context variables of the caller to run a function in another thread, the current context
+        is visible inside the function and the context stack is isolated from the caller.
+        """
+        # Copy context variables so that the current context is visible inside the other thread
+        result = contextvars.copy_context()
+
+        # Replace the context stack with a copy so that 'with' clauses inside the thread
+        # do not modify the caller's stack
+        context_stack = context_stack_var.get()
+        result.run(context_stack_var.set, list(context_stack) if context_stack is not None else None)
+        return result
+
     @abstractmethod
     def delete_all_and_drop_db(self) -> None:
         """
@@ -203,6 +562,78 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
     def close_connection(self) -> None:
         """Close database connection to releasing resource locks."""
 
+    def flush(self) -> None:
+        """Write records buffered by the database, the default implementation does nothing."""
+
+    @classmethod
+    def _group_positions_by_key_type(cls, keys: List[KeyProtocol | None]) -> Dict[Type, List[int]]:
+        """Positions of the keys for each key type in the order of first occurrence, None keys are skipped."""
+        result: Dict[Type, List[int]] = {}
+        for position, key in enumerate(keys):
+            if key is None:
+                continue
+            elif not is_key(key):
+                raise RuntimeError(f"Type {type(key).__name__} is not a key.")
+            result.setdefault(key.get_key_type(), []).append(position)
+        return result
+
+    @classmethod
+    def _check_page_limit(cls, limit: int) -> None:
+        """Error if the page size is not a positive integer."""
+        if not isinstance(limit, int) or limit < 1:
+            raise RuntimeError(f"Page size {limit} must be a positive integer.")
+
+    @classmethod
+    def _check_search_query(cls, record_type: Type, query: str, limit: int) -> None:
+        """Error if the search query is empty, the limit is not a positive integer or there are no search fields."""
+        if not isinstance(query, str) or query == "":
+            raise UserError("Search query must be a non-empty string.")
+        if not isinstance(limit, int) or limit < 1:
+            raise RuntimeError(f"Search limit {limit} must be a positive integer.")
+        if not SearchSettings.instance().get_table_fields(record_type.get_key_type()):
+            raise UserError(
+                f"Search fields are not specified for {record_type.__name__} or other types stored in "
+                f"the same table, specify them in the '{SearchSettings.get_prefix()}_fields' setting."
+            )
+
+    @classmethod
+    def _select_page(
+        cls,
+        record_type: Type[TRecord],
+        records: Iterable[TRecord | None],
+        *,
+        after_key: KeyProtocol | str | None,
+        limit: int,
+        order: IndexSortOrderEnum,
+    ) -> DbPage:
+        """Select a page from records in arbitrary order, keys are compared using their string representation."""
+        after_key = PageTokenUtil.to_key(record_type.get_key_type(), after_key)
+        after_str = _key_serializer.serialize_key(after_key) if after_key is not None else None
+        is_descending = order == IndexSortOrderEnum.DESCENDING
+
+        # Keep records after 'after_key' in the sort order
+        sort_items = []
+        for record in records:
+            if record is None:
+                continue
+            key_str = _key_serializer.serialize_key(record)
+            if after_str is None or (key_str < after_str if is_descending else key_str > after_str):
+                sort_items.append((key_str, record))
+
+        # Select one more record than the limit to determine if there is a next page
+        select_func = heapq.nlargest if is_descending else heapq.nsmallest
+        page_items = select_func(limit + 1, sort_items, key=lambda x: x[0])
+        return cls._create_page([record for _, record in page_items], limit)
+
+    @classmethod
+    def _create_page(cls, records: List[TRecord], limit: int) -> DbPage:
+        """Create page from up to limit + 1 sorted records, the extra record indicates that there is a next page."""
+        if len(records) > limit:
+            records = records[:limit]
+            return DbPage(records=records, next_token=PageTokenUtil.to_token(records[-1].get_key()))
+        else:
+            return DbPage(records=records)
+
     @classmethod
     def default(cls) -> Db:
         """Default database is initialized from settings and cannot be modified in code."""
@@ -219,3 +650,9 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
                 Db.__default = db_type(db_id=context_id)
 
         return Db.__default
+
+
+def _to_list(func: Callable[..., Iterable | None], *args, **kwargs) -> List | None:
+    """Invoke the function and convert the result to list so that lazy iterables are consumed in the same thread."""
+    result = func(*args, **kwargs)
+    return list(result) if result is not None else None
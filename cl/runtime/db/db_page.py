@@ -0,0 +1,28 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from typing import List
+from cl.runtime.records.protocols import RecordProtocol
+
+
+@dataclass(slots=True, kw_only=True)
+class DbPage:
+    """Page of records returned by 'Db.load_page' together with the token to load the next page."""
+
+    records: List[RecordProtocol]
+    """Records on this page sorted by key in the requested order."""
+
+    next_token: str | None = None
+    """Opaque token passed as 'after_key' to load the next page, None if this is the last page."""
@@ -0,0 +1,103 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from dataclasses import field
+from typing import List
+from typing import Tuple
+
+latency_bucket_bounds: Tuple[float, ...] = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+"""Upper bounds of latency histogram buckets in seconds, the last bucket holds calls above the highest bound."""
+
+
+@dataclass(slots=True, kw_only=True)
+class DbCallStats:
+    """Counters for calls to one database method for one key type."""
+
+    db_id: str
+    """Identifier of the instrumented database."""
+
+    method: str
+    """Name of the database method, for example 'load_many'."""
+
+    key_type: str
+    """Name of the key type, or 'Multiple' if records of several key types were passed in the same call."""
+
+    call_count: int = 0
+    """Number of calls including those that raised an error."""
+
+    error_count: int = 0
+    """Number of calls that raised an error."""
+
+    row_count: int = 0
+    """Number of records returned by loads or passed to saves and deletes."""
+
+    total_seconds: float = 0.0
+    """Total wall clock time of the calls in seconds."""
+
+    max_seconds: float = 0.0
+    """Longest wall clock time of a single call in seconds."""
+
+    bucket_counts: List[int] = field(default_factory=lambda: [0] * (len(latency_bucket_bounds) + 1))
+    """Number of calls in each latency bucket, see 'latency_bucket_bounds'."""
+
+    sampled_count: int = 0
+    """Number of sampled calls for which the size of serialized records was measured."""
+
+    sampled_row_count: int = 0
+    """Number of records in the sampled calls."""
+
+    sampled_bytes: int = 0
+    """Size of serialized records in the sampled calls in bytes."""
+
+    def add_call(self, seconds: float, row_count: int, *, is_error: bool = False) -> None:
+        """Add a single call to the counters."""
+        self.call_count += 1
+        if is_error:
+            self.error_count += 1
+        self.row_count += row_count
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.bucket_counts[bisect_left(latency_bucket_bounds, seconds)] += 1
+
+    def add_sample(self, row_count: int, byte_count: int) -> None:
+        """Add the size of serialized records measured for a sampled call."""
+        self.sampled_count += 1
+        self.sampled_row_count += row_count
+        self.sampled_bytes += byte_count
+
+    def get_mean_seconds(self) -> float | None:
+        """Mean wall clock time of a call in seconds, None if there were no calls."""
+        return self.total_seconds / self.call_count if self.call_count > 0 else None
+
+    def get_bytes_per_row(self) -> float | None:
+        """Mean size of a serialized record in bytes estimated from the sampled calls, None if there are no samples."""
+        return self.sampled_bytes / self.sampled_row_count if self.sampled_row_count > 0 else None
+
+    def get_latency_quantile(self, quantile: float) -> float | None:
+        """
+        Upper bound of the latency bucket containing the specified quantile in seconds, None if there were
+        no calls and infinity if the quantile falls into the last bucket.
+        """
+        if self.call_count == 0:
+            return None
+        threshold = quantile * self.call_count
+        cumulative_count = 0
+        for bound, bucket_count in zip(latency_bucket_bounds, self.bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= threshold:
+                return bound
+        return float("inf")
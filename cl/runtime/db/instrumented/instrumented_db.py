@@ -0,0 +1,491 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import Type
+from typing_extensions import Self
+from cl.runtime.context.context import Context
+from cl.runtime.db.db import Db
+from cl.runtime.db.db_page import DbPage
+from cl.runtime.db.instrumented.db_call_stats import DbCallStats
+from cl.runtime.db.protocols import TKey
+from cl.runtime.db.protocols import TRecord
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.typed_flat_dict_serializer import _encode_json_default
+
+TStatsKey = Tuple[str, str, str]
+"""Database identifier, method name and key type name."""
+
+_stats_dict: Dict[TStatsKey, DbCallStats] = {}
+"""Counters for all instrumented databases in this process, stored outside the class to avoid serialization."""
+
+_stats_lock = threading.Lock()
+"""Lock for the counters."""
+
+_serializer = DictSerializer()
+"""Serializer used to measure the size of records in sampled calls."""
+
+multiple_key_types = "Multiple"
+"""Key type name used when records of several key types are passed in the same call."""
+
+
+@dataclass(slots=True, kw_only=True)
+class InstrumentedDb(Db):
+    """
+    Wraps another database to count calls, rows, latency and the size of serialized records
+    for each method and key type. Counting is always on, while the size of serialized records
+    is measured only for a random sample of calls which are also logged as spans at debug level.
+    """
+
+    db: Db
+    """Wrapped database."""
+
+    span_sample_rate: float = 0.01
+    """Fraction of calls for which the size of serialized records is measured and the span is logged."""
+
+    __logger: logging.Logger | None = None
+    """Logger obtained from the current context on the first sampled call."""
+
+    def init(self) -> Self:
+        """Similar to __init__ but can use fields set after construction, return self to enable method chaining."""
+        if not 0.0 <= self.span_sample_rate <= 1.0:
+            raise RuntimeError(f"{type(self).__name__} field 'span_sample_rate' must be between 0 and 1.")
+        return self
+
+    @classmethod
+    def get_all_stats(cls) -> List[DbCallStats]:
+        """Copy of the counters for all instrumented databases in this process."""
+        with _stats_lock:
+            return [replace(x, bucket_counts=list(x.bucket_counts)) for x in _stats_dict.values()]
+
+    def get_stats(self) -> List[DbCallStats]:
+        """Copy of the counters for this database."""
+        return [x for x in self.get_all_stats() if x.db_id == self.db_id]
+
+    def reset_stats(self) -> None:
+        """Reset the counters for this database."""
+        with _stats_lock:
+            for stats_key in [x for x in _stats_dict if x[0] == self.db_id]:
+                del _stats_dict[stats_key]
+
+    def log_stats(self) -> None:
+        """Write the counters for this database to the logger of the current context."""
+        logger = Context.current().get_logger(__name__)
+        for stats in self.get_stats():
+            logger.info(
+                f"Db {stats.db_id} {stats.method} {stats.key_type}: calls={stats.call_count} "
+                f"errors={stats.error_count} rows={stats.row_count} mean_seconds={stats.get_mean_seconds():.6f} "
+                f"max_seconds={stats.max_seconds:.6f} bytes_per_row={stats.get_bytes_per_row()}"
+            )
+
+    def load_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        start = time.perf_counter()
+        try:
+            result = self.db.load_one(
+                record_type,
+                record_or_key,
+                dataset=dataset,
+                identity=identity,
+                is_key_optional=is_key_optional,
+                is_record_optional=is_record_optional,
+            )
+        except Exception:
+            self._add_call("load_one", _get_key_type_name(record_type), start, is_error=True)
+            raise
+        self._add_call("load_one", _get_key_type_name(record_type), start, [result] if result is not None else [])
+        return result
+
+    def load_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        # The result has one item for each key and is returned as a list
+        return self._load(
+            "load_many", record_type, False, self.db.load_many, records_or_keys, dataset=dataset, identity=identity
+        )
+
+    def load_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        return self._load("load_all", record_type, True, self.db.load_all, dataset=dataset, identity=identity)
+
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        return self._load(
+            "load_filter", record_type, True, self.db.load_filter, filter_obj, dataset=dataset, identity=identity
+        )
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        keys = list(keys)
+        key_type_name = _get_common_key_type_name([x for x in keys if x is not None])
+        start = time.perf_counter()
+        try:
+            result = self.db.exists_many(keys, dataset=dataset, identity=identity)
+        except Exception:
+            self._add_call("exists_many", key_type_name, start, is_error=True)
+            raise
+        self._add_call("exists_many", key_type_name, start, row_count=len(keys))
+        return result
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        key_type_name = _get_key_type_name(record_type)
+        start = time.perf_counter()
+        try:
+            result = self.db.count(record_type, filter_obj, dataset=dataset, identity=identity)
+        except Exception:
+            self._add_call("count", key_type_name, start, is_error=True)
+            raise
+        self._add_call("count", key_type_name, start, row_count=0)
+        return result
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        key_type_name = _get_key_type_name(record_type)
+        start = time.perf_counter()
+        try:
+            result = self.db.search(record_type, query, limit=limit, dataset=dataset, identity=identity)
+        except Exception:
+            self._add_call("search", key_type_name, start, is_error=True)
+            raise
+        self._add_call("search", key_type_name, start, result)
+        return result
+
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        key_type_name = _get_key_type_name(record_type)
+        start = time.perf_counter()
+        try:
+            result = self.db.load_page(
+                record_type, after_key=after_key, limit=limit, order=order, dataset=dataset, identity=identity
+            )
+        except Exception:
+            self._add_call("load_page", key_type_name, start, is_error=True)
+            raise
+        self._add_call("load_page", key_type_name, start, result.records)
+        return result
+
+    def save_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        key_type_name = _get_key_type_name(type(record)) if record is not None else multiple_key_types
+        start = time.perf_counter()
+        try:
+            self.db.save_one(record, dataset=dataset, identity=identity)
+        except Exception:
+            self._add_call("save_one", key_type_name, start, is_error=True)
+            raise
+        self._add_call("save_one", key_type_name, start, [record] if record is not None else [])
+
+    def save_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        records = [x for x in records if x is not None]
+        key_type_name = _get_common_key_type_name(records)
+        start = time.perf_counter()
+        try:
+            self.db.save_many(records, dataset=dataset, identity=identity)
+        except Exception:
+            self._add_call("save_many", key_type_name, start, is_error=True)
+            raise
+        self._add_call("save_many", key_type_name, start, records)
+
+    def delete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            self.db.delete_one(key_type, key, dataset=dataset, identity=identity)
+        except Exception:
+            self._add_call("delete_one", key_type.__name__, start, is_error=True)
+            raise
+        self._add_call("delete_one", key_type.__name__, start, row_count=1 if key is not None else 0)
+
+    def delete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        keys = [x for x in keys if x is not None] if keys is not None else []
+        key_type_name = _get_common_key_type_name(keys)
+        start = time.perf_counter()
+        try:
+            self.db.delete_many(keys, dataset=dataset, identity=identity)
+        except Exception:
+            self._add_call("delete_many", key_type_name, start, is_error=True)
+            raise
+        self._add_call("delete_many", key_type_name, start, row_count=len(keys))
+
+    def delete_all_and_drop_db(self) -> None:
+        self.db.delete_all_and_drop_db()
+        self.reset_stats()
+
+    def close_connection(self) -> None:
+        self.db.close_connection()
+
+    def flush(self) -> None:
+        self.db.flush()
+
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        return self.db.get_table_version(key_type, dataset=dataset)
+
+    def get_executor(self) -> Executor | None:
+        return self.db.get_executor()
+
+    def _load(self, method_name: str, record_type: Type, is_lazy: bool, func, *args, **kwargs) -> Iterable | None:
+        """
+        Invoke a load method of the wrapped database and add the call to counters. If is_lazy is True, a lazy
+        result is returned as an iterator that adds the call when exhausted, closed or released, otherwise
+        the result is converted to a list. Only the time spent in the wrapped database is counted.
+        """
+        key_type_name = _get_key_type_name(record_type)
+        start = time.perf_counter()
+        records = None
+        is_lazy_result = False
+        try:
+            result = func(record_type, *args, **kwargs)
+            if is_lazy and result is not None and not isinstance(result, list):
+                is_lazy_result = True
+                return _InstrumentedIterator(self, method_name, key_type_name, result, time.perf_counter() - start)
+            elif result is not None and not isinstance(result, list):
+                result = list(result)
+            records = [x for x in result if x is not None] if result else []
+            return result
+        finally:
+            # The call with a lazy result is added by the iterator, records remain None on error
+            if not is_lazy_result:
+                self._add_call(method_name, key_type_name, start, records, is_error=records is None)
+
+    def _is_sampled(self) -> bool:
+        """Return True if the size of records is measured for this call, based on span_sample_rate."""
+        return random.random() < self.span_sample_rate
+
+    def _add_call(
+        self,
+        method_name: str,
+        key_type_name: str,
+        start: float | None,
+        records: List[RecordProtocol] | None = None,
+        *,
+        row_count: int | None = None,
+        byte_count: int | None = None,
+        seconds: float | None = None,
+        is_error: bool = False,
+    ) -> None:
+        """
+        Add the call that started at 'start' to the counters, or the call that took 'seconds' if start is None.
+        The size of records is measured for sampled calls if records are passed, or can be passed as byte_count
+        if measured by the caller.
+        """
+        if start is not None:
+            seconds = time.perf_counter() - start
+        if row_count is None:
+            row_count = len(records) if records is not None else 0
+
+        # Measure the size of serialized records outside the lock and only for sampled calls,
+        # calls without records (e.g. exists_many, delete_many or an empty load) are not included in the size samples
+        if row_count == 0 or is_error:
+            is_sampled = False
+        elif byte_count is not None:
+            is_sampled = True
+        elif records is not None and self._is_sampled():
+            is_sampled = True
+            byte_count = sum(_get_byte_count(x) for x in records)
+        else:
+            is_sampled = False
+
+        stats_key = (self.db_id, method_name, key_type_name)
+        with _stats_lock:
+            if (stats := _stats_dict.get(stats_key, None)) is None:
+                stats = DbCallStats(db_id=self.db_id, method=method_name, key_type=key_type_name)
+                _stats_dict[stats_key] = stats
+            stats.add_call(seconds, row_count, is_error=is_error)
+            if is_sampled:
+                stats.add_sample(row_count, byte_count)
+
+        if is_sampled:
+            if self.__logger is None:
+                self.__logger = Context.current().get_logger(__name__)
+            self.__logger.debug(
+                f"Db {self.db_id} {method_name} {key_type_name}: rows={row_count} bytes={byte_count} "
+                f"seconds={seconds:.6f}"
+            )
+
+
+class _InstrumentedIterator:
+    """
+    Iterator over a lazy load result that counts rows and the time spent in the wrapped database,
+    the call is added to counters once when the iterator is exhausted, closed or released.
+    """
+
+    __slots__ = ("_db", "_method_name", "_key_type_name", "_records", "_seconds", "_row_count", "_byte_count")
+
+    def __init__(self, db: InstrumentedDb, method_name: str, key_type_name: str, records: Iterable, seconds: float):
+        self._db = db
+        self._method_name = method_name
+        self._key_type_name = key_type_name
+        self._records = iter(records)
+        self._seconds = seconds
+        self._row_count = 0
+        self._byte_count = 0 if db._is_sampled() else None
+
+    def __iter__(self) -> Self:
+        return self
+
+    def __next__(self):
+        if self._records is None:
+            raise StopIteration
+        start = time.perf_counter()
+        try:
+            record = next(self._records)
+        except StopIteration:
+            self._seconds += time.perf_counter() - start
+            self._add_call(is_error=False)
+            raise
+        except Exception:
+            self._seconds += time.perf_counter() - start
+            self._add_call(is_error=True)
+            raise
+        self._seconds += time.perf_counter() - start
+
+        # Measure the size outside the time spent in the wrapped database
+        if record is not None:
+            self._row_count += 1
+            if self._byte_count is not None:
+                self._byte_count += _get_byte_count(record)
+        return record
+
+    def close(self) -> None:
+        """Stop the iteration and add the call to counters if not already added."""
+        if self._records is not None:
+            if (close := getattr(self._records, "close", None)) is not None:
+                close()
+            self._add_call(is_error=False)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:  # noqa
+            # Errors cannot be raised from a finalizer, the call remains uncounted
+            pass
+
+    def _add_call(self, *, is_error: bool) -> None:
+        """Add the call to counters and release the wrapped iterator."""
+        self._records = None
+        self._db._add_call(  # noqa
+            self._method_name,
+            self._key_type_name,
+            None,
+            row_count=self._row_count,
+            byte_count=self._byte_count if not is_error else None,
+            seconds=self._seconds,
+            is_error=is_error,
+        )
+
+
+def _get_byte_count(record: RecordProtocol) -> int:
+    """Size of the record serialized to JSON in bytes."""
+    return len(json.dumps(_serializer.serialize_data(record), default=_encode_json_default).encode())
+
+
+def _get_key_type_name(record_type: Type) -> str:
+    """Name of the key type for a record or key type."""
+    return record_type.get_key_type().__name__ if hasattr(record_type, "get_key_type") else record_type.__name__
+
+
+def _get_common_key_type_name(records_or_keys: List) -> str:
+    """Name of the key type if all records or keys have the same key type, otherwise 'Multiple'."""
+    key_type_names = set(_get_key_type_name(type(x)) for x in records_or_keys)
+    return key_type_names.pop() if len(key_type_names) == 1 else multiple_key_types
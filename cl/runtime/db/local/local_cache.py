@@ -13,36 +13,61 @@
 # limitations under the License.
 
 from __future__ import annotations
+import threading
 from dataclasses import dataclass
 from dataclasses import field
-from typing import ClassVar
 from typing import Dict
 from typing import Iterable
+from typing import List
+from typing import Tuple
 from typing import Type
 from typing import cast
 from typing_extensions import Self
-from cl.runtime.db.dataset_util import DatasetUtil
+from cl.runtime.context.context import Context
+from cl.runtime.db.db import Db
+from cl.runtime.db.db_page import DbPage
+from cl.runtime.db.local.local_cache_eviction_policy_enum import LocalCacheEvictionPolicyEnum
+from cl.runtime.db.local.local_cache_stats import LocalCacheStats
+from cl.runtime.db.local.local_cache_table import LocalCacheTable
+from cl.runtime.db.local.local_cache_table import get_key_tuple
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
-from cl.runtime.records.protocols import TQuery
-from cl.runtime.serialization.string_serializer import StringSerializer
-
-key_serializer = StringSerializer()
-"""Serializer for keys used in cache lookup."""
+from cl.runtime.records.protocols import is_key
+from cl.runtime.records.record_util import RecordUtil
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
 
 _local_cache_instance: LocalCache | None = None
 """Singleton instance is created on first access."""
 
 
 @dataclass(slots=True, kw_only=True)
-class LocalCache:
-    """In-memory cache for objects without serialization."""
+class LocalCache(Db):
+    """In-memory database for objects without serialization with an optional limit on the number of records."""
+
+    max_records: int | None = None
+    """Maximum number of records for each key type in each dataset, no limit if None."""
+
+    eviction_policy: LocalCacheEvictionPolicyEnum = LocalCacheEvictionPolicyEnum.LRU
+    """Policy for selecting the record to evict when the number of records exceeds max_records."""
+
+    __cache: Dict[Tuple[str | None, Type], LocalCacheTable] = field(default_factory=lambda: {})
+    """Record instances are stored without serialization in a table for each dataset and key type."""
 
-    __cache: Dict[KeyProtocol, RecordProtocol] = field(default_factory=lambda: {})
-    """Record instance is stored in cache without serialization."""
+    __stats: LocalCacheStats = field(default_factory=LocalCacheStats)
+    """Counters for lookups and evictions."""
+
+    __lock: threading.RLock = field(default_factory=threading.RLock)
+    """Lock for access from multiple threads, a lookup also modifies the table because it updates recency."""
+
+    def init(self) -> Self:
+        """Similar to __init__ but can use fields set after construction, return self to enable method chaining."""
+        if self.max_records is not None and self.max_records < 1:
+            raise RuntimeError(f"{type(self).__name__} field 'max_records' must be positive or None.")
+        return self
 
     def load_one(
         self,
@@ -61,33 +86,12 @@ class LocalCache:
             else:
                 raise UserError(f"Key is None when trying to load record type {record_type.__name__} from DB.")
 
-        if record_or_key is None or getattr(record_or_key, "get_key", None) is not None:
-            # Key instance is Record or None, return without lookup
-            return cast(RecordProtocol, record_or_key)
-
-        elif getattr(record_or_key, "get_key_type"):
-            # Key, look up the record in cache
-            key_type = record_or_key.get_key_type()
-            serialized_key = key_serializer.serialize_key(record_or_key)
+        result = self.load_many(record_type, [record_or_key], dataset=dataset, identity=identity)[0]
 
-            # Try to retrieve dataset dictionary, insert if it does not yet exist
-            dataset_cache = self.__cache.setdefault(dataset, {})
-
-            # Try to retrieve table dictionary
-            if (table_cache := dataset_cache.setdefault(key_type, None)) is not None:
-                # Look up the record, defaults to None
-                result = table_cache.get(serialized_key, None)
-            else:
-                # Return None if not found
-                return None
-
-            # Check if the record was not found
-            if not is_record_optional and result is None:
-                raise UserError(f"{record_type.__name__} record is not found for key {record_or_key}")
-            return result
-
-        else:
-            raise RuntimeError(f"Type {record_or_key.__class__.__name__} is not a record or key.")
+        # Check if the record was not found
+        if not is_record_optional and result is None:
+            raise UserError(f"{record_type.__name__} record is not found for key {record_or_key}")
+        return result
 
     def load_many(
         self,
@@ -97,18 +101,26 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        # TODO: Implement directly for better performance
-        result = [
-            self.load_one(
-                record_type,
-                x,
-                dataset=dataset,
-                identity=identity,
-                is_key_optional=True,  # TODO: Keep the existing defaults for load_many
-                is_record_optional=True,  # TODO: Keep the existing defaults for load_many
-            )
-            for x in records_or_keys
-        ]
+        if records_or_keys is None:
+            return None
+
+        result = []
+        with self.__lock:
+            for record_or_key in records_or_keys:
+                if record_or_key is None or getattr(record_or_key, "get_key", None) is not None:
+                    # Record or None, return without lookup
+                    result.append(cast(RecordProtocol, record_or_key))
+                elif getattr(record_or_key, "get_key_type", None) is not None:
+                    # Key, look up the record in the table for its key type
+                    table = self.__cache.get((dataset, record_or_key.get_key_type()), None)
+                    record = table.get(get_key_tuple(record_or_key)) if table is not None else None
+                    if record is not None:
+                        self.__stats.hits += 1
+                    else:
+                        self.__stats.misses += 1
+                    result.append(record)
+                else:
+                    raise RuntimeError(f"Type {record_or_key.__class__.__name__} is not a record or key.")
         return result
 
     def load_all(
@@ -118,7 +130,70 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        raise NotImplementedError()
+        # Scans do not change recency or frequency so that they do not cause eviction of frequently used records
+        with self.__lock:
+            if (table := self.__cache.get((dataset, record_type.get_key_type()), None)) is None:
+                return []
+            result = table.get_records_of_subtypes(record_type)
+        return RecordUtil.sort_records_by_key(result)
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        # Existence checks do not change recency, frequency or lookup counters
+        result = []
+        with self.__lock:
+            for key in keys:
+                if key is None:
+                    result.append(False)
+                elif is_key(key):
+                    table = self.__cache.get((dataset, key.get_key_type()), None)
+                    result.append(table is not None and get_key_tuple(key) in table.records)
+                else:
+                    raise RuntimeError(f"Type {key.__class__.__name__} is not a key.")
+        return result
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        if filter_obj is not None:
+            return len(self.load_filter(record_type, filter_obj, dataset=dataset, identity=identity))
+        with self.__lock:
+            if (table := self.__cache.get((dataset, record_type.get_key_type()), None)) is None:
+                return 0
+            # Count using the secondary index by record type without creating a list of records
+            return sum(
+                len(key_tuples)
+                for indexed_type, key_tuples in table.type_index.items()
+                if issubclass(indexed_type, record_type)
+            )
+
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        self._check_page_limit(limit)
+        with self.__lock:
+            if (table := self.__cache.get((dataset, record_type.get_key_type()), None)) is None:
+                return DbPage(records=[])
+            records = table.get_records_of_subtypes(record_type)
+        # Select the page without sorting all records
+        return self._select_page(record_type, records, after_key=after_key, limit=limit, order=order)
 
     def load_filter(
         self,
@@ -128,7 +203,14 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord]:
-        raise NotImplementedError()
+        # Use the fields that are set in the filter, empty containers are treated as not set
+        filter_values = [
+            (k, v)
+            for k in _get_class_hierarchy_slots(filter_obj.__class__)
+            if (v := getattr(filter_obj, k)) is not None and not (hasattr(v, "__len__") and len(v) == 0)
+        ]
+        records = self.load_all(record_type, dataset=dataset, identity=identity)
+        return [record for record in records if all(getattr(record, k, None) == v for k, v in filter_values)]
 
     def save_one(
         self,
@@ -137,22 +219,7 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        # If record is None, do nothing
-        if record is None:
-            return
-
-        # Try to retrieve dataset dictionary, insert if it does not yet exist
-        dataset_cache = self.__cache.setdefault(dataset, {})
-
-        # Try to retrieve table dictionary using 'key_type' as key, insert if it does not yet exist
-        key_type = record.get_key_type()
-        table_cache = dataset_cache.setdefault(key_type, {})
-
-        # Serialize both key and record
-        serialized_key = key_serializer.serialize_key(record)
-
-        # Add record to cache, overwriting an existing record if present
-        table_cache[serialized_key] = record
+        self.save_many([record], dataset=dataset, identity=identity)
 
     def save_many(
         self,
@@ -161,8 +228,28 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        # TODO: Review performance compared to a custom implementation for save_many
-        [self.save_one(x) for x in records]
+        with self.__lock:
+            for record in records:
+                # If record is None, do nothing
+                if record is None:
+                    continue
+
+                # Call on_save if defined
+                if hasattr(record, "on_save"):
+                    record.on_save()  # TODO: Refactor on_save
+
+                table_key = (dataset, record.get_key_type())
+                if (table := self.__cache.get(table_key, None)) is None:
+                    table = LocalCacheTable()
+                    self.__cache[table_key] = table
+                key_tuple = get_key_tuple(record.get_key())
+
+                # Evict before adding a new record so that it is not evicted immediately under LFU policy
+                if self.max_records is not None and key_tuple not in table.records:
+                    self.__stats.evictions += table.evict(max(self.max_records - 1, 0), self.eviction_policy)
+
+                # Add record to cache, overwriting an existing record if present
+                table.put(key_tuple, record)
 
     def delete_one(
         self,
@@ -172,7 +259,7 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        raise NotImplementedError()
+        self.delete_many([key], dataset=dataset, identity=identity)
 
     def delete_many(
         self,
@@ -181,8 +268,37 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        # Validate the dataset and if necessary convert to delimited string
-        raise NotImplementedError()
+        if keys is None:
+            return
+        with self.__lock:
+            for key in keys:
+                if key is not None and (table := self.__cache.get((dataset, key.get_key_type()), None)) is not None:
+                    table.remove(get_key_tuple(key))
+
+    def delete_all_and_drop_db(self) -> None:
+        # Check that db_id matches temp_db_prefix
+        Context.error_if_not_temp_db(self.db_id)
+        with self.__lock:
+            self.__cache.clear()
+            self.__stats = LocalCacheStats()
+
+    def close_connection(self) -> None:
+        # Records are stored in memory, there is no connection to close
+        pass
+
+    def get_stats(self) -> LocalCacheStats:
+        """Copy of the counters for lookups and evictions."""
+        with self.__lock:
+            return LocalCacheStats(
+                hits=self.__stats.hits,
+                misses=self.__stats.misses,
+                evictions=self.__stats.evictions,
+            )
+
+    def get_record_count(self) -> int:
+        """Total number of records for all datasets and key types."""
+        with self.__lock:
+            return sum(len(table.records) for table in self.__cache.values())
 
     @classmethod
     def instance(cls) -> Self:
@@ -192,5 +308,5 @@ class LocalCache:
         global _local_cache_instance
         if _local_cache_instance is None:
             # Create if does not yet exist
-            _local_cache_instance = LocalCache()
+            _local_cache_instance = LocalCache(db_id="local_cache")
         return _local_cache_instance
@@ -0,0 +1,34 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, kw_only=True)
+class LocalCacheStats:
+    """Counters for lookups and evictions in LocalCache."""
+
+    hits: int = 0
+    """Number of keys found in cache."""
+
+    misses: int = 0
+    """Number of keys not found in cache."""
+
+    evictions: int = 0
+    """Number of records removed from cache to stay within the limit."""
+
+    def get_hit_ratio(self) -> float | None:
+        """Fraction of keys found in cache, None if there were no lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else None
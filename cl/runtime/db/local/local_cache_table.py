@@ -0,0 +1,133 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Type
+from cl.runtime.db.local.local_cache_eviction_policy_enum import LocalCacheEvictionPolicyEnum
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import is_key
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
+
+
+def get_key_tuple(key: KeyProtocol) -> Tuple[Hashable, ...]:
+    """Hashable tuple of key field values, embedded keys are converted recursively."""
+    return tuple(
+        get_key_tuple(value) if is_key(value) else value
+        for value in (getattr(key, slot) for slot in _get_class_hierarchy_slots(type(key)))
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class LocalCacheTable:
+    """Records for one key type in one dataset with recency and frequency tracking and a secondary index by type."""
+
+    records: OrderedDict[Tuple, RecordProtocol] = field(default_factory=OrderedDict)
+    """Records by key tuple in the order of access from least to most recent."""
+
+    frequencies: Dict[Tuple, int] = field(default_factory=dict)
+    """Number of accesses for each key tuple."""
+
+    frequency_buckets: Dict[int, OrderedDict[Tuple, None]] = field(default_factory=dict)
+    """Key tuples for each number of accesses in the order of access from least to most recent."""
+
+    min_frequency: int = 0
+    """Lowest number of accesses among the records, may be stale after removal and is then recomputed on eviction."""
+
+    type_index: Dict[Type, Set[Tuple]] = field(default_factory=dict)
+    """Key tuples for each record type, used to find records of a type and its subtypes without a full scan."""
+
+    def get(self, key_tuple: Tuple) -> RecordProtocol | None:
+        """Get record and mark it as most recently used, return None if not found."""
+        if (result := self.records.get(key_tuple, None)) is not None:
+            self.records.move_to_end(key_tuple)
+            self._increment_frequency(key_tuple)
+        return result
+
+    def put(self, key_tuple: Tuple, record: RecordProtocol) -> None:
+        """Add or replace record and mark it as most recently used."""
+        if (existing := self.records.get(key_tuple, None)) is not None:
+            self._remove_from_type_index(key_tuple, type(existing))
+            self.records.move_to_end(key_tuple)
+            self._increment_frequency(key_tuple)
+        else:
+            self.frequencies[key_tuple] = 1
+            self.frequency_buckets.setdefault(1, OrderedDict())[key_tuple] = None
+            self.min_frequency = 1
+        self.records[key_tuple] = record
+        self.type_index.setdefault(type(record), set()).add(key_tuple)
+
+    def remove(self, key_tuple: Tuple) -> bool:
+        """Remove record if present, return True if it was removed."""
+        if (existing := self.records.pop(key_tuple, None)) is None:
+            return False
+        self._remove_from_frequency_bucket(key_tuple, self.frequencies.pop(key_tuple))
+        self._remove_from_type_index(key_tuple, type(existing))
+        return True
+
+    def evict(self, max_records: int, eviction_policy: LocalCacheEvictionPolicyEnum) -> int:
+        """Evict records until their number does not exceed max_records, return the number of evicted records."""
+        result = 0
+        while len(self.records) > max_records:
+            if eviction_policy == LocalCacheEvictionPolicyEnum.LRU:
+                key_tuple = next(iter(self.records))
+            elif eviction_policy == LocalCacheEvictionPolicyEnum.LFU:
+                # Each bucket is in the order of access, evict the least recently used among the least frequent
+                if self.min_frequency not in self.frequency_buckets:
+                    self.min_frequency = min(self.frequency_buckets)
+                key_tuple = next(iter(self.frequency_buckets[self.min_frequency]))
+            else:
+                raise RuntimeError(f"Eviction policy {eviction_policy.name} is not supported.")
+            self.remove(key_tuple)
+            result += 1
+        return result
+
+    def get_records_of_subtypes(self, record_type: Type) -> List[RecordProtocol]:
+        """Get records of the specified type and its subtypes without changing their recency or frequency."""
+        return [
+            self.records[key_tuple]
+            for indexed_type, key_tuples in self.type_index.items()
+            if issubclass(indexed_type, record_type)
+            for key_tuple in key_tuples
+        ]
+
+    def _increment_frequency(self, key_tuple: Tuple) -> None:
+        """Move key tuple to the most recent position in the bucket for the next number of accesses."""
+        frequency = self.frequencies[key_tuple]
+        self._remove_from_frequency_bucket(key_tuple, frequency)
+        if frequency == self.min_frequency and frequency not in self.frequency_buckets:
+            self.min_frequency = frequency + 1
+        self.frequencies[key_tuple] = frequency + 1
+        self.frequency_buckets.setdefault(frequency + 1, OrderedDict())[key_tuple] = None
+
+    def _remove_from_frequency_bucket(self, key_tuple: Tuple, frequency: int) -> None:
+        """Remove key tuple from the bucket for its number of accesses, delete the bucket if it becomes empty."""
+        bucket = self.frequency_buckets[frequency]
+        del bucket[key_tuple]
+        if not bucket:
+            del self.frequency_buckets[frequency]
+
+    def _remove_from_type_index(self, key_tuple: Tuple, record_type: Type) -> None:
+        """Remove key tuple from the secondary index for record type."""
+        if (key_tuples := self.type_index.get(record_type, None)) is not None:
+            key_tuples.discard(key_tuple)
+            if not key_tuples:
+                del self.type_index[record_type]
@@ -13,25 +13,41 @@
 # limitations under the License.
 
 import re
+from collections import defaultdict
 from dataclasses import dataclass
+from typing import Any
 from typing import Dict
 from typing import Iterable
+from typing import List
+from typing import Set
 from typing import Type
 from typing import cast
+from pymongo import ASCENDING
+from pymongo import DESCENDING
+from pymongo import TEXT
 from pymongo import MongoClient
+from pymongo import ReplaceOne
+from pymongo.collection import Collection
 from pymongo.database import Database
 from cl.runtime.context.context import Context
+from cl.runtime.db.compression_util import CompressionUtil
 from cl.runtime.db.db import Db
+from cl.runtime.db.db_page import DbPage
 from cl.runtime.db.mongo.mongo_filter_serializer import MongoFilterSerializer
+from cl.runtime.db.page_token_util import PageTokenUtil
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.record_util import RecordUtil
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from cl.runtime.schema.schema import Schema
+from cl.runtime.schema.type_index_decl import TypeIndexDecl
 from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
 from cl.runtime.serialization.string_serializer import StringSerializer
+from cl.runtime.settings.search_settings import SearchSettings
 
 invalid_db_name_symbols = r'/\\. "$*<>:|?'
 """Invalid MongoDB database name symbols."""
@@ -42,15 +58,28 @@ invalid_db_name_regex = re.compile(f"[{invalid_db_name_symbols}]")
 # TODO: Revise and consider making fields of the database
 # TODO: Review and consider alternative names, e.g. DataSerializer or RecordSerializer
 data_serializer = DictSerializer()
+trusted_data_serializer = DictSerializer(trusted=True)
 key_serializer = StringSerializer()
 filter_serializer = MongoFilterSerializer()
 
+search_index_name = "_search"
+"""Name of the text index on the search fields specified in SearchSettings."""
+
+table_versions_collection_name = "_table_versions"
+"""Collection storing the version stamp of each collection, incremented on every write to that collection."""
+
 _client_dict: Dict[str, MongoClient] = {}
 """Dict of MongoClient instances with client_uri key stored outside the class to avoid serializing them."""
 
 _db_dict: Dict[str, Database] = {}
 """Dict of database instances with client_uri.database_name key stored outside the class to avoid serializing them."""
 
+_indexed_collections: Set[str] = set()
+"""Collections with client_uri.database_name.collection_name key for which default indexes have been created."""
+
+_uncompressed_fields_dict: Dict[Type, Set[str]] = {}
+"""Fields stored without compression for each key type."""
+
 
 @dataclass(slots=True, kw_only=True)
 class BasicMongoDb(Db):
@@ -59,6 +88,12 @@ class BasicMongoDb(Db):
     client_uri: str = "mongodb://localhost:27017/"
     """MongoDB client URI, defaults to mongodb://localhost:27017/"""
 
+    load_batch_size: int = 1000
+    """Maximum number of keys in a single query, more keys from the same collection are loaded by several queries."""
+
+    trusted_load: bool = False
+    """If True, records read from this database are not validated after deserialization, see SqliteDb."""
+
     def load_one(
         self,
         record_type: Type[TRecord],
@@ -88,16 +123,14 @@ class BasicMongoDb(Db):
 
             # Key, get collection name from key type by removing Key suffix if present
             key_type = record_or_key.get_key_type()
-            collection_name = key_type.__name__  # TODO: Decision on short alias
-            db = self._get_db()
-            collection = db[collection_name]
+            collection = self._get_collection(key_type)
 
             serialized_key = key_serializer.serialize_key(record_or_key)
             serialized_record = collection.find_one({"_key": serialized_key})
             if serialized_record is not None:
                 del serialized_record["_id"]
                 del serialized_record["_key"]
-                result = data_serializer.deserialize_data(serialized_record)
+                result = self._get_data_serializer().deserialize_data(self._decompress_fields(serialized_record))
                 return result
             else:
                 # Check if returning None is allowed
@@ -115,18 +148,45 @@ class BasicMongoDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        # TODO: Implement directly for better performance
-        result = [
-            self.load_one(
-                record_type,
-                x,
-                dataset=dataset,
-                identity=identity,
-                is_key_optional=True,  # TODO: Keep the existing defaults for load_many
-                is_record_optional=True,  # TODO: Keep the existing defaults for load_many
-            )
-            for x in records_or_keys
-        ]
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        if records_or_keys is None:
+            return None
+
+        # Records and None are returned without lookup, positions of keys are grouped
+        # by collection and serialized key to reassemble the result in the input order
+        result = list(records_or_keys)
+        positions_dict: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for position, record_or_key in enumerate(result):
+            if record_or_key is None or getattr(record_or_key, "get_key", None) is not None:
+                continue
+            elif getattr(record_or_key, "get_key_type", None) is not None:
+                # Key, get collection name from key type by removing Key suffix if present
+                collection_name = record_or_key.get_key_type().__name__  # TODO: Decision on short alias
+                serialized_key = key_serializer.serialize_key(record_or_key)
+                positions_dict[collection_name][serialized_key].append(position)
+                # Keys that are not found remain None
+                result[position] = None
+            else:
+                raise RuntimeError(f"Type {record_or_key.__class__.__name__} is not a record or key.")
+
+        # Issue one query per collection for each batch of up to load_batch_size keys
+        db = self._get_db()
+        for collection_name, key_positions in positions_dict.items():
+            collection = db[collection_name]
+            serialized_keys = list(key_positions.keys())
+            for batch_start in range(0, len(serialized_keys), self.load_batch_size):
+                batch_keys = serialized_keys[batch_start : batch_start + self.load_batch_size]
+                serialized_records = collection.find({"_key": {"$in": batch_keys}}, {"_id": 0})
+                for serialized_record in serialized_records:
+                    serialized_key = serialized_record.pop("_key")
+                    record = self._get_data_serializer().deserialize_data(self._decompress_fields(serialized_record))
+                    for position in key_positions[serialized_key]:
+                        result[position] = record
         return result
 
     def load_all(
@@ -144,9 +204,7 @@ class BasicMongoDb(Db):
 
         # Key, get collection name from key type by removing Key suffix if present
         key_type = record_type.get_key_type()
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        collection = self._get_collection(key_type)
 
         subtype_names = list(t.__name__ for t in Schema.get_type_successors(record_type))
         serialized_records = collection.find({"_type": {"$in": subtype_names}})
@@ -154,8 +212,8 @@ class BasicMongoDb(Db):
         for serialized_record in serialized_records:
             del serialized_record["_id"]
             del serialized_record["_key"]
-            record = data_serializer.deserialize_data(
-                serialized_record
+            record = self._get_data_serializer().deserialize_data(
+                self._decompress_fields(serialized_record)
             )  # TODO: Convert to comprehension for performance
             result.append(record)
         return RecordUtil.sort_records_by_key(result)
@@ -176,24 +234,139 @@ class BasicMongoDb(Db):
 
         # Key, get collection name from key type by removing Key suffix if present
         key_type = record_type.get_key_type()
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        collection = self._get_collection(key_type)
 
-        # Convert filter object to a dictionary
-        filter_dict = filter_serializer.serialize_filter(filter_obj)
+        filter_dict = self._serialize_filter(key_type, filter_obj)
 
         serialized_records = collection.find(filter_dict)  # TODO: Filter by derived type
         result = []
         for serialized_record in serialized_records:
             del serialized_record["_id"]
             del serialized_record["_key"]
-            record = data_serializer.deserialize_data(
-                serialized_record
+            record = self._get_data_serializer().deserialize_data(
+                self._decompress_fields(serialized_record)
             )  # TODO: Convert to comprehension for performance
             result.append(record)
         return result
 
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        keys = list(keys)
+        result = [False] * len(keys)
+        db = self._get_db()
+        for key_type, positions in self._group_positions_by_key_type(keys).items():
+            collection = db[key_type.__name__]  # TODO: Decision on short alias
+            serialized_keys = [key_serializer.serialize_key(keys[x]) for x in positions]
+            found_keys = set()
+            for batch_start in range(0, len(serialized_keys), self.load_batch_size):
+                batch_keys = serialized_keys[batch_start : batch_start + self.load_batch_size]
+                # Projection on '_key' only is a covered query answered from the unique index on '_key'
+                found_keys.update(
+                    x["_key"] for x in collection.find({"_key": {"$in": batch_keys}}, {"_id": 0, "_key": 1})
+                )
+            for position, serialized_key in zip(positions, serialized_keys):
+                result[position] = serialized_key in found_keys
+        return result
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        key_type = record_type.get_key_type()
+        collection = self._get_collection(key_type)
+        subtype_names = list(t.__name__ for t in Schema.get_type_successors(record_type))
+        query = self._serialize_filter(key_type, filter_obj) if filter_obj is not None else {}
+        query["_type"] = {"$in": subtype_names}
+        return collection.count_documents(query)
+
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+        self._check_page_limit(limit)
+
+        key_type = record_type.get_key_type()
+        collection = self._get_collection(key_type)
+
+        # Range query on the serialized key uses the unique index on '_key'
+        subtype_names = list(t.__name__ for t in Schema.get_type_successors(record_type))
+        query = {"_type": {"$in": subtype_names}}
+        is_descending = order == IndexSortOrderEnum.DESCENDING
+        if (after_key := PageTokenUtil.to_key(key_type, after_key)) is not None:
+            query["_key"] = {"$lt" if is_descending else "$gt": key_serializer.serialize_key(after_key)}
+
+        # Load one more record than the limit to determine if there is a next page
+        serialized_records = (
+            collection.find(query, {"_id": 0, "_key": 0})
+            .sort("_key", DESCENDING if is_descending else ASCENDING)
+            .limit(limit + 1)
+        )
+        data_serializer_ = self._get_data_serializer()
+        records = [data_serializer_.deserialize_data(self._decompress_fields(x)) for x in serialized_records]
+        return self._create_page(records, limit)
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+        self._check_search_query(record_type, query, limit)
+
+        # Text query requires the text index, which is created on first access unless the collection does not exist
+        key_type = record_type.get_key_type()
+        collection_name = key_type.__name__  # TODO: Decision on short alias
+        if not self._get_db().list_collection_names(filter={"name": collection_name}):
+            return []
+        collection = self._get_collection(key_type, create_indexes=True)
+
+        # Phrase query uses the text index, which matches whole words after stemming rather than any substring
+        subtype_names = list(t.__name__ for t in Schema.get_type_successors(record_type))
+        phrase = query.replace("\\", "\\\\").replace('"', '\\"')
+        search_query = {"$text": {"$search": f'"{phrase}"'}, "_type": {"$in": subtype_names}}
+        serialized_records = collection.find(search_query, {"_id": 0, "_key": 0}).sort("_key", ASCENDING).limit(limit)
+        return [self._get_data_serializer().deserialize_data(self._decompress_fields(x)) for x in serialized_records]
+
     def save_one(
         self,
         record: RecordProtocol | None,
@@ -217,12 +390,10 @@ class BasicMongoDb(Db):
 
         # Get collection name from key type by removing Key suffix if present
         key_type = record.get_key_type()
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        collection = self._get_collection(key_type, create_indexes=True)
 
         # Serialize data, this also executes 'init_all' method
-        serialized_record = data_serializer.serialize_data(record)
+        serialized_record = self._compress_fields(key_type, data_serializer.serialize_data(record))
 
         # Serialize key
         # TODO: Consider getting the key first instead of serializing the entire record
@@ -232,6 +403,7 @@ class BasicMongoDb(Db):
         # TODO (Roman): update_one does not affect fields not presented in record. Changed to replace_one
         serialized_record["_key"] = serialized_key
         collection.replace_one({"_key": serialized_key}, serialized_record, upsert=True)
+        self._increment_table_version(key_type)
 
     def save_many(
         self,
@@ -240,9 +412,37 @@ class BasicMongoDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        # TODO: Temporary, replace by independent implementation
-        [self.save_one(x, dataset=dataset, identity=identity) for x in records]
-        return
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        # Group replace operations by key type, None records are skipped
+        operations_dict: Dict[Type, List[ReplaceOne]] = defaultdict(list)
+        for record in records:
+            if record is None:
+                continue
+
+            # Call on_save if defined
+            if hasattr(record, "on_save"):
+                record.on_save()  # TODO: Refactor on_save
+
+            # Serialize data, this also executes 'init_all' method
+            serialized_record = self._compress_fields(record.get_key_type(), data_serializer.serialize_data(record))
+            serialized_key = key_serializer.serialize_key(record)
+            serialized_record["_key"] = serialized_key
+
+            # Replace the entire document rather than update to remove fields not present in record
+            operations_dict[record.get_key_type()].append(
+                ReplaceOne({"_key": serialized_key}, serialized_record, upsert=True)
+            )
+
+        # Unordered bulk write lets the server apply operations in parallel, one round trip per collection
+        for key_type, operations in operations_dict.items():
+            collection = self._get_collection(key_type, create_indexes=True)
+            collection.bulk_write(operations, ordered=False)
+            self._increment_table_version(key_type)
 
     def delete_one(
         self,
@@ -259,14 +459,13 @@ class BasicMongoDb(Db):
             raise RuntimeError("BasicMongo database type does not support row-level security.")
 
         # Get collection name from key type by removing Key suffix if present
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        collection = self._get_collection(key_type)
 
         serialized_key = key_serializer.serialize_key(key)
 
         delete_filter = {"_key": serialized_key}
         collection.delete_one(delete_filter)
+        self._increment_table_version(key_type)
 
     def delete_many(
         self,
@@ -275,8 +474,24 @@ class BasicMongoDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        if keys is None:
+            return
+
+        # Group serialized keys by key type and delete them using a single query per collection
+        serialized_keys_dict: Dict[Type, List[str]] = defaultdict(list)
         for key in keys:
-            self.delete_one(type(key), key, dataset=dataset, identity=identity)
+            if key is not None:
+                serialized_keys_dict[key.get_key_type()].append(key_serializer.serialize_key(key))
+        for key_type, serialized_keys in serialized_keys_dict.items():
+            collection = self._get_collection(key_type)
+            collection.delete_many({"_key": {"$in": serialized_keys}})
+            self._increment_table_version(key_type)
 
     def delete_all_and_drop_db(self) -> None:
         # Check that db_id and db_name both match temp_db_prefix
@@ -289,6 +504,10 @@ class BasicMongoDb(Db):
         client = self._get_client()
         client.drop_database(db_name)
 
+        # Indexes are dropped with the database and will be created again on next write
+        collection_prefix = f"{self.client_uri}{db_name}."
+        _indexed_collections.difference_update([x for x in _indexed_collections if x.startswith(collection_prefix)])
+
     def close_connection(self) -> None:
         if (client := _client_dict.get(self.client_uri, None)) is not None:
             # Close connection
@@ -296,6 +515,108 @@ class BasicMongoDb(Db):
             # Remove client from dictionary so connection can be reopened on next access
             del _client_dict[self.client_uri]
 
+    def create_index(self, record_type: Type[TRecord], index_decl: TypeIndexDecl) -> None:
+        """Create index declared using field names of 'record_type' in the collection for its key type."""
+        collection = self._get_collection(record_type.get_key_type(), create_indexes=True)
+        index_keys = [
+            (
+                element.name,
+                DESCENDING if element.direction == IndexSortOrderEnum.DESCENDING else ASCENDING,
+            )
+            for element in index_decl.elements
+        ]
+        # Creating an index that already exists with the same keys and options has no effect
+        if index_decl.name is not None:
+            collection.create_index(index_keys, name=index_decl.name)
+        else:
+            collection.create_index(index_keys)
+
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        # Confirm dataset is None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+
+        collection_name = key_type.__name__  # TODO: Decision on short alias
+        version_record = self._get_db()[table_versions_collection_name].find_one({"_id": collection_name})
+        return version_record["version"] if version_record is not None else 0
+
+    def _increment_table_version(self, key_type: Type) -> None:
+        """Increment version stamp of the collection for the key type after a write."""
+        collection_name = key_type.__name__  # TODO: Decision on short alias
+        self._get_db()[table_versions_collection_name].update_one(
+            {"_id": collection_name}, {"$inc": {"version": 1}}, upsert=True
+        )
+
+    def _get_collection(self, key_type: Type, *, create_indexes: bool = False) -> Collection:
+        """
+        Get PyMongo collection object for the key type. When 'create_indexes' is True, create a unique index
+        on '_key' and an index on '_type' on first access, reads do not create indexes to avoid creating
+        empty collections.
+        """
+        db = self._get_db()
+        collection_name = key_type.__name__  # TODO: Decision on short alias
+        result = db[collection_name]
+        if create_indexes:
+            collection_id = f"{self.client_uri}{db.name}.{collection_name}"
+            if collection_id not in _indexed_collections:
+                # Creating an index is idempotent, the set only avoids a round trip on each write
+                result.create_index("_key", unique=True)
+                result.create_index("_type")
+                self._create_search_index(key_type, result)
+                _indexed_collections.add(collection_id)
+        return result
+
+    @classmethod
+    def _create_search_index(cls, key_type: Type, collection: Collection) -> None:
+        """Create text index on the search fields specified in SearchSettings, replacing the index for other fields."""
+        search_fields = SearchSettings.instance().get_table_fields(key_type)
+        index_info = collection.index_information().get(search_index_name, None)
+        if index_info is None:
+            index_fields = []
+        elif "weights" in index_info:
+            # The server reports text index fields as weights, its key is the internal '_fts' field
+            index_fields = list(index_info["weights"].keys())
+        else:
+            index_fields = [x for x, _ in index_info["key"]]
+        if sorted(index_fields) != sorted(search_fields):
+            # A collection may have only one text index, drop it before creating the index for the new fields
+            if index_info is not None:
+                collection.drop_index(search_index_name)
+            if search_fields:
+                collection.create_index([(x, TEXT) for x in search_fields], name=search_index_name)
+
+    def _get_data_serializer(self) -> DictSerializer:
+        """Get serializer for the records read from the database, trusted if specified by trusted_load."""
+        return trusted_data_serializer if self.trusted_load else data_serializer
+
+    @classmethod
+    def _serialize_filter(cls, key_type: Type, filter_obj: RecordProtocol) -> Dict[str, Any]:
+        """Convert filter object to a query dictionary, large values are compressed in the same way as on save."""
+        return cls._compress_fields(key_type, filter_serializer.serialize_filter(filter_obj))
+
+    @classmethod
+    def _compress_fields(cls, key_type: Type, serialized_record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compress large string and binary values of top level fields except key fields used in queries
+        and search fields included in the text index, which does not index binary values.
+        """
+        if (uncompressed_fields := _uncompressed_fields_dict.get(key_type, None)) is None:
+            uncompressed_fields = {
+                "_type",
+                *_get_class_hierarchy_slots(key_type),
+                *SearchSettings.instance().get_table_fields(key_type),
+            }
+            _uncompressed_fields_dict[key_type] = uncompressed_fields
+        return {
+            k: v if k in uncompressed_fields else CompressionUtil.compress_value(v)
+            for k, v in serialized_record.items()
+        }
+
+    @classmethod
+    def _decompress_fields(cls, serialized_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Restore compressed values of top level fields, the values stored without compression are not modified."""
+        return {k: CompressionUtil.decompress_value(v) for k, v in serialized_record.items()}
+
     def _get_client(self) -> MongoClient:
         """Get PyMongo client object."""
         if (client := _client_dict.get(self.client_uri, None)) is None:
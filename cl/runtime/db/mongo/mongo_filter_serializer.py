@@ -13,14 +13,20 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from enum import Enum
 from typing import Any
 from typing import ClassVar
 from typing import Dict
 from typing import Type
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import TDataDict
+from cl.runtime.records.protocols import is_key
+from cl.runtime.serialization.dict_serializer import DictSerializer
 from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots  # TODO: Move to ClassInfo
 
+_data_serializer = DictSerializer()
+"""Serializer for embedded keys and enums, must match the serializer used to save records."""
+
 
 @dataclass(slots=True, kw_only=True)
 class MongoFilterSerializer:
@@ -37,20 +43,29 @@ class MongoFilterSerializer:
 
         # Get slots from this class and its bases in the order of declaration from base to derived
         all_slots = _get_class_hierarchy_slots(data.__class__)
-        # Serialize slot values in the order of declaration except those that are None
+        # Serialize slot values in the order of declaration except those that are None or empty containers
         result = {
-            k: v if v.__class__.__name__ in self.primitive_type_names else self._not_primitive_field_error(data, k, v)
+            k: self._serialize_field(data, k, v)
             for k in all_slots
-            if (v := getattr(data, k)) is not None
+            if (v := getattr(data, k)) is not None and not (isinstance(v, (list, dict)) and len(v) == 0)
         }
         return result
 
+    def _serialize_field(self, data: RecordProtocol, k: str, v: Any) -> Any:
+        """Serialize filter field value, embedded keys and enums are serialized in the same way as on save."""
+        if v.__class__.__name__ in self.primitive_type_names:
+            return v
+        elif is_key(v) or isinstance(v, Enum):
+            return _data_serializer.serialize_data(v)
+        else:
+            self._not_primitive_field_error(data, k, v)
+
     @classmethod
     def _not_primitive_field_error(cls, data: RecordProtocol, k: str, v: Any) -> None:
         """Error indicating only primitive field names are supported."""
         raise RuntimeError(
             f"Field '{k}' in '{data.__class__.__name__}' has type '{type(v)}'. This field cannot "
-            f"be used in a database filter because it is not one of the supported primitive types: "
+            f"be used in a database filter because it is not a key, an enum, or one of the supported primitive types: "
             + ", ".join(f"'{cls.primitive_type_names}'")
             + "."
         )
@@ -0,0 +1,55 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import binascii
+from typing import Type
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import is_key
+from cl.runtime.serialization.string_serializer import StringSerializer
+
+_key_serializer = StringSerializer()
+"""Serializer for the key stored in the token."""
+
+
+class PageTokenUtil:
+    """Conversion between the key of the last record on a page and the opaque token used to load the next page."""
+
+    @classmethod
+    def to_token(cls, key: KeyProtocol) -> str:
+        """Create token from the key of the last record on the page."""
+        key_str = _key_serializer.serialize_key(key)
+        return base64.urlsafe_b64encode(key_str.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def from_token(cls, token: str, key_type: Type[KeyProtocol]) -> KeyProtocol:
+        """Restore the key of the last record on the previous page from the token."""
+        try:
+            key_str = base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
+        except (ValueError, binascii.Error):
+            raise UserError(f"Invalid page token for {key_type.__name__}: {token}")
+        return _key_serializer.deserialize_key(key_str, key_type)
+
+    @classmethod
+    def to_key(cls, key_type: Type[KeyProtocol], after_key: KeyProtocol | str | None) -> KeyProtocol | None:
+        """Convert 'after_key' argument of 'Db.load_page' which may be a key or a token to key."""
+        if after_key is None:
+            return None
+        elif isinstance(after_key, str):
+            return cls.from_token(after_key, key_type)
+        elif is_key(after_key):
+            return after_key
+        else:
+            raise RuntimeError(f"Type {type(after_key).__name__} is not a key or page token.")
@@ -0,0 +1,351 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Type
+from redis import Redis
+from cl.runtime.context.context import Context
+from cl.runtime.db.db import Db
+from cl.runtime.db.protocols import TKey
+from cl.runtime.db.protocols import TRecord
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.schema.schema import Schema
+from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
+from cl.runtime.serialization.string_serializer import StringSerializer
+from cl.runtime.serialization.typed_flat_dict_serializer import _decode_json_value
+from cl.runtime.serialization.typed_flat_dict_serializer import _encode_json_default
+
+data_serializer = DictSerializer()
+trusted_data_serializer = DictSerializer(trusted=True)
+key_serializer = StringSerializer()
+
+_client_dict: Dict[str, Redis] = {}
+"""Dict of Redis client instances with client_uri key stored outside the class to avoid serializing them."""
+
+_glob_special_chars = "\\*?[]^-"
+"""Characters that must be escaped to match them literally in Redis glob-style patterns."""
+
+
+@dataclass(slots=True, kw_only=True)
+class RedisDb(Db):
+    """
+    Redis database without datasets, records of each key type are stored as compact JSON in a hash by key,
+    with a sorted set of keys for loading all records in key order and a counter for the table version.
+    """
+
+    client_uri: str = "redis://localhost:6379/0"
+    """Redis client URI, defaults to redis://localhost:6379/0"""
+
+    batch_size: int = 1000
+    """Maximum number of records in a single command, more records are sent by several commands in one pipeline."""
+
+    trusted_load: bool = False
+    """If True, records read from this database are not validated after deserialization, see SqliteDb."""
+
+    def load_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        # Check for an empty key
+        if record_or_key is None:
+            if is_key_optional:
+                return None
+            else:
+                raise UserError(f"Key is None when trying to load record type {record_type.__name__} from DB.")
+
+        result = self.load_many(record_type, [record_or_key], dataset=dataset, identity=identity)[0]
+
+        # Check if the record was not found
+        if not is_record_optional and result is None:
+            raise UserError(f"{record_type.__name__} record is not found for key {record_or_key}")
+        return result
+
+    def load_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        self._check_dataset_and_identity(dataset, identity)
+
+        if records_or_keys is None:
+            return None
+
+        # Records and None are returned without lookup, positions of keys are grouped by table
+        result = list(records_or_keys)
+        positions_dict: Dict[str, List[int]] = defaultdict(list)
+        serialized_keys: List[str | None] = [None] * len(result)
+        for position, record_or_key in enumerate(result):
+            if record_or_key is None or getattr(record_or_key, "get_key", None) is not None:
+                continue
+            elif getattr(record_or_key, "get_key_type", None) is not None:
+                positions_dict[self._get_table_name(record_or_key.get_key_type())].append(position)
+                serialized_keys[position] = key_serializer.serialize_key(record_or_key)
+            else:
+                raise RuntimeError(f"Type {record_or_key.__class__.__name__} is not a record or key.")
+
+        # Send HMGET commands for all tables in a single round trip
+        pipeline = self._get_client().pipeline(transaction=False)
+        batches = []
+        for table_name, positions in positions_dict.items():
+            for batch_start in range(0, len(positions), self.batch_size):
+                batch_positions = positions[batch_start : batch_start + self.batch_size]
+                pipeline.hmget(table_name, [serialized_keys[position] for position in batch_positions])
+                batches.append(batch_positions)
+
+        # Keys that are not found are returned as None
+        for batch_positions, serialized_records in zip(batches, pipeline.execute()):
+            for position, serialized_record in zip(batch_positions, serialized_records):
+                result[position] = self._deserialize_record(serialized_record) if serialized_record else None
+        return result
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        self._check_dataset_and_identity(dataset, identity)
+
+        # Check the sorted sets of keys using ZMSCORE commands for all tables in a single round trip
+        keys = list(keys)
+        result = [False] * len(keys)
+        pipeline = self._get_client().pipeline(transaction=False)
+        batches = []
+        for key_type, positions in self._group_positions_by_key_type(keys).items():
+            keys_name = self._get_keys_name(self._get_table_name(key_type))
+            for batch_start in range(0, len(positions), self.batch_size):
+                batch_positions = positions[batch_start : batch_start + self.batch_size]
+                pipeline.zmscore(keys_name, [key_serializer.serialize_key(keys[x]) for x in batch_positions])
+                batches.append(batch_positions)
+        for batch_positions, scores in zip(batches, pipeline.execute()):
+            for position, score in zip(batch_positions, scores):
+                result[position] = score is not None
+        return result
+
+    def load_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        self._check_dataset_and_identity(dataset, identity)
+
+        table_name = self._get_table_name(record_type.get_key_type())
+        client = self._get_client()
+
+        # Members of the sorted set have the same score and are ordered by serialized key
+        subtype_names = set(t.__name__ for t in Schema.get_type_successors(record_type))
+        result = []
+        batch_start = 0
+        while batch_keys := client.zrange(
+            self._get_keys_name(table_name), batch_start, batch_start + self.batch_size - 1
+        ):
+            batch_start += len(batch_keys)
+            for serialized_record in client.hmget(table_name, batch_keys):
+                # Skip records deleted after reading the keys and records of other types in the same table
+                if serialized_record and (data := json.loads(serialized_record))["_type"] in subtype_names:
+                    result.append(self._get_data_serializer().deserialize_data(_decode_json_value(data)))
+        return result
+
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        # Use the fields that are set in the filter, empty containers are treated as not set
+        filter_values = [
+            (k, v)
+            for k in _get_class_hierarchy_slots(filter_obj.__class__)
+            if (v := getattr(filter_obj, k)) is not None and not (hasattr(v, "__len__") and len(v) == 0)
+        ]
+        records = self.load_all(record_type, dataset=dataset, identity=identity)
+        return [record for record in records if all(getattr(record, k, None) == v for k, v in filter_values)]
+
+    def save_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.save_many([record], dataset=dataset, identity=identity)
+
+    def save_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self._check_dataset_and_identity(dataset, identity)
+
+        # Serialize records grouped by table, None records are skipped
+        serialized_records_dict: Dict[str, Dict[str, bytes]] = defaultdict(dict)
+        for record in records:
+            if record is None:
+                continue
+
+            # Call on_save if defined
+            if hasattr(record, "on_save"):
+                record.on_save()  # TODO: Refactor on_save
+
+            # Serialize data, this also executes 'init_all' method
+            serialized_key = key_serializer.serialize_key(record)
+            serialized_records_dict[self._get_table_name(record.get_key_type())][serialized_key] = (
+                self._serialize_record(record)
+            )
+
+        # Write all tables atomically in a single round trip
+        pipeline = self._get_client().pipeline(transaction=True)
+        for table_name, serialized_records in serialized_records_dict.items():
+            serialized_items = list(serialized_records.items())
+            for batch_start in range(0, len(serialized_items), self.batch_size):
+                batch = dict(serialized_items[batch_start : batch_start + self.batch_size])
+                pipeline.hset(table_name, mapping=batch)
+                pipeline.zadd(self._get_keys_name(table_name), {k: 0 for k in batch.keys()})
+            pipeline.incr(self._get_version_name(table_name))
+        pipeline.execute()
+
+    def delete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.delete_many([key], dataset=dataset, identity=identity)
+
+    def delete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self._check_dataset_and_identity(dataset, identity)
+
+        if keys is None:
+            return
+
+        # Group serialized keys by table, None keys are skipped
+        serialized_keys_dict: Dict[str, List[str]] = defaultdict(list)
+        for key in keys:
+            if key is not None:
+                serialized_keys_dict[self._get_table_name(key.get_key_type())].append(key_serializer.serialize_key(key))
+
+        # Delete from all tables atomically in a single round trip
+        pipeline = self._get_client().pipeline(transaction=True)
+        for table_name, serialized_keys in serialized_keys_dict.items():
+            for batch_start in range(0, len(serialized_keys), self.batch_size):
+                batch = serialized_keys[batch_start : batch_start + self.batch_size]
+                pipeline.hdel(table_name, *batch)
+                pipeline.zrem(self._get_keys_name(table_name), *batch)
+            pipeline.incr(self._get_version_name(table_name))
+        pipeline.execute()
+
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        self._check_dataset_and_identity(dataset, None)
+        version = self._get_client().get(self._get_version_name(self._get_table_name(key_type)))
+        return int(version) if version is not None else 0
+
+    def delete_all_and_drop_db(self) -> None:
+        # Check that db_id matches temp_db_prefix
+        Context.error_if_not_temp_db(self.db_id)
+
+        # Delete all Redis keys of this database in batches, other databases on the same server are not affected
+        client = self._get_client()
+        pattern = "".join(f"\\{c}" if c in _glob_special_chars else c for c in self.db_id) + ":*"
+        batch = []
+        for redis_key in client.scan_iter(match=pattern, count=self.batch_size):
+            batch.append(redis_key)
+            if len(batch) >= self.batch_size:
+                client.delete(*batch)
+                batch = []
+        if batch:
+            client.delete(*batch)
+
+    def close_connection(self) -> None:
+        if (client := _client_dict.get(self.client_uri, None)) is not None:
+            # Close connection
+            client.close()
+            # Remove client from dictionary so connection can be reopened on next access
+            del _client_dict[self.client_uri]
+
+    def _get_client(self) -> Redis:
+        """Get Redis client object."""
+        if (client := _client_dict.get(self.client_uri, None)) is None:
+            # Create if it does not exist
+            client = Redis.from_url(self.client_uri)
+            _client_dict[self.client_uri] = client
+        return client
+
+    def _get_table_name(self, key_type: Type) -> str:
+        """Name of the Redis hash for the key type, prefixed by db_id to isolate databases on the same server."""
+        return f"{self.db_id}:{key_type.__name__}"  # TODO: Decision on short alias
+
+    @classmethod
+    def _get_keys_name(cls, table_name: str) -> str:
+        """Name of the Redis sorted set with the keys of the table."""
+        return f"{table_name}:keys"
+
+    @classmethod
+    def _get_version_name(cls, table_name: str) -> str:
+        """Name of the Redis counter with the version stamp of the table."""
+        return f"{table_name}:version"
+
+    def _get_data_serializer(self) -> DictSerializer:
+        """Get serializer for the records read from the database, trusted if specified by trusted_load."""
+        return trusted_data_serializer if self.trusted_load else data_serializer
+
+    @classmethod
+    def _serialize_record(cls, record: RecordProtocol) -> bytes:
+        """Serialize record to compact JSON encoded as UTF-8, primitive types not supported by JSON have type prefix."""
+        serialized_data = data_serializer.serialize_data(record)
+        return json.dumps(serialized_data, default=_encode_json_default, separators=(",", ":")).encode("utf-8")
+
+    def _deserialize_record(self, serialized_record: bytes) -> Any:
+        """Deserialize record from compact JSON encoded as UTF-8."""
+        return self._get_data_serializer().deserialize_data(_decode_json_value(json.loads(serialized_record)))
+
+    @classmethod
+    def _check_dataset_and_identity(cls, dataset: str | None, identity: str | None) -> None:
+        """Confirm dataset and identity are both None."""
+        if dataset is not None:
+            raise RuntimeError("Redis database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("Redis database type does not support row-level security.")
@@ -0,0 +1,72 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+from dataclasses import dataclass
+from urllib.parse import quote
+from cl.runtime.context.context import Context
+from cl.runtime.db.sql.sqlite_connection_pool import SqliteConnectionPool
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.db.sql.sqlite_db import dict_factory
+
+
+@dataclass(slots=True, kw_only=True)
+class InMemorySqliteDb(SqliteDb):
+    """
+    Sqlite database held in memory and shared by all connections with the same db_id in this process,
+    for unit tests and other runs whose data is not kept. Use backup_to_file to save a copy to disk.
+
+    Notes:
+        - The data is discarded when close_connection is called or the process exits
+        - The database uses the memdb VFS (SQLite 3.36 or later) rather than shared cache, so that locks
+          are taken on the whole database as for a file and busy_timeout applies to concurrent access
+    """
+
+    def delete_all_and_drop_db(self) -> None:
+        # Check that db_id matches temp_db_prefix
+        Context.error_if_not_temp_db(self.db_id)
+
+        # Closing the last connection discards the data, the file created by backup_to_file is not deleted
+        self.close_connection()
+
+    def backup_to_file(self, file_path: str | None = None) -> str:
+        """
+        Save a copy of the database to the specified file, or to the file used by SqliteDb with the same db_id
+        if not specified, replacing the existing content of the file. Return the path to the file.
+        """
+        if file_path is None:
+            file_path = self._get_db_file()
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        target = sqlite3.connect(file_path)
+        try:
+            self._get_connection().backup(target)
+        finally:
+            target.close()
+        return file_path
+
+    def _get_pool_key(self) -> str:
+        # Use URI so that connections are not shared with SqliteDb for the file with the same db_id
+        return self._get_db_uri()
+
+    def _create_connection_pool(self) -> SqliteConnectionPool:
+        return SqliteConnectionPool(db_file=self._get_db_uri(), uri=True, row_factory=dict_factory)
+
+    def _get_db_uri(self) -> str:
+        """
+        Connections with the same name access the same in-memory database. Shared cache is not used because
+        it locks individual tables and fails at once with SQLITE_LOCKED, which busy_timeout does not retry.
+        """
+        # The memdb VFS shares the database between connections in this process when the name starts with '/'
+        return f"file:/{quote(self.db_id, safe='')}?vfs=memdb"
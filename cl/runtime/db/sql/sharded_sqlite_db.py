@@ -0,0 +1,385 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import glob
+import os
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Type
+from typing import TypeVar
+from cl.runtime.context.context import Context
+from cl.runtime.db.db import Db
+from cl.runtime.db.db_page import DbPage
+from cl.runtime.db.protocols import TKey
+from cl.runtime.db.protocols import TRecord
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.schema.type_index_decl import TypeIndexDecl
+from cl.runtime.settings.project_settings import ProjectSettings
+from cl.runtime.settings.sqlite_settings import SqliteSettings
+
+T = TypeVar("T")
+
+_executor_dict: Dict[str, ThreadPoolExecutor] = {}
+"""Dict of executors for the async methods with db_id key stored outside the class to avoid serialization."""
+
+
+@dataclass(slots=True, kw_only=True)
+class ShardedSqliteDb(Db):
+    """
+    Sqlite database that stores the table for each key type in a separate file named '{db_id}.{shard_name}.sqlite',
+    so that writes to different tables do not wait for the same file lock.
+
+    Notes:
+        - The methods that access more than one shard issue the queries in parallel, one thread per shard
+        - A write to several shards is not atomic, each shard commits its part in a separate transaction
+    """
+
+    shard_names: Dict[str, str] | None = None
+    """
+    Shard name indexed by key type name (e.g. 'LogMessageKey'), use the same shard name for several key types
+    to store their tables in the same file. Other key types are stored in a shard named after the key type.
+    """
+
+    fetch_size: int = 1000
+    """Number of rows fetched from the cursor at a time when streaming query results."""
+
+    save_batch_size: int = 500
+    """Maximum number of rows written by a single statement, reduced further if required by the bound variable limit."""
+
+    typed_columns: bool = False
+    """Storage mode of each shard, see the field with the same name in SqliteDb."""
+
+    auto_index_threshold: int | None = 2
+    """Create an index for load_filter fields after this number of queries using them, no automatic indexes if None."""
+
+    trusted_load: bool = False
+    """If True, records read from the shards are not validated after deserialization, see SqliteDb."""
+
+    __shards: Dict[str, SqliteDb] = field(default_factory=lambda: {})
+    """Database for each shard name, created on first access."""
+
+    def load_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        return self._get_shard_for_type(record_type).load_one(
+            record_type,
+            record_or_key,
+            dataset=dataset,
+            identity=identity,
+            is_key_optional=is_key_optional,
+            is_record_optional=is_record_optional,
+        )
+
+    def load_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        if records_or_keys is None:
+            return None
+
+        # Group positions by shard, None is returned for None items
+        records_or_keys = list(records_or_keys)
+        positions_dict: Dict[str, List[int]] = {}
+        for position, record_or_key in enumerate(records_or_keys):
+            if record_or_key is not None:
+                shard_name = self._get_shard_name(record_or_key.get_key_type())
+                positions_dict.setdefault(shard_name, []).append(position)
+
+        # Load from each shard and reassemble the result in the input order
+        loaded_dict = self._run_on_shards(
+            {
+                shard_name: lambda shard, positions=positions: list(
+                    shard.load_many(
+                        record_type, [records_or_keys[x] for x in positions], dataset=dataset, identity=identity
+                    )
+                )
+                for shard_name, positions in positions_dict.items()
+            }
+        )
+        result = [None] * len(records_or_keys)
+        for shard_name, positions in positions_dict.items():
+            for position, record in zip(positions, loaded_dict[shard_name]):
+                result[position] = record
+        return result
+
+    def load_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        return self._get_shard_for_type(record_type).load_all(record_type, dataset=dataset, identity=identity)
+
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        return self._get_shard_for_type(record_type).load_filter(
+            record_type, filter_obj, dataset=dataset, identity=identity
+        )
+
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        return self._get_shard_for_type(record_type).load_page(
+            record_type, after_key=after_key, limit=limit, order=order, dataset=dataset, identity=identity
+        )
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        keys = list(keys)
+        positions_dict: Dict[str, List[int]] = {}
+        for key_type, positions in self._group_positions_by_key_type(keys).items():
+            positions_dict.setdefault(self._get_shard_name(key_type), []).extend(positions)
+
+        exists_dict = self._run_on_shards(
+            {
+                shard_name: lambda shard, positions=positions: shard.exists_many(
+                    [keys[x] for x in positions], dataset=dataset, identity=identity
+                )
+                for shard_name, positions in positions_dict.items()
+            }
+        )
+        result = [False] * len(keys)
+        for shard_name, positions in positions_dict.items():
+            for position, exists in zip(positions, exists_dict[shard_name]):
+                result[position] = exists
+        return result
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        return self._get_shard_for_type(record_type).count(record_type, filter_obj, dataset=dataset, identity=identity)
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        return self._get_shard_for_type(record_type).search(
+            record_type, query, limit=limit, dataset=dataset, identity=identity
+        )
+
+    def save_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        if record is not None:
+            self._get_shard_for_type(record.get_key_type()).save_one(record, dataset=dataset, identity=identity)
+
+    def save_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        # Group records by shard, None records are skipped
+        records_dict: Dict[str, List[RecordProtocol]] = {}
+        for record in records:
+            if record is not None:
+                records_dict.setdefault(self._get_shard_name(record.get_key_type()), []).append(record)
+
+        self._run_on_shards(
+            {
+                shard_name: lambda shard, shard_records=shard_records: shard.save_many(
+                    shard_records, dataset=dataset, identity=identity
+                )
+                for shard_name, shard_records in records_dict.items()
+            }
+        )
+
+    def delete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self._get_shard_for_type(key_type).delete_one(key_type, key, dataset=dataset, identity=identity)
+
+    def delete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        if keys is None:
+            return
+
+        # Group keys by shard, None keys are skipped
+        keys_dict: Dict[str, List[KeyProtocol]] = {}
+        for key in keys:
+            if key is not None:
+                keys_dict.setdefault(self._get_shard_name(key.get_key_type()), []).append(key)
+
+        self._run_on_shards(
+            {
+                shard_name: lambda shard, shard_keys=shard_keys: shard.delete_many(
+                    shard_keys, dataset=dataset, identity=identity
+                )
+                for shard_name, shard_keys in keys_dict.items()
+            }
+        )
+
+    def delete_all_and_drop_db(self) -> None:
+        # Check that db_id matches temp_db_prefix, each shard also checks its own db_id
+        Context.error_if_not_temp_db(self.db_id)
+
+        # Include the shards created by previous runs that have not been accessed by this instance
+        for shard_db_id in self._get_existing_shard_db_ids():
+            self._create_shard(shard_db_id).delete_all_and_drop_db()
+        for shard in self.__shards.values():
+            shard.delete_all_and_drop_db()
+        self.__shards.clear()
+        self._shutdown_executor()
+
+    def close_connection(self) -> None:
+        for shard in self.__shards.values():
+            shard.close_connection()
+        self._shutdown_executor()
+
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        return self._get_shard_for_type(key_type).get_table_version(key_type, dataset=dataset)
+
+    def get_executor(self) -> Executor | None:
+        # Dedicated bounded executor for the async methods, queries to the shards run on the executor of each shard
+        if (result := _executor_dict.get(self.db_id, None)) is None:
+            max_workers = SqliteSettings.instance().executor_max_workers
+            result = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"ShardedSqliteDb;{self.db_id}")
+            if (existing := _executor_dict.setdefault(self.db_id, result)) is not result:
+                # Another thread created the executor first
+                result.shutdown(wait=False)
+                result = existing
+        return result
+
+    def create_index(self, record_type: Type[TRecord], index_decl: TypeIndexDecl) -> None:
+        """Create index declared using field names of 'record_type' in the table for its key type."""
+        self._get_shard_for_type(record_type).create_index(record_type, index_decl)
+
+    def is_empty(self) -> bool:
+        """Return True if the database has no tables or all tables are empty."""
+        return all(self._create_shard(x).is_empty() for x in self._get_existing_shard_db_ids())
+
+    def _get_shard_name(self, key_type: Type) -> str:
+        """Get shard name for the key type from shard_names, or the key type name if not specified there."""
+        key_type_name = key_type.__name__
+        if self.shard_names is not None and (result := self.shard_names.get(key_type_name, None)) is not None:
+            return result
+        return key_type_name
+
+    def _get_shard(self, shard_name: str) -> SqliteDb:
+        """Get database for the shard name, creating it on first access."""
+        if (result := self.__shards.get(shard_name, None)) is None:
+            # Use setdefault so that threads racing to create the shard end up using the same instance
+            result = self.__shards.setdefault(shard_name, self._create_shard(f"{self.db_id}.{shard_name}"))
+        return result
+
+    def _get_shard_for_type(self, record_or_key_type: Type) -> SqliteDb:
+        """Get database for the shard where records of the type are stored."""
+        return self._get_shard(self._get_shard_name(record_or_key_type.get_key_type()))
+
+    def _create_shard(self, shard_db_id: str) -> SqliteDb:
+        """Create database for the shard with the specified db_id using the settings of this database."""
+        return SqliteDb(
+            db_id=shard_db_id,
+            fetch_size=self.fetch_size,
+            save_batch_size=self.save_batch_size,
+            typed_columns=self.typed_columns,
+            auto_index_threshold=self.auto_index_threshold,
+            trusted_load=self.trusted_load,
+        )
+
+    def _get_existing_shard_db_ids(self) -> List[str]:
+        """Get db_id of each shard for which the database file exists."""
+        db_dir = ProjectSettings.get_databases_dir()
+        pattern = os.path.join(glob.escape(db_dir), f"{glob.escape(self.db_id)}.*.sqlite")
+        return sorted(os.path.basename(x).removesuffix(".sqlite") for x in glob.glob(pattern))
+
+    def _run_on_shards(self, tasks: Dict[str, Callable[[SqliteDb], T]]) -> Dict[str, T]:
+        """
+        Run task for each shard name and return the results by shard name. When there is more than one shard,
+        the tasks run in parallel on the executor of each shard and all of them complete before an error is raised.
+        """
+        if len(tasks) == 1:
+            # Run in the current thread when only one shard is accessed
+            shard_name, task = next(iter(tasks.items()))
+            return {shard_name: task(self._get_shard(shard_name))}
+
+        # Each task runs in its own copy of the caller context with an isolated context stack
+        futures = {}
+        for shard_name, task in tasks.items():
+            shard = self._get_shard(shard_name)
+            caller_context = self._copy_caller_context()
+            futures[shard_name] = shard.get_executor().submit(caller_context.run, task, shard)
+        wait(futures.values())
+        return {shard_name: future.result() for shard_name, future in futures.items()}
+
+    def _shutdown_executor(self) -> None:
+        """Shut down the executor for the async methods, a new executor is created on next access."""
+        if (executor := _executor_dict.pop(self.db_id, None)) is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,90 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import List
+from cl.runtime.settings.sqlite_settings import SqliteSettings
+
+
+@dataclass(slots=True, kw_only=True)
+class SqliteConnectionPool:
+    """Hands out one connection per thread for the same database file, connections are never shared across threads."""
+
+    db_file: str
+    """Path to the database file, or URI if 'uri' is True."""
+
+    uri: bool = False
+    """If True, db_file is interpreted as URI, for example 'file:/name?vfs=memdb'."""
+
+    row_factory: Callable[[sqlite3.Cursor, tuple], Any] | None = None
+    """Row factory assigned to each new connection."""
+
+    _local: threading.local = field(default_factory=threading.local)
+    """Thread-local storage for the connection of the current thread."""
+
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    """Lock for the list of open connections."""
+
+    _connections: List[sqlite3.Connection] = field(default_factory=list)
+    """All open connections so that they can be closed together."""
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Get connection for the current thread, opening it on first access."""
+        if (connection := getattr(self._local, "connection", None)) is None:
+            connection = self._connect()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def close_all(self) -> None:
+        """Close connections opened by all threads, new connections will be opened on next access."""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+            # Replace thread-local storage so that other threads do not reuse closed connections
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the pragmas from settings."""
+        sqlite_settings = SqliteSettings.instance()
+
+        # The connection is used only by the thread that opened it, however it may be closed by
+        # another thread in close_all, which requires disabling the same thread check
+        connection = sqlite3.connect(
+            self.db_file,
+            timeout=sqlite_settings.busy_timeout / 1000.0,
+            check_same_thread=False,
+            uri=self.uri,
+        )
+        connection.row_factory = self.row_factory
+
+        # Journal mode is persistent in the database file, other pragmas apply to this connection only
+        connection.execute(f"PRAGMA journal_mode={sqlite_settings.journal_mode};")
+        connection.execute(f"PRAGMA synchronous={sqlite_settings.synchronous};")
+        connection.execute(f"PRAGMA cache_size={sqlite_settings.cache_size};")
+        connection.execute(f"PRAGMA mmap_size={sqlite_settings.mmap_size};")
+        connection.execute(f"PRAGMA busy_timeout={sqlite_settings.busy_timeout};")
+
+        # REPLACE fires delete triggers for the replaced row only when recursive triggers are enabled,
+        # which is required to remove the replaced row from the full-text search table
+        connection.execute("PRAGMA recursive_triggers=ON;")
+        return connection
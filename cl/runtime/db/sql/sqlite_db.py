@@ -15,33 +15,57 @@
 import os
 import sqlite3
 from collections import defaultdict
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from itertools import groupby
 from typing import Any
 from typing import Dict
 from typing import Iterable
+from typing import List
+from typing import Set
 from typing import Tuple
 from typing import Type
 from cl.runtime.context.context import Context
+from cl.runtime.db.compression_util import CompressionUtil
+from cl.runtime.db.dataset_util import DatasetUtil
 from cl.runtime.db.db import Db
+from cl.runtime.db.db_page import DbPage
+from cl.runtime.db.page_token_util import PageTokenUtil
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
+from cl.runtime.db.sql.sqlite_connection_pool import SqliteConnectionPool
 from cl.runtime.db.sql.sqlite_schema_manager import SqliteSchemaManager
+from cl.runtime.db.sql.sqlite_schema_manager import dataset_column_name
+from cl.runtime.db.sql.sqlite_schema_manager import search_table_prefix
+from cl.runtime.db.sql.sqlite_schema_manager import search_text_column_name
 from cl.runtime.file.file_util import FileUtil
 from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import is_key
-from cl.runtime.records.record_util import RecordUtil
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from cl.runtime.schema.schema import Schema
+from cl.runtime.schema.type_index_decl import TypeIndexDecl
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
 from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
+from cl.runtime.serialization.typed_flat_dict_serializer import TypedFlatDictSerializer
 from cl.runtime.settings.project_settings import ProjectSettings
+from cl.runtime.settings.search_settings import SearchSettings
+from cl.runtime.settings.sqlite_settings import SqliteSettings
 
-_connection_dict: Dict[str, sqlite3.Connection] = {}
-"""Dict of Connection instances with db_id key stored outside the class to avoid serialization."""
+_connection_pool_dict: Dict[str, SqliteConnectionPool] = {}
+"""Dict of SqliteConnectionPool instances with pool key stored outside the class to avoid serialization."""
 
 _schema_manager_dict: Dict[str, SqliteSchemaManager] = {}
-"""Dict of SqliteSchemaManager instances with db_id key key stored outside the class to avoid serialization."""
+"""Dict of SqliteSchemaManager instances with pool key stored outside the class to avoid serialization."""
+
+_executor_dict: Dict[str, ThreadPoolExecutor] = {}
+"""Dict of executors for the async methods with pool key stored outside the class to avoid serialization."""
+
+
+table_versions_table_name = "_table_versions"
+"""Table storing the version stamp of each table, incremented on every write to that table."""
 
 
 def dict_factory(cursor, row):
@@ -52,33 +76,88 @@ def dict_factory(cursor, row):
 
 @dataclass(slots=True, kw_only=True)
 class SqliteDb(Db):
-    """Sqlite database without dataset and mile wide table for inheritance."""
+    """Sqlite database with dataset column and mile wide table for inheritance."""
+
+    fetch_size: int = 1000
+    """Number of rows fetched from the cursor at a time when streaming query results."""
+
+    save_batch_size: int = 500
+    """Maximum number of rows written by a single statement, reduced further if required by the bound variable limit."""
+
+    typed_columns: bool = False
+    """
+    If True, primitive fields are stored in columns with SQL types (dates as ISO int, enums as item name),
+    embedded keys as key strings, and the remaining fields as a single JSON blob per record.
+    Otherwise, each field is stored in a separate column as a type-prefixed string.
+    """
 
-    def batch_size(self) -> int:
-        pass
+    auto_index_threshold: int | None = 2
+    """Create an index for load_filter fields after this number of queries using them, no automatic indexes if None."""
+
+    trusted_load: bool = False
+    """
+    If True, records read from this database are trusted to match the current code and are not validated
+    after deserialization ('init' methods are still invoked). Use only when all records are written by this code.
+    """
 
     @classmethod
-    def _add_where_keys_in_clause(
+    def _get_keys_in_condition(
         cls,
-        sql_statement: str,
         key_fields: Tuple[str, ...],
         columns_mapping: Dict[str, str],
         keys_len: int,
-    ) -> str:
+    ) -> str | None:
         """
-        Add "WHERE (key_field1, ...) IN ((value1_for_field1, ...), (value2_for_field1, ...), ...)" clause to
-        sql_statement.
+        Return "(key_field1, ...) IN ((value1_for_field1, ...), (value2_for_field1, ...), ...)" condition
+        with placeholders for values, or None if there are no key fields.
         """
+        if not key_fields:
+            return None
+        value_places = ", ".join([f'({", ".join(["?"] * len(key_fields))})' for _ in range(keys_len)])
+        key_column_str = ", ".join([f'"{columns_mapping[key]}"' for key in key_fields])
+        return f"({key_column_str}) IN ({value_places})"
 
-        # if key fields isn't empty add WHERE clause
-        if key_fields:
-            value_places = ", ".join([f'({", ".join(["?"] * len(key_fields))})' for _ in range(keys_len)])
-            key_column_str = ", ".join([f'"{columns_mapping[key]}"' for key in key_fields])
+    @classmethod
+    def _normalize_dataset(cls, dataset: str | None) -> str:
+        """Convert dataset to backslash-delimited string format, None or empty string is the root dataset."""
+        return DatasetUtil.combine(dataset) if dataset else DatasetUtil.root()
 
-            # add WHERE clause to sql_statement
-            sql_statement += f" WHERE ({key_column_str}) IN ({value_places})"
+    @classmethod
+    def _get_visible_rows_source(
+        cls,
+        table_name: str,
+        columns: Iterable[str],
+        key_columns: Iterable[str],
+        dataset: str | None,
+        condition: str | None = None,
+        condition_values: Tuple[Any, ...] = (),
+    ) -> Tuple[str, Tuple[Any, ...], str | None]:
+        """
+        Return subquery for the rows visible in the dataset with the specified columns, its values, and the condition
+        on the subquery result (or None) that must be applied in the outer query.
 
-        return sql_statement
+        The datasets in the lookup list of the argument dataset are resolved in the same query, and for each key only
+        the row from the most specific dataset is visible. The condition is applied before this selection and must
+        only use key columns, conditions on other columns must be applied to the result of the subquery.
+        """
+        lookup_list = DatasetUtil.to_lookup_list(cls._normalize_dataset(dataset))
+        columns_str = ", ".join(f'"{x}"' for x in columns)
+        where_str = f"{condition} AND " if condition else ""
+        if len(lookup_list) == 1:
+            # Single dataset, subquery is flattened by SQLite
+            sql_statement = f'(SELECT {columns_str} FROM "{table_name}" WHERE {where_str}"{dataset_column_name}" = ?)'
+            return sql_statement, condition_values + tuple(lookup_list), None
+        else:
+            # Datasets in the lookup list are ancestors of each other, the most specific one has the longest name
+            partition_str = ", ".join(f'"{x}"' for x in key_columns)
+            partition_str = f"PARTITION BY {partition_str} " if partition_str else ""
+            dataset_placeholders = ", ".join(["?"] * len(lookup_list))
+            sql_statement = (
+                f"(SELECT {columns_str}, ROW_NUMBER() OVER "
+                f'({partition_str}ORDER BY length("{dataset_column_name}") DESC) AS "_rank" '
+                f'FROM "{table_name}" WHERE {where_str}"{dataset_column_name}" IN ({dataset_placeholders}))'
+            )
+            return sql_statement, condition_values + tuple(lookup_list), '"_rank" = 1'
 
     @classmethod
     def _serialize_keys_to_flat_tuple(
@@ -94,6 +173,148 @@ class SqliteDb(Db):
 
         return tuple(serializer.serialize_data(getattr(key, key_field)) for key in keys for key_field in key_fields)
 
+    def _load_where(
+        self,
+        record_type: Type[TRecord],
+        filter_values: Dict[str, Any] | None = None,
+        dataset: str | None = None,
+        *,
+        after_key: KeyProtocol | None = None,
+        is_descending: bool = False,
+        limit: int | None = None,
+    ) -> Iterable[TRecord]:
+        """
+        Load records of the specified type and its subtypes visible in the dataset sorted by key, where the columns
+        for fields in 'filter_values' are equal to the serialized values, streaming the result in chunks of fetch_size.
+        If 'after_key' is specified, only the records whose key is after it in the sort order are loaded.
+        """
+
+        serializer = self._get_serializer()
+        schema_manager = self._get_schema_manager()
+
+        table_name: str = schema_manager.table_name_for_type(record_type)
+
+        # if table doesn't exist return empty iterable
+        if not schema_manager.table_exists(table_name):
+            return
+
+        key_type = record_type.get_key_type()
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+        reversed_columns_mapping = schema_manager.get_reversed_columns_mapping(key_type)
+        key_columns = [columns_mapping[key_field] for key_field in schema_manager.get_primary_keys(record_type)]
+        select_columns = schema_manager.get_select_columns(table_name, record_type)
+        sql_statement, query_values = self._get_select_statement(
+            record_type,
+            select_columns,
+            filter_values,
+            dataset,
+            after_key=after_key,
+            is_descending=is_descending,
+        )
+
+        # Sort by key columns on the database side, singletons have no key columns and are not sorted
+        if key_columns:
+            order_str = " DESC" if is_descending else ""
+            order_by_str = ", ".join(f'"{key_column}"{order_str}' for key_column in key_columns)
+            sql_statement += f" ORDER BY {order_by_str}"
+        if limit is not None:
+            sql_statement += " LIMIT ?"
+            query_values += (limit,)
+        sql_statement += ";"
+
+        cursor = self._get_connection().cursor()
+        cursor.execute(sql_statement, query_values)
+
+        # Fetch in chunks of fetch_size rows so that memory use does not grow with the size of the table
+        while rows := cursor.fetchmany(self.fetch_size):
+            for data in rows:
+                data = {
+                    reversed_columns_mapping[k]: CompressionUtil.decompress_value(v)
+                    for k, v in data.items()
+                    if v is not None
+                }
+                yield serializer.deserialize_data(data)
+
+    def _get_filter_values(self, filter_obj: RecordProtocol) -> Dict[str, Any]:
+        """
+        Serialize the fields that are set in the filter in the same way as they are serialized on save,
+        which also covers embedded keys, enums, and compressed values, skip the fields whose serialized value is None.
+        """
+        serializer = self._get_serializer()
+        key_type = filter_obj.get_key_type()
+        key_fields = self._get_schema_manager().get_primary_keys(key_type)
+        uncompressed_fields = self._get_uncompressed_fields(key_type)
+        return {
+            k: serialized_v if k in uncompressed_fields else CompressionUtil.compress_value(serialized_v)
+            for k in _get_class_hierarchy_slots(filter_obj.__class__)
+            if (v := getattr(filter_obj, k)) is not None
+            and (serialized_v := self._serialize_field_value(serializer, k, v, key_fields)) is not None
+        }
+
+    def _get_select_statement(
+        self,
+        record_type: Type[TRecord],
+        select_columns: List[str] | None,
+        filter_values: Dict[str, Any] | None = None,
+        dataset: str | None = None,
+        *,
+        after_key: KeyProtocol | None = None,
+        is_descending: bool = False,
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        """
+        Return SELECT statement without ORDER BY clause and its values for the records of the specified type and
+        its subtypes visible in the dataset, where the columns for fields in 'filter_values' are equal to the serialized
+        values and the key is after 'after_key' in the sort order if specified. Select COUNT(*) if 'select_columns'
+        is None. The table for the record type must exist.
+        """
+        serializer = self._get_serializer()
+        schema_manager = self._get_schema_manager()
+
+        table_name: str = schema_manager.table_name_for_type(record_type)
+        key_type = record_type.get_key_type()
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+        key_fields = schema_manager.get_primary_keys(record_type)
+        key_columns = [columns_mapping[key_field] for key_field in key_fields]
+        filter_fields = tuple(filter_values.keys()) if filter_values else tuple()
+
+        # Type and filter conditions are applied to the most specific version of each record
+        inner_columns = list(select_columns) if select_columns is not None else []
+        inner_columns.extend(
+            x for x in ["_type", *(columns_mapping[k] for k in filter_fields)] if x not in inner_columns
+        )
+
+        # Condition on key columns for keyset pagination uses row value comparison to make use of the key index
+        after_condition = None
+        after_values = ()
+        if after_key is not None and key_columns:
+            key_columns_str = ", ".join(f'"{x}"' for x in key_columns)
+            key_placeholders = ", ".join(["?"] * len(key_columns))
+            after_condition = f"({key_columns_str}) {'<' if is_descending else '>'} ({key_placeholders})"
+            after_values = self._serialize_keys_to_flat_tuple([after_key], key_fields, serializer)
+        source_str, query_values, conditions_str = self._get_visible_rows_source(
+            table_name, inner_columns, key_columns, dataset, after_condition, after_values
+        )
+
+        # get subtypes for record_type and use them in match condition
+        subtype_names = tuple(t.__name__ for t in Schema.get_type_successors(record_type))
+        value_placeholders = ", ".join(["?"] * len(subtype_names))
+        select_columns_str = ", ".join(f'"{x}"' for x in select_columns) if select_columns is not None else "COUNT(*)"
+        where_str = f"{conditions_str} AND " if conditions_str else ""
+        sql_statement = (
+            f"SELECT {select_columns_str} FROM {source_str} WHERE {where_str}_type in ({value_placeholders})"
+        )
+        query_values += subtype_names
+
+        # Add parameterized condition for each filter field
+        if filter_values:
+            sql_statement += "".join(f' AND "{columns_mapping[k]}" = ?' for k in filter_fields)
+            query_values += tuple(filter_values.values())
+
+            # Create an index for the filter fields on demand if they are queried repeatedly
+            schema_manager.register_filter_query(table_name, key_type, filter_fields)
+
+        return sql_statement, query_values
+
     def load_one(
         self,
         record_type: Type[TRecord],
@@ -127,7 +348,7 @@ class SqliteDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        serializer = FlatDictSerializer()
+        serializer = self._get_serializer()
         schema_manager = self._get_schema_manager()
 
         # Use itertools.groupby to preserve the original order of records_or_keys
@@ -151,36 +372,45 @@ class SqliteDb(Db):
                     keys_group = tuple(keys_group)
 
                 # return None for all keys in group if table doesn't exist
-                existing_tables = schema_manager.existing_tables()
-                if table_name not in existing_tables:
+                if not schema_manager.table_exists(table_name):
                     yield from (None for _ in range(len(keys_group)))
                     continue
 
                 key_fields = schema_manager.get_primary_keys(key_type)
                 columns_mapping = schema_manager.get_columns_mapping(key_type)
-
-                # if keys_group don't support "in" or "len" operator convert it to tuple
-                sql_statement = f'SELECT * FROM "{table_name}"'
-                sql_statement = self._add_where_keys_in_clause(
-                    sql_statement, key_fields, columns_mapping, len(keys_group)
+                key_columns = [columns_mapping[key_field] for key_field in key_fields]
+
+                # Resolve all datasets in the lookup list using a single query
+                select_columns = schema_manager.get_select_columns(table_name, key_type)
+                select_columns_str = ", ".join(f'"{x}"' for x in select_columns)
+                source_str, query_values, conditions_str = self._get_visible_rows_source(
+                    table_name,
+                    select_columns,
+                    key_columns,
+                    dataset,
+                    self._get_keys_in_condition(key_fields, columns_mapping, len(keys_group)),
+                    self._serialize_keys_to_flat_tuple(keys_group, key_fields, serializer),
                 )
+                sql_statement = f"SELECT {select_columns_str} FROM {source_str}"
+                if conditions_str:
+                    sql_statement += f" WHERE {conditions_str}"
                 sql_statement += ";"
 
-                # serialize keys to tuple
-                query_values = self._serialize_keys_to_flat_tuple(keys_group, key_fields, serializer)
-
                 cursor = self._get_connection().cursor()
                 cursor.execute(sql_statement, query_values)
 
-                reversed_columns_mapping = {v: k for k, v in columns_mapping.items()}
+                reversed_columns_mapping = schema_manager.get_reversed_columns_mapping(key_type)
 
                 # TODO (Roman): investigate performance impact from this ordering approach
                 # bulk load from db returns records in any order so we need to check all records in group before return
                 # collect db result to dictionary to return it according to input keys order
                 result = {}
                 for data in cursor.fetchall():
-                    # TODO (Roman): select only needed columns on db side.
-                    data = {reversed_columns_mapping[k]: v for k, v in data.items() if v is not None}
+                    data = {
+                        reversed_columns_mapping[k]: CompressionUtil.decompress_value(v)
+                        for k, v in data.items()
+                        if v is not None
+                    }
                     deserialized_data = serializer.deserialize_data(data)
 
                     # TODO (Roman): make key hashable and remove conversion of key to str
@@ -197,45 +427,169 @@ class SqliteDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        serializer = FlatDictSerializer()
-        schema_manager = self._get_schema_manager()
+        return self._load_where(record_type, dataset=dataset)
 
-        table_name: str = schema_manager.table_name_for_type(record_type)
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        return self._load_where(record_type, self._get_filter_values(filter_obj), dataset=dataset)
 
-        # if table doesn't exist return empty list
-        if table_name not in schema_manager.existing_tables():
-            return list()
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        serializer = self._get_serializer()
+        schema_manager = self._get_schema_manager()
+        cursor = self._get_connection().cursor()
 
-        # get subtypes for record_type and use them in match condition
-        subtype_names = tuple(t.__name__ for t in Schema.get_type_successors(record_type))
-        value_placeholders = ", ".join(["?"] * len(subtype_names))
-        sql_statement = f'SELECT * FROM "{table_name}" WHERE _type in ({value_placeholders});'
+        keys = list(keys)
+        result = [False] * len(keys)
+        for key_type, positions in self._group_positions_by_key_type(keys).items():
+            table_name = schema_manager.table_name_for_type(key_type)
+            if not schema_manager.table_exists(table_name):
+                continue
 
-        reversed_columns_mapping = {
-            v: k for k, v in schema_manager.get_columns_mapping(record_type.get_key_type()).items()
-        }
+            key_fields = schema_manager.get_primary_keys(key_type)
+            columns_mapping = schema_manager.get_columns_mapping(key_type)
+            key_columns = [columns_mapping[key_field] for key_field in key_fields]
+            if not key_columns:
+                # Singleton, the record exists if the table has a row visible in the dataset
+                source_str, query_values, conditions_str = self._get_visible_rows_source(
+                    table_name, [dataset_column_name], key_columns, dataset
+                )
+                where_str = f" WHERE {conditions_str}" if conditions_str else ""
+                cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {source_str}{where_str}) AS "_exists";', query_values)
+                is_found = bool(cursor.fetchone()["_exists"])
+                for position in positions:
+                    result[position] = is_found
+                continue
 
-        cursor = self._get_connection().cursor()
-        cursor.execute(sql_statement, subtype_names)
+            # Select only the key columns so that the query is answered from the unique index on the key columns
+            select_columns_str = ", ".join(f'"{x}"' for x in key_columns)
+            rows_per_statement = self._get_rows_per_statement(len(key_fields))
+            for chunk_start in range(0, len(positions), rows_per_statement):
+                chunk_positions = positions[chunk_start : chunk_start + rows_per_statement]
+                chunk_values = [
+                    tuple(serializer.serialize_data(getattr(keys[x], key_field)) for key_field in key_fields)
+                    for x in chunk_positions
+                ]
+                source_str, query_values, conditions_str = self._get_visible_rows_source(
+                    table_name,
+                    key_columns,
+                    key_columns,
+                    dataset,
+                    self._get_keys_in_condition(key_fields, columns_mapping, len(chunk_positions)),
+                    tuple(value for values in chunk_values for value in values),
+                )
+                where_str = f" WHERE {conditions_str}" if conditions_str else ""
+                cursor.execute(f"SELECT {select_columns_str} FROM {source_str}{where_str};", query_values)
+                found_values = set(tuple(row[x] for x in key_columns) for row in cursor.fetchall())
+                for position, values in zip(chunk_positions, chunk_values):
+                    result[position] = values in found_values
+        return result
 
-        # TODO: Implement sort in query and restore yield to support large collections
-        result = []
-        for data in cursor.fetchall():
-            # TODO (Roman): Select only needed columns on db side.
-            data = {reversed_columns_mapping[k]: v for k, v in data.items() if v is not None}
-            result.append(serializer.deserialize_data(data))
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        schema_manager = self._get_schema_manager()
+        if not schema_manager.table_exists(schema_manager.table_name_for_type(record_type)):
+            return 0
 
-        return RecordUtil.sort_records_by_key(result)
+        filter_values = self._get_filter_values(filter_obj) if filter_obj is not None else None
+        sql_statement, query_values = self._get_select_statement(record_type, None, filter_values, dataset)
+        cursor = self._get_connection().cursor()
+        cursor.execute(f"{sql_statement};", query_values)
+        return cursor.fetchone()["COUNT(*)"]
 
-    def load_filter(
+    def load_page(
         self,
         record_type: Type[TRecord],
-        filter_obj: TRecord,
         *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
         dataset: str | None = None,
         identity: str | None = None,
-    ) -> Iterable[TRecord]:
-        raise NotImplementedError()
+    ) -> DbPage:
+        self._check_page_limit(limit)
+        records = self._load_where(
+            record_type,
+            dataset=dataset,
+            after_key=PageTokenUtil.to_key(record_type.get_key_type(), after_key),
+            is_descending=order == IndexSortOrderEnum.DESCENDING,
+            limit=limit + 1,
+        )
+        return self._create_page(list(records), limit)
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        self._check_search_query(record_type, query, limit)
+        serializer = self._get_serializer()
+        schema_manager = self._get_schema_manager()
+
+        table_name = schema_manager.table_name_for_type(record_type)
+        if not schema_manager.table_exists(table_name):
+            return []
+        if (search_table_name := self._update_search_table(record_type.get_key_type())) is None:
+            return []
+
+        # The trigram index is used for phrase match of at least three characters, shorter queries use LIKE
+        if len(query) >= 3:
+            search_condition = f'"{search_table_name}" MATCH ?'
+            search_value = '"' + query.replace('"', '""') + '"'
+        else:
+            search_condition = f"\"{search_text_column_name}\" LIKE ? ESCAPE '\\'"
+            search_value = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+        # Search condition is applied to the most specific version of each record using its rowid
+        key_type = record_type.get_key_type()
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+        reversed_columns_mapping = schema_manager.get_reversed_columns_mapping(key_type)
+        key_columns = [columns_mapping[key_field] for key_field in schema_manager.get_primary_keys(record_type)]
+        select_columns = schema_manager.get_select_columns(table_name, record_type)
+        sql_statement, query_values = self._get_select_statement(record_type, [*select_columns, "rowid"], None, dataset)
+        sql_statement = (
+            f'SELECT * FROM ({sql_statement}) WHERE "rowid" IN '
+            f'(SELECT rowid FROM "{search_table_name}" WHERE {search_condition})'
+        )
+        query_values += (search_value,)
+        if key_columns:
+            sql_statement += " ORDER BY " + ", ".join(f'"{key_column}"' for key_column in key_columns)
+        sql_statement += " LIMIT ?;"
+        query_values += (limit,)
+
+        cursor = self._get_connection().cursor()
+        cursor.execute(sql_statement, query_values)
+        return [
+            serializer.deserialize_data(
+                {
+                    reversed_columns_mapping[k]: CompressionUtil.decompress_value(v)
+                    for k, v in data.items()
+                    if k != "rowid" and v is not None
+                }
+            )
+            for data in cursor.fetchall()
+        ]
 
     def save_one(
         self,
@@ -254,6 +608,9 @@ class SqliteDb(Db):
         identity: str | None = None,
     ) -> None:
 
+        # Convert to list because records are iterated more than once
+        records = list(records)
+
         # Call on_save if defined
         [
             record.on_save()
@@ -261,7 +618,7 @@ class SqliteDb(Db):
             if record is not None and hasattr(record, "on_save")
         ]
 
-        serializer = FlatDictSerializer()
+        serializer = self._get_serializer()
         schema_manager = self._get_schema_manager()
 
         grouped_records = defaultdict(list)
@@ -270,50 +627,74 @@ class SqliteDb(Db):
         for record in records:
             grouped_records[record.get_key_type()].append(record)
 
+        # Serialize records and collect the maximum set of fields for each group,
+        # large values are compressed except in the fields returned by _get_uncompressed_fields
+        serialized_groups = {}
         for key_type, records_group in grouped_records.items():
-            # serialize records
-            serialized_records = [serializer.serialize_data(rec, is_root=True) for rec in records_group]
-
-            # get maximum set of fields from records
-            all_fields = list({k for rec in serialized_records for k in rec.keys()})
-
-            # fill sql_values with ordered values from serialized records
-            # if field isn't in some records - fill with None
-            sql_values = tuple(
-                serialized_record[k] if k in serialized_record else None
-                for serialized_record in serialized_records
-                for k in all_fields
-            )
-
+            uncompressed_fields = self._get_uncompressed_fields(key_type)
+            serialized_records = [
+                {
+                    k: v if k in uncompressed_fields else CompressionUtil.compress_value(v)
+                    for k, v in serializer.serialize_data(rec, is_root=True).items()
+                }
+                for rec in records_group
+            ]
+            serialized_groups[key_type] = (serialized_records, list({k for rec in serialized_records for k in rec}))
+
+        # Create missing tables and columns before starting the transaction because DDL statements are
+        # committed immediately, this does not run any SQL for the tables and columns known to exist
+        for key_type, (_, all_fields) in serialized_groups.items():
             columns_mapping = schema_manager.get_columns_mapping(key_type)
-            quoted_columns = [f'"{columns_mapping[field]}"' for field in all_fields]
-            columns_str = ", ".join(quoted_columns)
-
-            value_placeholders = ", ".join([f"({', '.join(['?']*len(all_fields))})" for _ in range(len(records_group))])
-
-            table_name = schema_manager.table_name_for_type(key_type)
-
+            if any(field not in columns_mapping for field in all_fields):
+                # Fields of a subtype not included in the cached mapping, rebuild it from the schema
+                schema_manager.invalidate_columns_mapping(key_type)
+                columns_mapping = schema_manager.get_columns_mapping(key_type)
             primary_keys = [columns_mapping[primary_key] for primary_key in schema_manager.get_primary_keys(key_type)]
-
+            primary_keys.append(dataset_column_name)
+            column_types = schema_manager.get_column_types(key_type)
             schema_manager.create_table(
-                table_name, columns_mapping.values(), if_not_exists=True, primary_keys=primary_keys
+                schema_manager.table_name_for_type(key_type),
+                column_types.keys(),
+                if_not_exists=True,
+                primary_keys=primary_keys,
+                column_types=column_types,
             )
+            self._update_search_table(key_type)
 
-            sql_statement = f'REPLACE INTO "{table_name}" ({columns_str}) VALUES {value_placeholders};'
-
-            if not primary_keys:
-                # TODO (Roman): this is a workaround for handling singleton records.
-                #  Since they don't have primary keys, we can't automatically replace existing records.
-                #  So this code just deletes the existing records before saving.
-                #  As a possible solution, we can introduce some mandatory primary key that isn't based on the
-                #  key fields.
-                self.delete_many((rec.get_key() for rec in records_group))
+        self._create_table_versions_table()
 
-            connection = self._get_connection()
+        # Write all groups in a single transaction which is committed on exit or rolled back on error
+        dataset = self._normalize_dataset(dataset)
+        connection = self._get_connection()
+        with connection:
             cursor = connection.cursor()
-            cursor.execute(sql_statement, sql_values)
+            for key_type, records_group in grouped_records.items():
+                serialized_records, all_fields = serialized_groups[key_type]
 
-            connection.commit()
+                # fill rows with ordered values from serialized records
+                # if field isn't in some records - fill with None
+                rows = [
+                    tuple(serialized_record.get(k, None) for k in all_fields) + (dataset,)
+                    for serialized_record in serialized_records
+                ]
+
+                columns_mapping = schema_manager.get_columns_mapping(key_type)
+                columns_str = ", ".join(f'"{columns_mapping[field]}"' for field in all_fields)
+                columns_str += f', "{dataset_column_name}"'
+                table_name = schema_manager.table_name_for_type(key_type)
+
+                # Unique index includes the dataset column, which also applies to singletons that have no key fields
+                self._execute_in_chunks(
+                    cursor,
+                    f'REPLACE INTO "{table_name}" ({columns_str}) VALUES',
+                    len(all_fields) + 1,
+                    rows,
+                )
+
+            # Increment versions in the same transaction so that readers never see new data with the old version
+            self._increment_table_versions(
+                cursor, [schema_manager.table_name_for_type(key_type) for key_type in grouped_records.keys()]
+            )
 
     def delete_one(
         self,
@@ -333,41 +714,146 @@ class SqliteDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        serializer = FlatDictSerializer()
-        schema_manager = self._get_schema_manager()
+        serializer = self._get_serializer()
 
         # TODO (Roman): improve grouping
         grouped_keys = defaultdict(list)
         for key in keys:
             grouped_keys[key.get_key_type()].append(key)
 
-        for key_type, keys_group in grouped_keys.items():
-            table_name = schema_manager.table_name_for_type(key_type)
+        # Delete all groups in a single transaction which is committed on exit or rolled back on error,
+        # records are deleted only in the specified dataset and not in other datasets of its lookup list
+        dataset = self._normalize_dataset(dataset)
+        self._create_table_versions_table()
+        schema_manager = self._get_schema_manager()
+        connection = self._get_connection()
+        with connection:
+            cursor = connection.cursor()
+            for key_type, keys_group in grouped_keys.items():
+                self._delete_group(cursor, key_type, keys_group, dataset, serializer)
+            self._increment_table_versions(
+                cursor, [schema_manager.table_name_for_type(key_type) for key_type in grouped_keys.keys()]
+            )
 
-            existing_tables = schema_manager.existing_tables()
-            if table_name not in existing_tables:
-                continue
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        schema_manager = self._get_schema_manager()
+        if not schema_manager.table_exists(table_versions_table_name):
+            return 0
+        cursor = self._get_connection().cursor()
+        cursor.execute(
+            f'SELECT "version" FROM "{table_versions_table_name}" WHERE "table_name" = ?;',
+            (schema_manager.table_name_for_type(key_type),),
+        )
+        return row["version"] if (row := cursor.fetchone()) is not None else 0
 
-            key_fields = schema_manager.get_primary_keys(key_type)
-            columns_mapping = schema_manager.get_columns_mapping(key_type)
+    def _update_search_table(self, key_type: Type[TKey]) -> str | None:
+        """
+        Create or rebuild the full-text search table for the search fields of the table specified in SearchSettings,
+        return its name or None if the table has no search fields.
+        """
+        schema_manager = self._get_schema_manager()
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+        search_fields = SearchSettings.instance().get_table_fields(key_type)
+        return schema_manager.update_search_table(
+            schema_manager.table_name_for_type(key_type),
+            [columns_mapping[x] for x in search_fields if x in columns_mapping],
+        )
+
+    def _create_table_versions_table(self) -> None:
+        """Create the table of version stamps if it does not exist, no SQL is executed once it is known to exist."""
+        self._get_schema_manager().create_table(
+            table_versions_table_name,
+            ["table_name", "version"],
+            if_not_exists=True,
+            primary_keys=["table_name"],
+            column_types={"table_name": "TEXT", "version": "INTEGER"},
+        )
 
-            # if keys_group don't support "in" or "len" operator convert it to tuple
-            if not hasattr(keys_group, "__contains__") or not hasattr(keys_group, "__len__"):
-                keys_group = tuple(keys_group)
+    @classmethod
+    def _increment_table_versions(cls, cursor: sqlite3.Cursor, table_names: List[str]) -> None:
+        """Increment version stamps of the tables using cursor without committing."""
+        cursor.executemany(
+            f'INSERT INTO "{table_versions_table_name}" ("table_name", "version") VALUES (?, 1) '
+            f'ON CONFLICT ("table_name") DO UPDATE SET "version" = "version" + 1;',
+            [(table_name,) for table_name in table_names],
+        )
+
+    def _delete_group(
+        self,
+        cursor: sqlite3.Cursor,
+        key_type: Type[TKey],
+        keys_group: List[KeyProtocol],
+        dataset: str,
+        serializer: FlatDictSerializer | TypedFlatDictSerializer,
+    ) -> None:
+        """Delete records for keys of the same key type in the dataset using cursor without committing."""
+        schema_manager = self._get_schema_manager()
+        table_name = schema_manager.table_name_for_type(key_type)
+
+        if not schema_manager.table_exists(table_name):
+            return
+
+        key_fields = schema_manager.get_primary_keys(key_type)
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+
+        # Singletons have no key fields, delete the record in the dataset
+        if not key_fields:
+            cursor.execute(f'DELETE FROM "{table_name}" WHERE "{dataset_column_name}" = ?;', (dataset,))
+            return
+
+        # Split keys into chunks that fit the bound variable limit, one variable is used by the dataset
+        keys_per_statement = self._get_rows_per_statement(len(key_fields) + 1)
+        for chunk_start in range(0, len(keys_group), keys_per_statement):
+            keys_chunk = keys_group[chunk_start : chunk_start + keys_per_statement]
 
             # construct sql_statement with placeholders for values
-            sql_statement = f'DELETE FROM "{table_name}"'
-            sql_statement = self._add_where_keys_in_clause(sql_statement, key_fields, columns_mapping, len(keys_group))
-            sql_statement += ";"
+            keys_in_condition = self._get_keys_in_condition(key_fields, columns_mapping, len(keys_chunk))
+            sql_statement = f'DELETE FROM "{table_name}" WHERE {keys_in_condition} AND "{dataset_column_name}" = ?;'
 
             # serialize keys to tuple
-            query_values = self._serialize_keys_to_flat_tuple(keys_group, key_fields, serializer)
-
-            # perform delete query
-            connection = self._get_connection()
-            cursor = connection.cursor()
+            query_values = self._serialize_keys_to_flat_tuple(keys_chunk, key_fields, serializer) + (dataset,)
             cursor.execute(sql_statement, query_values)
-            connection.commit()
+
+    def _get_rows_per_statement(self, row_len: int) -> int:
+        """Number of rows with 'row_len' bound variables each in a single statement given save_batch_size and limit."""
+        connection = self._get_connection()
+        if hasattr(connection, "getlimit"):
+            max_variables = connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        else:
+            # Connection.getlimit is not available before Python 3.11, use the lowest SQLite default
+            max_variables = 999
+        return max(1, min(self.save_batch_size, max_variables // max(1, row_len)))
+
+    def _execute_in_chunks(
+        self,
+        cursor: sqlite3.Cursor,
+        sql_prefix: str,
+        row_len: int,
+        rows: List[Tuple[Any, ...]],
+    ) -> None:
+        """
+        Execute 'sql_prefix (?, ...), (?, ...), ...' for rows split into chunks that fit the bound variable limit.
+        Full chunks are passed to executemany so that the statement is prepared once and reused.
+        """
+        rows_per_statement = self._get_rows_per_statement(row_len)
+        row_placeholders = f"({', '.join(['?'] * row_len)})"
+
+        # Chunks with the maximum number of rows share the same prepared statement
+        full_chunks_len = len(rows) - len(rows) % rows_per_statement
+        if full_chunks_len > 0:
+            sql_statement = f"{sql_prefix} {', '.join([row_placeholders] * rows_per_statement)};"
+            cursor.executemany(
+                sql_statement,
+                (
+                    tuple(value for row in rows[chunk_start : chunk_start + rows_per_statement] for value in row)
+                    for chunk_start in range(0, full_chunks_len, rows_per_statement)
+                ),
+            )
+
+        # The remaining rows are written by a separate statement
+        if remaining_rows := rows[full_chunks_len:]:
+            sql_statement = f"{sql_prefix} {', '.join([row_placeholders] * len(remaining_rows))};"
+            cursor.execute(sql_statement, tuple(value for row in remaining_rows for value in row))
 
     def delete_all_and_drop_db(self) -> None:
         # Check that db_id matches temp_db_prefix
@@ -383,38 +869,98 @@ class SqliteDb(Db):
         db_filename = os.path.basename(db_file_path)
         Context.error_if_not_temp_db(db_filename)
 
-        # Delete database file if exists, all checks gave been performed
-        if os.path.exists(db_file_path):
-            os.remove(db_file_path)
+        # Delete database file and WAL journal files if exist, all checks gave been performed
+        for file_path in [db_file_path, f"{db_file_path}-wal", f"{db_file_path}-shm"]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
 
     def close_connection(self) -> None:
-        if (connection := _connection_dict.get(self.db_id, None)) is not None:
-            # Close connection
-            connection.close()
-            # Remove from dictionary so connection can be reopened on next access
-            del _connection_dict[self.db_id]
-            del _schema_manager_dict[self.db_id]
-            pass
+        pool_key = self._get_pool_key()
+        if (connection_pool := _connection_pool_dict.get(pool_key, None)) is not None:
+            # Close connections opened by all threads
+            connection_pool.close_all()
+            # Remove from dictionary so connections can be reopened on next access
+            del _connection_pool_dict[pool_key]
+            _schema_manager_dict.pop(pool_key, None)
+        if (executor := _executor_dict.pop(pool_key, None)) is not None:
+            # Threads of the executor hold connections that are now closed, a new executor is created on next access
+            executor.shutdown(wait=False)
+
+    def get_executor(self) -> Executor | None:
+        # Dedicated bounded executor limits the number of connections opened by the async methods
+        if (result := _executor_dict.get(self._get_pool_key(), None)) is None:
+            max_workers = SqliteSettings.instance().executor_max_workers
+            result = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"SqliteDb;{self.db_id}")
+            if (existing := _executor_dict.setdefault(self._get_pool_key(), result)) is not result:
+                # Another thread created the executor first
+                result.shutdown(wait=False)
+                result = existing
+        return result
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get PyMongo database object."""
-        if (connection := _connection_dict.get(self.db_id, None)) is None:
+        """Get sqlite connection for the current thread."""
+        return self._get_connection_pool().get_connection()
+
+    def _get_connection_pool(self) -> SqliteConnectionPool:
+        """Get the pool of per-thread connections to the database file."""
+        if (result := _connection_pool_dict.get(self._get_pool_key(), None)) is None:
+            # Use setdefault so that threads racing to create the pool end up using the same instance
             # TODO: Implement dispose logic
-            db_file = self._get_db_file()
-            connection = sqlite3.connect(db_file, check_same_thread=False)
-            connection.row_factory = dict_factory
-            _connection_dict[self.db_id] = connection
-        return connection
+            result = _connection_pool_dict.setdefault(self._get_pool_key(), self._create_connection_pool())
+        return result
+
+    def _get_pool_key(self) -> str:
+        """Key of the connection pool, schema manager and executor shared by instances accessing the same database."""
+        return self.db_id
+
+    def _create_connection_pool(self) -> SqliteConnectionPool:
+        """Create the pool of per-thread connections, override to connect to a database other than the file."""
+        return SqliteConnectionPool(db_file=self._get_db_file(), row_factory=dict_factory)
 
     def _get_schema_manager(self) -> SqliteSchemaManager:
-        """Get PyMongo database object."""
-        if (result := _schema_manager_dict.get(self.db_id, None)) is None:
+        """Get schema manager shared by all threads."""
+        if (result := _schema_manager_dict.get(self._get_pool_key(), None)) is None:
             # TODO: Implement dispose logic
-            connection = self._get_connection()
-            result = SqliteSchemaManager(sqlite_connection=connection)
-            _schema_manager_dict[self.db_id] = result
+            result = SqliteSchemaManager(
+                connection_pool=self._get_connection_pool(),
+                typed_columns=self.typed_columns,
+                auto_index_threshold=self.auto_index_threshold,
+            )
+            _schema_manager_dict[self._get_pool_key()] = result
         return result
 
+    def _get_uncompressed_fields(self, key_type: Type) -> Set[str]:
+        """
+        Fields stored without compression, which are the key fields used for lookup and the search fields
+        whose text is copied to the full-text search table by triggers that other SQLite clients must also run.
+        """
+        return {
+            *self._get_schema_manager().get_primary_keys(key_type),
+            *SearchSettings.instance().get_table_fields(key_type),
+        }
+
+    @classmethod
+    def _serialize_field_value(
+        cls,
+        serializer: FlatDictSerializer | TypedFlatDictSerializer,
+        field_name: str,
+        value: Any,
+        key_fields: Tuple[str, ...],
+    ) -> Any:
+        """Serialize top level field value in the same way as in serialize_data with is_root=True."""
+        if isinstance(value, bytes) and value and field_name not in key_fields:
+            # Stored as BLOB, see FlatDictSerializer.bytes_as_blob
+            return value
+        else:
+            return serializer.serialize_data(value)
+
+    def _get_serializer(self) -> FlatDictSerializer | TypedFlatDictSerializer:
+        """Get serializer for the storage mode specified by typed_columns."""
+        if self.typed_columns:
+            return TypedFlatDictSerializer(trusted=self.trusted_load)
+        else:
+            return FlatDictSerializer(bytes_as_blob=True, trusted=self.trusted_load)
+
     def _get_db_file(self) -> str:
         """Get database file path from db_id, applying the appropriate formatting conventions."""
 
@@ -428,6 +974,16 @@ class SqliteDb(Db):
         result = os.path.join(db_dir, f"{filename}.sqlite")
         return result
 
+    def create_index(self, record_type: Type[TRecord], index_decl: TypeIndexDecl) -> None:
+        """Create index declared using field names of 'record_type' in the table for its key type."""
+        schema_manager = self._get_schema_manager()
+        key_type = record_type.get_key_type()
+        schema_manager.create_index(
+            schema_manager.table_name_for_type(key_type),
+            schema_manager.get_columns_mapping(key_type),
+            index_decl,
+        )
+
     def is_empty(self) -> bool:
         """Return True if the database has no tables or all tables are empty."""
         connection = self._get_connection()
@@ -441,14 +997,15 @@ class SqliteDb(Db):
         if not tables:
             return True
 
-        # Check if all tables are empty
+        # Check if all tables are empty, version stamps and search tables are not records
         for table_name in tables:
             table_name = table_name["name"]
-            cursor.execute(f'SELECT COUNT(*) FROM "{table_name}";')
-            count = cursor.fetchone()["COUNT(*)"]
+            if table_name == table_versions_table_name or table_name.startswith(search_table_prefix):
+                continue
+            cursor.execute(f'SELECT 1 FROM "{table_name}" LIMIT 1;')
 
             # If any table has data, the database is not empty
-            if count > 0:
+            if cursor.fetchone() is not None:
                 return False
 
         return True
@@ -14,24 +14,48 @@
 
 import sqlite3
 from dataclasses import dataclass
+from dataclasses import field
 from inspect import isclass
+from typing import Callable
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import cast
+from cl.runtime.db.dataset_util import DatasetUtil
+from cl.runtime.db.sql.sqlite_connection_pool import SqliteConnectionPool
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from cl.runtime.schema.schema import Schema
+from cl.runtime.schema.type_index_decl import TypeIndexDecl
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
+from cl.runtime.serialization.typed_flat_dict_serializer import TypedFlatDictSerializer
+from cl.runtime.serialization.typed_flat_dict_serializer import column_affinities
+from cl.runtime.serialization.typed_flat_dict_serializer import data_field_name
+
+dataset_column_name = "_dataset"
+"""Column for the dataset of the record, each table has one row per key and dataset."""
+
+dataset_column_type = f"TEXT NOT NULL DEFAULT '{DatasetUtil.root()}'"
+"""Type of the dataset column, the default assigns root dataset to the rows saved before the column was added."""
+
+search_table_prefix = "_search_"
+"""Prefix of the full-text search table for each data table, its shadow tables and triggers use the same prefix."""
+
+search_text_column_name = "_text"
+"""Column of the full-text search table holding the values of the search columns separated by newline."""
 
 
 @dataclass(slots=True, kw_only=True)
 class SqliteSchemaManager:
     """Class to manage the sqlite schema (table names, columns mapping etc.)."""
 
-    sqlite_connection: sqlite3.Connection = None
-    """Sqlite connection."""
+    connection_pool: SqliteConnectionPool | None = None
+    """Pool providing the connection for the current thread."""
 
     pascalize_column_names: bool = False
     """If True - convert column names to pascal case."""
@@ -39,49 +63,253 @@ class SqliteSchemaManager:
     add_class_to_column_names: bool = True
     """If True - class name will be added to the column name in format ClassName.field_name."""
 
+    typed_columns: bool = False
+    """If True, use SQL types for primitive, key and enum fields and store other fields in a single data column."""
+
+    auto_index_threshold: int | None = 2
+    """Create an index for the filter fields after this number of queries using them, no automatic indexes if None."""
+
+    _existing_tables: Set[str] = field(default_factory=set)
+    """Names of the tables known to exist, a table not in this set is looked up in the catalog on each access."""
+
+    _table_columns: Dict[str, Set[str]] = field(default_factory=dict)
+    """Columns of the existing tables, loaded from the catalog on first access to each table."""
+
+    _columns_mapping_cache: Dict[Type, Dict[str, str]] = field(default_factory=dict)
+    """Cached result of get_columns_mapping for each type."""
+
+    _reversed_columns_mapping_cache: Dict[Type, Dict[str, str]] = field(default_factory=dict)
+    """Cached result of get_reversed_columns_mapping for each type."""
+
+    _primary_keys_cache: Dict[Type, Tuple[str, ...]] = field(default_factory=dict)
+    """Cached result of get_primary_keys for each type."""
+
+    _column_types_cache: Dict[Type, Dict[str, str | None]] = field(default_factory=dict)
+    """Cached result of get_column_types for each type."""
+
+    _select_columns_cache: Dict[Tuple[str, Type], Tuple[str, ...]] = field(default_factory=dict)
+    """Cached result of get_select_columns for each combination of table name and type."""
+
+    _filter_query_counts: Dict[Tuple[str, Tuple[str, ...]], int] = field(default_factory=dict)
+    """Number of filter queries for each combination of table name and filter fields."""
+
+    _search_columns: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    """Columns indexed by the full-text search table for each data table, for the tables known to be up to date."""
+
     def create_table(
         self,
         table_name: str,
         columns: Iterable[str],
         if_not_exists: bool = True,
         primary_keys: List[str] | None = None,
+        column_types: Dict[str, str | None] | None = None,
     ) -> None:
         """
         Create sqlite table with given name and columns.
 
-        No need to specify column types because sqlite supports dynamic typing.
-        Mile wide table contains columns for all subtypes.
+        Column types are optional because sqlite supports dynamic typing, columns without
+        the type in 'column_types' are created without declared type.
+        Mile wide table contains columns for all subtypes, when the table already exists
+        the columns added by new subtypes are added using ALTER TABLE.
         """
 
+        def column_decl(column: str) -> str:
+            """Quoted column name followed by column type if specified."""
+            column_type = column_types.get(column, None) if column_types is not None else None
+            return f'"{column}" {column_type}' if column_type is not None else f'"{column}"'
+
+        # Add missing columns to the existing table without recreating it, this does not
+        # run any catalog queries for the tables whose columns are already cached
+        columns = list(columns)
+        if if_not_exists and self.table_exists(table_name):
+            if any(x not in self.get_table_columns(table_name) for x in columns):
+                # Another process may have added the columns since they were cached, reload them from the catalog
+                self._reload_table_columns(table_name)
+            if missing_columns := [x for x in columns if x not in self.get_table_columns(table_name)]:
+                try:
+                    self._add_columns(table_name, missing_columns, column_decl, primary_keys)
+                except sqlite3.OperationalError as e:
+                    if "duplicate column name" not in str(e):
+                        raise
+                    # Another process added a column after the reload, add the remaining columns once more
+                    self._reload_table_columns(table_name)
+                    missing_columns = [x for x in columns if x not in self.get_table_columns(table_name)]
+                    self._add_columns(table_name, missing_columns, column_decl, primary_keys)
+                self._table_columns[table_name].update(missing_columns)
+                self._select_columns_cache.clear()
+            return
+
         if_not_exists_part: str = " IF NOT EXISTS" if if_not_exists else ""
-        columns_str: str = '"' + '", "'.join(columns) + '"'
+        columns_str: str = ", ".join(column_decl(column) for column in columns)
 
         # construct final create table statement
         create_table_statement: str = f"CREATE TABLE{if_not_exists_part} {table_name} ({columns_str});"
 
-        # execute create table statement
-        cursor = self.sqlite_connection.cursor()
-        cursor.execute(create_table_statement)
-
-        if primary_keys:
-            keys_str = ", ".join([f'"{key}"' for key in primary_keys])
-
-            # Make index name based on table name to be unique within database
-            index_name = f"{table_name}_key_index"
-
-            create_unique_index_statement = (
-                f'CREATE UNIQUE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({keys_str});'
+        # Create the table and its unique index in one transaction so that other connections never see the table
+        # without the index, DDL statements are otherwise committed one by one
+        connection = self._get_connection()
+        with connection:
+            cursor = connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE;")
+            cursor.execute(create_table_statement)
+            if primary_keys:
+                self._create_unique_index(cursor, table_name, primary_keys)
+
+        # Update metadata cache
+        self._existing_tables.add(table_name)
+        self._table_columns[table_name] = set(columns)
+        self._select_columns_cache.clear()
+
+    def _add_columns(
+        self,
+        table_name: str,
+        columns: List[str],
+        column_decl: Callable[[str], str],
+        primary_keys: List[str] | None,
+    ) -> None:
+        """Add columns to the existing table using ALTER TABLE, recreate unique index if a primary key is added."""
+        connection = self._get_connection()
+        with connection:
+            # Add all columns and the index in one transaction, DDL statements are otherwise committed one by one
+            connection.execute("BEGIN IMMEDIATE;")
+            for column in columns:
+                connection.execute(f'ALTER TABLE "{table_name}" ADD COLUMN {column_decl(column)};')
+            if primary_keys and any(x in primary_keys for x in columns):
+                # Recreate unique index when a primary key column is added to a table created before it
+                cursor = connection.cursor()
+                cursor.execute(f'DROP INDEX IF EXISTS "{table_name}_key_index";')
+                self._create_unique_index(cursor, table_name, primary_keys)
+
+    @classmethod
+    def _create_unique_index(cls, cursor: sqlite3.Cursor, table_name: str, primary_keys: List[str]) -> None:
+        """Create unique index on primary key columns using cursor without committing."""
+        keys_str = ", ".join([f'"{key}"' for key in primary_keys])
+
+        # Make index name based on table name to be unique within database
+        index_name = f"{table_name}_key_index"
+
+        create_unique_index_statement = (
+            f'CREATE UNIQUE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({keys_str});'
+        )
+        cursor.execute(create_unique_index_statement)
+
+    def create_index(self, table_name: str, columns_mapping: Dict[str, str], index_decl: TypeIndexDecl) -> None:
+        """Create index on the columns for the fields specified by index declaration if it does not exist."""
+
+        # Use ascending order unless descending order is specified
+        elements_str = ", ".join(
+            f'"{columns_mapping[element.name]}"'
+            + (" DESC" if element.direction == IndexSortOrderEnum.DESCENDING else "")
+            for element in index_decl.elements
+        )
+
+        # Make index name based on table name to be unique within database
+        index_suffix = index_decl.name if index_decl.name is not None else "_".join(x.name for x in index_decl.elements)
+        index_name = f"{table_name}_{index_suffix}_index"
+
+        cursor = self._get_connection().cursor()
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({elements_str});')
+        self._get_connection().commit()
+
+    def register_filter_query(self, table_name: str, key_type: Type, filter_fields: Tuple[str, ...]) -> None:
+        """Count filter queries for the specified fields and create an index once auto_index_threshold is reached."""
+
+        if self.auto_index_threshold is None:
+            return
+
+        # Leading key fields are already covered by the unique index on primary keys
+        primary_keys = self.get_primary_keys(key_type)
+        if filter_fields == primary_keys[: len(filter_fields)]:
+            return
+
+        # Index is created only once when the count reaches the threshold
+        count_key = (table_name, filter_fields)
+        count = self._filter_query_counts.get(count_key, 0) + 1
+        self._filter_query_counts[count_key] = count
+        if count == self.auto_index_threshold:
+            index_decl = TypeIndexDecl(
+                name=None,
+                elements=[IndexDecl(name=x, direction=IndexSortOrderEnum.ASCENDING) for x in filter_fields],
             )
-            cursor.execute(create_unique_index_statement)
+            self.create_index(table_name, self.get_columns_mapping(key_type), index_decl)
 
-        self.sqlite_connection.commit()
+    def update_search_table(self, table_name: str, search_columns: Iterable[str]) -> str | None:
+        """
+        Create or rebuild the FTS5 trigram table holding the text of the search columns for each row of the data
+        table, kept in sync by triggers on the data table. Return its name, or None if none of the search columns
+        exist, in which case the search table is dropped. No SQL is executed once the table is known to be up to date.
+        """
+        table_columns = self.get_table_columns(table_name)
+        search_columns = tuple(x for x in search_columns if x in table_columns)
+        search_table_name = f"{search_table_prefix}{table_name}"
+        if self._search_columns.get(table_name, None) == search_columns:
+            return search_table_name if search_columns else None
+
+        # Triggers are compared to the ones in the catalog to detect a change in search columns since the last run
+        new_text = " || char(10) || ".join(f"coalesce(new.\"{x}\", '')" for x in search_columns)
+        insert_trigger = (
+            f'CREATE TRIGGER "{search_table_name}_insert" AFTER INSERT ON "{table_name}" BEGIN '
+            f'INSERT INTO "{search_table_name}" (rowid, "{search_text_column_name}") VALUES (new.rowid, {new_text}); '
+            f"END"
+        )
+        delete_trigger = (
+            f'CREATE TRIGGER "{search_table_name}_delete" AFTER DELETE ON "{table_name}" BEGIN '
+            f'DELETE FROM "{search_table_name}" WHERE rowid = old.rowid; '
+            f"END"
+        )
+        update_trigger = (
+            f'CREATE TRIGGER "{search_table_name}_update" AFTER UPDATE ON "{table_name}" BEGIN '
+            f'DELETE FROM "{search_table_name}" WHERE rowid = old.rowid; '
+            f'INSERT INTO "{search_table_name}" (rowid, "{search_text_column_name}") VALUES (new.rowid, {new_text}); '
+            f"END"
+        )
+        cursor = self._get_connection().cursor()
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type='trigger' AND name=?;", (f"{search_table_name}_insert",)
+        )
+        existing_trigger = row["sql"] if (row := cursor.fetchone()) is not None else None
+        if existing_trigger != (insert_trigger if search_columns else None):
+            connection = self._get_connection()
+            with connection:
+                cursor = connection.cursor()
+                for trigger_suffix in ["insert", "delete", "update"]:
+                    cursor.execute(f'DROP TRIGGER IF EXISTS "{search_table_name}_{trigger_suffix}";')
+                cursor.execute(f'DROP TABLE IF EXISTS "{search_table_name}";')
+                if search_columns:
+                    # Trigram tokenizer supports case-insensitive substring search using the index
+                    cursor.execute(
+                        f'CREATE VIRTUAL TABLE "{search_table_name}" '
+                        f"USING fts5(\"{search_text_column_name}\", tokenize='trigram');"
+                    )
+                    for trigger in [insert_trigger, delete_trigger, update_trigger]:
+                        cursor.execute(f"{trigger};")
+
+                    # Index the rows saved before the search table was created
+                    existing_text = new_text.replace('new."', '"')
+                    cursor.execute(
+                        f'INSERT INTO "{search_table_name}" (rowid, "{search_text_column_name}") '
+                        f'SELECT rowid, {existing_text} FROM "{table_name}";'
+                    )
+
+        self._search_columns[table_name] = search_columns
+        return search_table_name if search_columns else None
 
     def delete_table_by_name(self, name: str, if_exists: bool = True) -> None:
         """Delete table in db."""
-        cursor = self.sqlite_connection.cursor()
+        cursor = self._get_connection().cursor()
         if_exists_part: str = " IF EXISTS" if if_exists else ""
         cursor.execute(f"DROP TABLE {if_exists_part} '{name}';")
-        self.sqlite_connection.commit()
+        self._get_connection().commit()
+
+        # Update metadata cache
+        self._existing_tables.discard(name)
+        self._table_columns.pop(name, None)
+        self._search_columns.pop(name, None)
+        self._select_columns_cache.clear()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get connection for the current thread from the pool."""
+        return self.connection_pool.get_connection()
 
     def table_name_for_type(self, type_: Type) -> str:
         """Return table name for the given type."""
@@ -92,17 +320,136 @@ class SqliteSchemaManager:
 
     def existing_tables(self) -> List[str]:
         """Return existing tables in db."""
-        cursor = self.sqlite_connection.cursor()
+        cursor = self._get_connection().cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
 
         return [select_res["name"] for select_res in cursor.fetchall()]
 
+    def table_exists(self, table_name: str) -> bool:
+        """
+        Return True if the table exists, using the metadata cache for the tables already known to exist.
+
+        Only existing tables are cached, because a missing table may be created by another process
+        at any time, the catalog is queried on each access to a table that is not yet known to exist.
+        """
+        if table_name in self._existing_tables:
+            return True
+        cursor = self._get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (table_name,))
+        if cursor.fetchone() is not None:
+            self._existing_tables.add(table_name)
+            return True
+        return False
+
+    def invalidate_cache(self) -> None:
+        """Clear cached metadata, it will be reloaded from the database catalog and the schema on next access."""
+        self._existing_tables.clear()
+        self._table_columns.clear()
+        self._columns_mapping_cache.clear()
+        self._reversed_columns_mapping_cache.clear()
+        self._primary_keys_cache.clear()
+        self._column_types_cache.clear()
+        self._select_columns_cache.clear()
+        self._search_columns.clear()
+
+    def get_table_columns(self, table_name: str) -> Set[str]:
+        """Return columns of an existing table, loading them from the catalog on first access."""
+        if (result := self._table_columns.get(table_name, None)) is None:
+            result = self._reload_table_columns(table_name)
+        return result
+
+    def _reload_table_columns(self, table_name: str) -> Set[str]:
+        """Load columns of an existing table from the catalog, including columns added by other processes."""
+        cursor = self._get_connection().cursor()
+        cursor.execute(f'PRAGMA table_info("{table_name}");')
+        result = {x["name"] for x in cursor.fetchall()}
+        self._table_columns[table_name] = result
+        return result
+
     def _get_type_fields(self, type_: Type) -> Dict[str, Type]:  # TODO: Consolidate this and similar code in Schema
         """Return field name and type of annotation based type declaration."""
         return type_.__annotations__
 
-    # TODO (Roman): make cached but only for key types
     def get_columns_mapping(self, type_: Type) -> Dict[str, str]:
+        """Return cached mapping of field names to column names for all types in hierarchy."""
+        if (result := self._columns_mapping_cache.get(type_, None)) is None:
+            result = self._build_columns_mapping(type_)
+            self._columns_mapping_cache[type_] = result
+        return result
+
+    def get_reversed_columns_mapping(self, type_: Type) -> Dict[str, str]:
+        """Return cached mapping of column names to field names for all types in hierarchy."""
+        if (result := self._reversed_columns_mapping_cache.get(type_, None)) is None:
+            result = {v: k for k, v in self.get_columns_mapping(type_).items()}
+            self._reversed_columns_mapping_cache[type_] = result
+        return result
+
+    def invalidate_columns_mapping(self, type_: Type) -> None:
+        """Clear cached columns mapping for the type, call when a new subtype adds fields to the hierarchy."""
+        self._columns_mapping_cache.pop(type_, None)
+        self._reversed_columns_mapping_cache.pop(type_, None)
+        self._column_types_cache.pop(type_, None)
+        self._select_columns_cache.clear()
+
+    def get_column_types(self, type_: Type) -> Dict[str, str | None]:
+        """
+        Return the columns of the table for the type and the SQL type of each column (None if not declared).
+
+        When typed_columns is False, all fields have a column without declared type, otherwise only the primitive,
+        key and enum fields have a typed column and the remaining fields are stored in the data column.
+        """
+        if (result := self._column_types_cache.get(type_, None)) is None:
+            columns_mapping = self.get_columns_mapping(type_)
+            if not self.typed_columns:
+                result = {column: None for column in columns_mapping.values()}
+                result[dataset_column_name] = dataset_column_type
+            else:
+                # Use column kind from the type where the field is declared first, same as for the column name
+                column_kinds = {}
+                for hierarchy_type in [type_.get_key_type(), *Schema.get_types_in_hierarchy(type_)]:
+                    for field_name, column_kind in TypedFlatDictSerializer.get_column_kinds(hierarchy_type).items():
+                        column_kinds.setdefault(field_name, column_kind)
+                result = {"_type": "TEXT", dataset_column_name: dataset_column_type, data_field_name: "BLOB"}
+                result.update(
+                    {
+                        column: column_affinities[column_kind]
+                        for field_name, column in columns_mapping.items()
+                        if (column_kind := column_kinds.get(field_name, "nested")) != "nested"
+                    }
+                )
+            self._column_types_cache[type_] = result
+        return result
+
+    def get_select_columns(self, table_name: str, type_: Type) -> Tuple[str, ...]:
+        """
+        Return the existing columns of the table for the fields of the type and its subtypes,
+        used to select only the columns that can be populated in the records that are loaded.
+
+        The result is cached only when the table has the columns for all of these fields. Otherwise the columns
+        are reloaded from the catalog on each call, because another process may add them at any time.
+        """
+        if (result := self._select_columns_cache.get((table_name, type_), None)) is None:
+            columns_mapping = self.get_columns_mapping(type_.get_key_type())
+
+            # Include the fields of the type and all types derived from it
+            field_names = {"_type", data_field_name}
+            field_names.update(
+                field_name
+                for subtype in Schema.get_type_successors(type_)
+                for field_name in _get_class_hierarchy_slots(subtype)
+            )
+            field_names.update(self.get_primary_keys(type_))
+            columns = [column for field_name, column in columns_mapping.items() if field_name in field_names]
+
+            table_columns = self.get_table_columns(table_name)
+            if any(column not in table_columns for column in columns):
+                table_columns = self._reload_table_columns(table_name)
+            result = tuple(column for column in columns if column in table_columns)
+            if len(result) == len(columns):
+                self._select_columns_cache[(table_name, type_)] = result
+        return result
+
+    def _build_columns_mapping(self, type_: Type) -> Dict[str, str]:
         """Collect all types in hierarchy and check type conflicts for fields with the same name."""
 
         types_in_hierarchy = Schema.get_types_in_hierarchy(type_)
@@ -140,7 +487,9 @@ class SqliteSchemaManager:
                 else:
                     all_fields[field_name] = (type_.__name__, field_type)
 
-        columns_mapping = {"_type": "_type"}
+        columns_mapping = {"_type": "_type", dataset_column_name: dataset_column_name}
+        if self.typed_columns:
+            columns_mapping[data_field_name] = data_field_name
 
         for field_name, (class_name, _) in all_fields.items():
             field_name = field_name if not self.pascalize_column_names else CaseUtil.snake_to_pascal_case(field_name)
@@ -155,6 +504,9 @@ class SqliteSchemaManager:
 
     def get_primary_keys(self, type_: Type) -> Tuple[str, ...]:
         """Return list of primary key fields."""
-        key_type = cast(KeyProtocol, type_).get_key_type()
-        key_fields = self._get_type_fields(key_type)
-        return tuple(key_fields.keys())
+        if (result := self._primary_keys_cache.get(type_, None)) is None:
+            key_type = cast(KeyProtocol, type_).get_key_type()
+            key_fields = self._get_type_fields(key_type)
+            result = tuple(key_fields.keys())
+            self._primary_keys_cache[type_] = result
+        return result
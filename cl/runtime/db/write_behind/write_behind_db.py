@@ -0,0 +1,406 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Type
+from typing_extensions import Self
+from cl.runtime.db.db import Db
+from cl.runtime.db.db_page import DbPage
+from cl.runtime.db.local.local_cache_table import get_key_tuple
+from cl.runtime.db.protocols import TKey
+from cl.runtime.db.protocols import TRecord
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.record_util import RecordUtil
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+
+TBatchKey = Tuple[str | None, str | None]
+"""Dataset and identity of the buffered records."""
+
+TRecordKey = Tuple[Type, Tuple[Hashable, ...]]
+"""Key type and key tuple of a buffered record."""
+
+_pending_dbs: Dict[int, WriteBehindDb] = {}
+"""Databases with buffered records by object id, flushed at process exit."""
+
+_pending_dbs_lock = threading.Lock()
+"""Lock for the databases with buffered records."""
+
+_logger = logging.getLogger(__name__)
+"""Logger for the errors in the background thread and at process exit where the current context is not available."""
+
+
+@dataclass(slots=True, kw_only=True)
+class WriteBehindDb(Db):
+    """
+    Wraps another database to buffer saves of the specified record types and write them using save_many
+    when the batch size or time interval is reached, on flush (invoked on exit from a context using this
+    database), and at process exit. Repeated saves of the same key before the write are coalesced into one.
+
+    Notes:
+        - Saves of other types and all other methods are passed to the wrapped database without buffering
+        - Buffered records are written before each read or delete of the same key type to read own writes
+        - Records are initialized and validated on save but serialized on write, do not modify them after saving
+        - A failed write returns the records to the buffer for the next attempt, a record may be written twice
+    """
+
+    db: Db
+    """Wrapped database."""
+
+    record_types: List[Type]
+    """Saves of the records stored in the same table as these types are buffered, other saves are not."""
+
+    max_batch_size: int = 1000
+    """Write the buffered records when their number reaches this size."""
+
+    flush_interval: float | None = 1.0
+    """
+    Maximum time in seconds a record stays in the buffer before it is written by a background thread,
+    if None the records are written only when the batch size is reached, on flush, and at process exit.
+    """
+
+    __key_types: Set[Type] | None = None
+    """Key types of record_types, populated on first access."""
+
+    __pending: Dict[TBatchKey, OrderedDict[TRecordKey, RecordProtocol]] = field(default_factory=lambda: {})
+    """Buffered records by dataset and identity, then by key type and key tuple."""
+
+    __pending_count: int = 0
+    """Number of buffered records."""
+
+    __pending_since: float | None = None
+    """Time when the oldest buffered record was saved, or the time of the last failed write."""
+
+    __lock: threading.Condition = field(default_factory=threading.Condition)
+    """Lock for the buffer, the background thread waits on it until the time interval is reached."""
+
+    __flush_lock: threading.Lock = field(default_factory=threading.Lock)
+    """Lock held during each write so that the writes are applied in the order of saves."""
+
+    __flush_thread: threading.Thread | None = None
+    """Background thread that writes the records after flush_interval, exits when the buffer is empty."""
+
+    def init(self) -> Self:
+        """Similar to __init__ but can use fields set after construction, return self to enable method chaining."""
+        if self.max_batch_size < 1:
+            raise RuntimeError(f"{type(self).__name__} field 'max_batch_size' must be positive.")
+        if self.flush_interval is not None and self.flush_interval <= 0.0:
+            raise RuntimeError(f"{type(self).__name__} field 'flush_interval' must be positive or None.")
+        return self
+
+    def get_pending_count(self) -> int:
+        """Number of buffered records that are not yet written to the wrapped database."""
+        with self.__lock:
+            return self.__pending_count
+
+    def flush(self) -> None:
+        with self.__flush_lock:
+            # Take the buffer so that new saves are not blocked during the write
+            with self.__lock:
+                if self.__pending_count == 0:
+                    return
+                pending = list(self.__pending.items())
+                self.__pending = {}
+                self.__pending_count = 0
+                self.__pending_since = None
+
+            for batch_index, ((dataset, identity), records) in enumerate(pending):
+                try:
+                    self.db.save_many(list(records.values()), dataset=dataset, identity=identity)
+                except Exception:
+                    # Return the batches not yet written to the buffer for the next attempt
+                    self._restore_pending(pending[batch_index:])
+                    raise
+
+            with self.__lock:
+                if self.__pending_count == 0:
+                    with _pending_dbs_lock:
+                        _pending_dbs.pop(id(self), None)
+
+    def load_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        self._flush_before_access([record_type.get_key_type()])
+        return self.db.load_one(
+            record_type,
+            record_or_key,
+            dataset=dataset,
+            identity=identity,
+            is_key_optional=is_key_optional,
+            is_record_optional=is_record_optional,
+        )
+
+    def load_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        self._flush_before_access([record_type.get_key_type()])
+        return self.db.load_many(record_type, records_or_keys, dataset=dataset, identity=identity)
+
+    def load_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        self._flush_before_access([record_type.get_key_type()])
+        return self.db.load_all(record_type, dataset=dataset, identity=identity)
+
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        self._flush_before_access([record_type.get_key_type()])
+        return self.db.load_filter(record_type, filter_obj, dataset=dataset, identity=identity)
+
+    def exists_many(
+        self,
+        keys: Iterable[KeyProtocol | None],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[bool]:
+        keys = list(keys)
+        self._flush_before_access(x.get_key_type() for x in keys if x is not None)
+        return self.db.exists_many(keys, dataset=dataset, identity=identity)
+
+    def count(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None = None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        self._flush_before_access([record_type.get_key_type()])
+        return self.db.count(record_type, filter_obj, dataset=dataset, identity=identity)
+
+    def search(
+        self,
+        record_type: Type[TRecord],
+        query: str,
+        *,
+        limit: int = 100,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord]:
+        self._flush_before_access([record_type.get_key_type()])
+        return self.db.search(record_type, query, limit=limit, dataset=dataset, identity=identity)
+
+    def load_page(
+        self,
+        record_type: Type[TRecord],
+        *,
+        after_key: KeyProtocol | str | None = None,
+        limit: int = 1000,
+        order: IndexSortOrderEnum = IndexSortOrderEnum.ASCENDING,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> DbPage:
+        self._flush_before_access([record_type.get_key_type()])
+        return self.db.load_page(
+            record_type, after_key=after_key, limit=limit, order=order, dataset=dataset, identity=identity
+        )
+
+    def save_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.save_many([record], dataset=dataset, identity=identity)
+
+    def save_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        key_types = self._get_key_types()
+        records = [x for x in records if x is not None]
+        if direct_records := [x for x in records if x.get_key_type() not in key_types]:
+            self.db.save_many(direct_records, dataset=dataset, identity=identity)
+        if buffered_records := [x for x in records if x.get_key_type() in key_types]:
+            self._add_pending(buffered_records, dataset, identity)
+
+    def delete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self._flush_before_access([key_type.get_key_type()])
+        self.db.delete_one(key_type, key, dataset=dataset, identity=identity)
+
+    def delete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        if keys is None:
+            return
+        keys = list(keys)
+        self._flush_before_access(x.get_key_type() for x in keys if x is not None)
+        self.db.delete_many(keys, dataset=dataset, identity=identity)
+
+    def delete_all_and_drop_db(self) -> None:
+        # Buffered records are discarded together with the database
+        with self.__lock:
+            self.__pending = {}
+            self.__pending_count = 0
+            self.__pending_since = None
+        with _pending_dbs_lock:
+            _pending_dbs.pop(id(self), None)
+        self.db.delete_all_and_drop_db()
+
+    def close_connection(self) -> None:
+        self.flush()
+        self.db.close_connection()
+
+    def get_table_version(self, key_type: Type[TKey], *, dataset: str | None = None) -> int | None:
+        self._flush_before_access([key_type])
+        return self.db.get_table_version(key_type, dataset=dataset)
+
+    def get_executor(self) -> Executor | None:
+        return self.db.get_executor()
+
+    def _get_key_types(self) -> Set[Type]:
+        """Key types of record_types."""
+        if self.__key_types is None:
+            self.__key_types = {x.get_key_type() for x in self.record_types}
+        return self.__key_types
+
+    def _flush_before_access(self, key_types: Iterable[Type]) -> None:
+        """Write the buffered records if there are any and one of the key types is buffered."""
+        if self.__pending_count > 0:
+            buffered_key_types = self._get_key_types()
+            if any(x in buffered_key_types for x in key_types):
+                self.flush()
+
+    def _add_pending(self, records: List[RecordProtocol], dataset: str | None, identity: str | None) -> None:
+        """Add records to the buffer, write them if the batch size is reached."""
+
+        # Invoke init before getting the key because some records set key fields in init, this also
+        # validates the record so that an invalid record causes an error on save rather than on write
+        for record in records:
+            RecordUtil.init_all(record)
+
+        with self.__lock:
+            batch = self.__pending.setdefault((dataset, identity), OrderedDict())
+            for record in records:
+                record_key = (record.get_key_type(), get_key_tuple(record.get_key()))
+                if record_key not in batch:
+                    self.__pending_count += 1
+                # A later save of the same key replaces the buffered record
+                batch[record_key] = record
+            if self.__pending_since is None:
+                self.__pending_since = time.monotonic()
+            is_full = self.__pending_count >= self.max_batch_size
+            self._start_flush_thread()
+        with _pending_dbs_lock:
+            _pending_dbs[id(self)] = self
+
+        if is_full:
+            self.flush()
+
+    def _restore_pending(self, pending: List[Tuple[TBatchKey, OrderedDict[TRecordKey, RecordProtocol]]]) -> None:
+        """Return records to the buffer after a failed write, unless a newer record with the same key was saved."""
+        with self.__lock:
+            for batch_key, records in pending:
+                batch = self.__pending.setdefault(batch_key, OrderedDict())
+                for record_key, record in records.items():
+                    if record_key not in batch:
+                        batch[record_key] = record
+                        self.__pending_count += 1
+            # Wait for the full interval before the next attempt
+            self.__pending_since = time.monotonic()
+            self._start_flush_thread()
+        with _pending_dbs_lock:
+            _pending_dbs[id(self)] = self
+
+    def _start_flush_thread(self) -> None:
+        """Start the background thread if flush_interval is set and the thread is not running, call under lock."""
+        if self.flush_interval is not None and self.__flush_thread is None:
+            self.__flush_thread = threading.Thread(
+                target=self._run_flush_thread, name=f"WriteBehindDb;{self.db_id}", daemon=True
+            )
+            self.__flush_thread.start()
+
+    def _run_flush_thread(self) -> None:
+        """Write the buffered records when the oldest of them has been in the buffer for flush_interval."""
+        while True:
+            with self.__lock:
+                if self.__pending_count == 0:
+                    # The thread is started again by the next save
+                    self.__flush_thread = None
+                    return
+                wait_time = self.__pending_since + self.flush_interval - time.monotonic()
+                if wait_time > 0.0:
+                    self.__lock.wait(wait_time)
+                    continue
+            try:
+                self.flush()
+            except Exception:  # noqa
+                # Records are returned to the buffer and written on the next attempt
+                _logger.exception(f"Error writing buffered records to database {self.db.db_id}, will retry.")
+
+
+def _flush_all() -> None:
+    """Write buffered records of all databases at process exit."""
+    with _pending_dbs_lock:
+        pending_dbs = list(_pending_dbs.values())
+    for db in pending_dbs:
+        try:
+            db.flush()
+        except Exception:  # noqa
+            _logger.exception(f"Error writing buffered records to database {db.db.db_id} at process exit.")
+
+
+atexit.register(_flush_all)
@@ -0,0 +1,25 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import IntEnum
+
+
+class SnapshotFormatEnum(IntEnum):
+    """Columnar file format used for database snapshots."""
+
+    PARQUET = 0
+    """Apache Parquet file with .parquet extension, compressed and suitable for long term storage."""
+
+    ARROW = 1
+    """Apache Arrow IPC file with .arrow extension, uncompressed and memory mapped on import."""
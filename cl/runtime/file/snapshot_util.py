@@ -0,0 +1,282 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from itertools import islice
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Type
+import pyarrow as pa
+import pyarrow.parquet as pq
+from cl.runtime.context.context import Context
+from cl.runtime.file.file_util import FileUtil
+from cl.runtime.file.snapshot_format_enum import SnapshotFormatEnum
+from cl.runtime.primitive.date_util import DateUtil
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import is_record
+from cl.runtime.schema.schema import Schema
+from cl.runtime.serialization.typed_flat_dict_serializer import TColumnKind
+from cl.runtime.serialization.typed_flat_dict_serializer import TypedFlatDictSerializer
+from cl.runtime.serialization.typed_flat_dict_serializer import data_field_name
+
+_serializer = TypedFlatDictSerializer()
+"""Serializer for snapshot rows, primitive fields, embedded keys and enums are stored in typed columns."""
+
+_file_extensions: Dict[SnapshotFormatEnum, str] = {
+    SnapshotFormatEnum.PARQUET: ".parquet",
+    SnapshotFormatEnum.ARROW: ".arrow",
+}
+"""File extension for each snapshot format."""
+
+_arrow_types: Dict[TColumnKind, pa.DataType] = {
+    "str": pa.string(),
+    "int": pa.int64(),
+    "float": pa.float64(),
+    "bool": pa.bool_(),
+    "date": pa.date32(),
+    "datetime": pa.string(),
+    "time": pa.string(),
+    "uuid": pa.string(),
+    "bytes": pa.binary(),
+    "enum": pa.string(),
+    "key": pa.string(),
+}
+"""Arrow type for each column kind except 'nested' which is stored in the data column."""
+
+key_type_metadata_name = b"cl.key_type"
+"""Name of the schema metadata entry holding the key type of the table."""
+
+
+class SnapshotUtil:
+    """Export database tables to columnar Parquet or Arrow files and import them back using batched save."""
+
+    @classmethod
+    def export_table(
+        cls,
+        key_type: Type[KeyProtocol],
+        dir_path: str,
+        *,
+        file_format: SnapshotFormatEnum = SnapshotFormatEnum.PARQUET,
+        dataset: str | None = None,
+        batch_size: int = 10000,
+    ) -> str:
+        """
+        Export all records stored in the table for the key type to KeyTypeName.ext file
+        in the specified directory, return the file path.
+
+        Args:
+            key_type: Key type of the table, records of all derived types are exported
+            dir_path: Directory where the file is written, created if it does not exist
+            file_format: Columnar file format
+            dataset: If specified, append to the root dataset of the database
+            batch_size: Number of records serialized and written together
+        """
+        filename = f"{key_type.__name__}{_file_extensions[file_format]}"
+        FileUtil.check_valid_filename(filename)
+        os.makedirs(dir_path, exist_ok=True)
+        file_path = os.path.join(dir_path, filename)
+
+        schema = cls.get_arrow_schema(key_type)
+        records = Context.current().load_all(key_type, dataset=dataset)
+        if file_format == SnapshotFormatEnum.PARQUET:
+            with pq.ParquetWriter(file_path, schema) as writer:
+                for batch in cls._to_record_batches(records, schema, batch_size):
+                    writer.write_batch(batch)
+        elif file_format == SnapshotFormatEnum.ARROW:
+            with pa.ipc.new_file(file_path, schema) as writer:
+                for batch in cls._to_record_batches(records, schema, batch_size):
+                    writer.write_batch(batch)
+        else:
+            raise RuntimeError(f"Snapshot format {file_format.name} is not supported.")
+        return file_path
+
+    @classmethod
+    def export_all(
+        cls,
+        dir_path: str,
+        *,
+        key_types: Iterable[Type[KeyProtocol]] | None = None,
+        file_format: SnapshotFormatEnum = SnapshotFormatEnum.PARQUET,
+        dataset: str | None = None,
+        batch_size: int = 10000,
+    ) -> List[str]:
+        """
+        Export one file per table to the specified directory, return the list of file paths.
+
+        Args:
+            dir_path: Directory where the files are written, created if it does not exist
+            key_types: Key types of the tables to export, if not specified export every non-empty table in the schema
+            file_format: Columnar file format
+            dataset: If specified, append to the root dataset of the database
+            batch_size: Number of records serialized and written together
+        """
+        if key_types is None:
+            context = Context.current()
+            key_types = [x for x in cls._get_schema_key_types() if context.count(x, dataset=dataset) > 0]
+        return [
+            cls.export_table(key_type, dir_path, file_format=file_format, dataset=dataset, batch_size=batch_size)
+            for key_type in key_types
+        ]
+
+    @classmethod
+    def import_file(cls, file_path: str, *, dataset: str | None = None, batch_size: int = 10000) -> int:
+        """
+        Save records from a Parquet or Arrow snapshot file to the current context in batches,
+        return the number of imported records.
+
+        Args:
+            file_path: Path to the file with .parquet or .arrow extension
+            dataset: If specified, append to the root dataset of the database
+            batch_size: Number of records deserialized and saved together
+        """
+        context = Context.current()
+        result = 0
+        for batch in cls._read_record_batches(file_path, batch_size):
+            records = cls._from_record_batch(batch)
+            context.save_many(records, dataset=dataset)
+            result += len(records)
+        return result
+
+    @classmethod
+    def import_all(cls, dir_path: str, *, dataset: str | None = None, batch_size: int = 10000) -> int:
+        """
+        Save records from every snapshot file in the directory (subdirectories are not included)
+        to the current context, return the number of imported records.
+
+        Args:
+            dir_path: Directory with .parquet or .arrow files
+            dataset: If specified, append to the root dataset of the database
+            batch_size: Number of records deserialized and saved together
+        """
+        file_paths = [
+            os.path.join(dir_path, filename)
+            for filename in sorted(os.listdir(dir_path))
+            if any(FileUtil.has_extension(filename, ext) for ext in _file_extensions.values())
+        ]
+        return sum(cls.import_file(file_path, dataset=dataset, batch_size=batch_size) for file_path in file_paths)
+
+    @classmethod
+    def get_arrow_schema(cls, key_type: Type[KeyProtocol]) -> pa.Schema:
+        """
+        Arrow schema with a typed column for each primitive, key or enum field of every record type stored
+        in the table, all other fields are stored as a single JSON string in the data column.
+        """
+        record_types = sorted(
+            (x for x in Schema.get_type_successors(key_type) if is_record(x)),
+            key=lambda x: x.__name__,
+        )
+
+        # Union of fields of all record types in the table, the same field must have the same kind in every type
+        column_kinds: Dict[str, TColumnKind] = {}
+        column_sources: Dict[str, Type] = {}
+        for record_type in record_types:
+            for field_name, column_kind in _serializer.get_column_kinds(record_type).items():
+                if column_kind == "nested":
+                    continue
+                elif (existing_kind := column_kinds.get(field_name, None)) is None:
+                    column_kinds[field_name] = column_kind
+                    column_sources[field_name] = record_type
+                elif existing_kind != column_kind:
+                    raise RuntimeError(
+                        f"Field '{field_name}' has type '{existing_kind}' in {column_sources[field_name].__name__} "
+                        f"and type '{column_kind}' in {record_type.__name__}, types stored in the same table "
+                        f"must use the same type for a field with the same name to be exported to a snapshot."
+                    )
+
+        fields = [
+            pa.field("_type", pa.string(), nullable=False),
+            *(pa.field(field_name, _arrow_types[column_kind]) for field_name, column_kind in column_kinds.items()),
+            pa.field(data_field_name, pa.string()),
+        ]
+        return pa.schema(fields, metadata={key_type_metadata_name: key_type.__name__.encode()})
+
+    @classmethod
+    def _get_schema_key_types(cls) -> List[Type[KeyProtocol]]:
+        """Key types of all record types in the schema in alphabetical order of their name."""
+        key_types = {x.get_key_type() for x in Schema.get_types() if is_record(x)}
+        key_types.discard(None)
+        return sorted(key_types, key=lambda x: x.__name__)
+
+    @classmethod
+    def _to_record_batches(
+        cls,
+        records: Iterable[RecordProtocol],
+        schema: pa.Schema,
+        batch_size: int,
+    ) -> Iterator[pa.RecordBatch]:
+        """Serialize records and convert them to record batches with the specified schema."""
+        records_iter = iter(records)
+        column_names = set(schema.names)
+        while records_batch := list(islice(records_iter, batch_size)):
+            rows = [_serializer.serialize_data(record, is_root=True) for record in records_batch]
+            for row in rows:
+                if unknown_fields := [x for x in row if x not in column_names]:
+                    raise RuntimeError(
+                        f"Record type {row['_type']} is not found in the schema for this table and has "
+                        f"fields {', '.join(unknown_fields)} that do not have a column in the snapshot file."
+                    )
+            arrays = [
+                pa.array([cls._to_arrow_value(row.get(x.name, None), x.type) for row in rows], type=x.type)
+                for x in schema
+            ]
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    @classmethod
+    def _read_record_batches(cls, file_path: str, batch_size: int) -> Iterator[pa.RecordBatch]:
+        """Read record batches from Parquet or Arrow file based on extension."""
+        if FileUtil.has_extension(file_path, _file_extensions[SnapshotFormatEnum.PARQUET]):
+            yield from pq.ParquetFile(file_path).iter_batches(batch_size=batch_size)
+        elif FileUtil.has_extension(file_path, _file_extensions[SnapshotFormatEnum.ARROW]):
+            with pa.memory_map(file_path, "r") as source:
+                reader = pa.ipc.open_file(source)
+                for batch_index in range(reader.num_record_batches):
+                    yield reader.get_batch(batch_index)
+        else:
+            raise RuntimeError(f"Snapshot file '{file_path}' does not have .parquet or .arrow extension.")
+
+    @classmethod
+    def _from_record_batch(cls, batch: pa.RecordBatch) -> List[RecordProtocol]:
+        """Deserialize records from a record batch."""
+        columns = [
+            (x.name, [cls._from_arrow_value(value, x.type) for value in batch.column(x.name).to_pylist()])
+            for x in batch.schema
+        ]
+        return [
+            _serializer.deserialize_data({name: values[row_index] for name, values in columns})
+            for row_index in range(batch.num_rows)
+        ]
+
+    @classmethod
+    def _to_arrow_value(cls, value: Any, arrow_type: pa.DataType) -> Any:
+        """Convert column value produced by the serializer to the value accepted by the Arrow type."""
+        if value is None:
+            return None
+        elif arrow_type == pa.bool_():
+            return bool(value)
+        elif arrow_type == pa.date32():
+            return DateUtil.from_iso_int(value)
+        else:
+            return value
+
+    @classmethod
+    def _from_arrow_value(cls, value: Any, arrow_type: pa.DataType) -> Any:
+        """Convert value read from the Arrow column to the column value expected by the serializer."""
+        if value is not None and arrow_type == pa.date32():
+            return DateUtil.to_iso_int(value)
+        else:
+            return value
@@ -19,8 +19,11 @@ from dataclasses import is_dataclass
 from types import NoneType
 from types import UnionType
 from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Tuple
 from typing import Type
 from typing import Union
 from typing import get_args
@@ -29,57 +32,63 @@ from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import is_record
 
+TFieldValidator = Tuple[str, Callable[[Any], bool], Any, bool]
+"""Field name, function checking the type of a value that is not None, declared type, and is_required flag."""
+
+_init_methods_dict: Dict[Type, Tuple[Callable, ...]] = {}
+"""Dictionary of 'init' methods in the order from base to derived using class as key."""
+
+_field_validators_dict: Dict[Type, Tuple[TFieldValidator, ...] | None] = {}
+"""Dictionary of field validators using class as key, None for classes that are not dataclasses."""
+
 
 class RecordUtil:
     """Utilities for working with records."""
 
     @classmethod
-    def init_all(cls, obj) -> None:
-        """Invoke 'init' for each class in the order from base to derived, then validate against schema."""
+    def init_all(cls, obj, *, validate: bool = True) -> None:
+        """
+        Invoke 'init' for each class in the order from base to derived, then validate against schema.
 
-        # Keep track of which init methods in class hierarchy were already called
-        invoked = set()
+        Args:
+            obj: Object to initialize
+            validate: If False, skip validation against schema (use only for trusted data)
+        """
 
-        # Reverse the MRO to start from base to derived
-        for class_ in reversed(obj.__class__.__mro__):
-            class_init = getattr(class_, "init", None)
-            if class_init is not None and (qualname := class_init.__qualname__) not in invoked:
-                # Add qualname to invoked to prevent executing the same method twice
-                invoked.add(qualname)
-                # Invoke 'init' method of superclass if it exists, otherwise do nothing
-                class_init(obj)
+        # Invoke 'init' method of each class in the hierarchy that has it
+        for class_init in cls._get_init_methods(obj.__class__):
+            class_init(obj)
 
         # Perform validation against the schema only after all init methods are called
-        cls.validate(obj)
+        if validate:
+            cls.validate(obj)
 
     @classmethod
     def validate(cls, obj) -> None:
         """Validate against schema (invoked by init_all after all init methods are called)."""
         # TODO: Support other dataclass-like frameworks
-        class_name = obj.__class__.__name__
-        if is_dataclass(obj):
-            for field in fields(obj):
-                field_value = getattr(obj, field.name)
-                if field_value is not None:
-                    # Check that for the fields that have values, the values are of the right type
-                    if not cls._is_instance(field_value, field.type):
-                        field_type_name = cls._get_field_type_name(field.type)
-                        value_type_name = type(field_value).__name__
-                        if "member_descriptor" not in value_type_name:  # TODO(Roman): Remove when fixed
-                            raise RuntimeError(
-                                f"""Type mismatch for field '{field.name}' of class {class_name}.
+        if (field_validators := cls._get_field_validators(obj.__class__)) is None:
+            return
+        for field_name, is_instance, field_type, is_required in field_validators:
+            field_value = getattr(obj, field_name)
+            if field_value is not None:
+                # Check that for the fields that have values, the values are of the right type
+                if not is_instance(field_value):
+                    class_name = obj.__class__.__name__
+                    field_type_name = cls._get_field_type_name(field_type)
+                    value_type_name = type(field_value).__name__
+                    if "member_descriptor" not in value_type_name:  # TODO(Roman): Remove when fixed
+                        raise RuntimeError(
+                            f"""Type mismatch for field '{field_name}' of class {class_name}.
 Type in dataclass declaration: {field_type_name}
 Type of the value: {type(field_value).__name__}
 Note: In case of containers, type mismatch may be in one of the items.
 """
-                            )
-                else:
-                    default_is_none = field.default is None
-                    default_factory_is_missing = field.default_factory is MISSING
-                    default_value_not_set = default_is_none and default_factory_is_missing
-                    if default_value_not_set and not cls._is_optional(field.type):
-                        # Error if a field is None but declared as required
-                        raise UserError(f"Field '{field.name}' in class '{class_name}' is required but not set.")
+                        )
+            elif is_required:
+                # Error if a field is None but declared as required
+                class_name = obj.__class__.__name__
+                raise UserError(f"Field '{field_name}' in class '{class_name}' is required but not set.")
 
     @classmethod
     def is_abstract(cls, record_type: Type) -> bool:
@@ -99,6 +108,97 @@ Note: In case of containers, type mismatch may be in one of the items.
                 result.append(subclass)
         return result
 
+    @classmethod
+    def _get_init_methods(cls, class_: Type) -> Tuple[Callable, ...]:
+        """Get 'init' methods in class hierarchy in the order from base to derived, each method included once."""
+        if (result := _init_methods_dict.get(class_, None)) is None:
+            # Keep track of which init methods in class hierarchy were already included
+            included = set()
+            init_methods = []
+
+            # Reverse the MRO to start from base to derived
+            for base in reversed(class_.__mro__):
+                base_init = getattr(base, "init", None)
+                if base_init is not None and (qualname := base_init.__qualname__) not in included:
+                    # Add qualname to included to prevent executing the same method twice
+                    included.add(qualname)
+                    init_methods.append(base_init)
+
+            result = tuple(init_methods)
+            _init_methods_dict[class_] = result
+        return result
+
+    @classmethod
+    def _get_field_validators(cls, class_: Type) -> Tuple[TFieldValidator, ...] | None:
+        """Get validators for the fields of a dataclass built on first use, None if the class is not a dataclass."""
+        if (result := _field_validators_dict.get(class_, sentinel := object())) is sentinel:
+            # TODO: Support other dataclass-like frameworks
+            if is_dataclass(class_):
+                result = tuple(
+                    (
+                        field.name,
+                        cls._compile_is_instance(field.type),
+                        field.type,
+                        # Field is required if its default is None without default factory and it is not optional
+                        field.default is None and field.default_factory is MISSING and not cls._is_optional(field.type),
+                    )
+                    for field in fields(class_)
+                )
+            else:
+                result = None
+            _field_validators_dict[class_] = result
+        return result
+
+    @classmethod
+    def _compile_is_instance(cls, field_type) -> Callable[[Any], bool]:
+        """Return a function that has the same result as _is_instance for field_type and values other than None."""
+
+        origin = get_origin(field_type)
+        args = get_args(field_type)
+
+        if origin is None:
+            # Not a generic type, consider the possible use of annotation
+            if isinstance(field_type, type):
+                return lambda v: isinstance(v, field_type)
+            elif isinstance(field_type, str):
+                return lambda v: type(v).__name__ == field_type
+            else:
+                # Raise only when a value is checked, consistent with _is_instance
+                return lambda v: cls._is_instance(v, field_type)
+        elif origin in [UnionType, Union]:
+            if all(get_origin(arg) is None and isinstance(arg, type) for arg in args):
+                # Fast path for unions of plain types such as optional primitives, None values are not checked
+                arg_types = tuple(args)
+                return lambda v: isinstance(v, arg_types)
+            else:
+                arg_checks = tuple(cls._compile_is_instance(arg) for arg in args)
+                return lambda v: any(arg_check(v) for arg_check in arg_checks)
+        elif origin is list and len(args) == 1:
+            item_type = args[0]
+            if get_origin(item_type) is None and isinstance(item_type, type):
+                # Fast path for lists of plain types such as List[str] or List[float]
+                return lambda v: isinstance(v, list) and all(isinstance(item, item_type) for item in v)
+            else:
+                item_check = cls._compile_is_instance(item_type)
+                return lambda v: isinstance(v, list) and all(item_check(item) for item in v)
+        elif origin is dict and len(args) == 2:
+            key_type, value_type = args
+            if get_origin(value_type) is None and isinstance(value_type, type):
+                # Fast path for dicts with values of plain types such as Dict[str, float]
+                return lambda v: (
+                    isinstance(v, dict)
+                    and all(isinstance(key, key_type) for key in v.keys())
+                    and all(isinstance(value, value_type) for value in v.values())
+                )
+            else:
+                value_check = cls._compile_is_instance(value_type)
+                return lambda v: isinstance(v, dict) and all(
+                    isinstance(key, key_type) and value_check(value) for key, value in v.items()
+                )
+        else:
+            # Other generic types, use the general implementation
+            return lambda v: bool(cls._is_instance(v, field_type))
+
     @classmethod
     def _is_instance(cls, field_value, field_type) -> bool:
 
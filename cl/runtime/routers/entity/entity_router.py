@@ -58,9 +58,11 @@ async def get_panel(
 ):
     try:
         """Return panel content by its displayed name."""
-        return PanelResponseUtil.get_content(PanelRequest(type=type, panel_id=panel_id, key=key, dataset=dataset))
+        return await Context.current().run_in_executor(
+            PanelResponseUtil.get_content, PanelRequest(type=type, panel_id=panel_id, key=key, dataset=dataset)
+        )
     except Exception as e:
-        Context.current().save_one(LogMessage(message=str(e)))
+        await Context.current().asave_one(LogMessage(message=str(e)))
         error_view = {  # TODO: Refactor
             "_t": "Script",
             "Name": None,
@@ -81,7 +83,8 @@ async def save(
 ) -> SaveResponse:
     """Save panel content."""
     try:
-        return SaveResponse.save_entity(
+        return await Context.current().run_in_executor(
+            SaveResponse.save_entity,
             SaveRequest(
                 record_dict=record_in_dict,
                 old_record_key=old_record_key,
@@ -90,7 +93,7 @@ async def save(
             ),
         )
     except Exception as e:
-        Context.current().save_one(LogMessage(message=str(e)))
+        await Context.current().asave_one(LogMessage(message=str(e)))
         raise e
 
 
@@ -102,7 +105,8 @@ async def delete_many(
 ) -> DeleteResponse:
     """Delete entities."""
 
-    return DeleteResponse.delete_many(
+    return await Context.current().run_in_executor(
+        DeleteResponse.delete_many,
         DeleteRequest(
             record_keys=record_keys,
             dataset=dataset,
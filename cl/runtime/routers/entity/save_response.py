@@ -64,13 +64,8 @@ class SaveResponse(BaseModel):
         record = data_serializer.deserialize_data(prepared_serialized_record)
 
         if request.old_record_key is None:
-            existing_record = context.load_one(
-                record_type=type(record),
-                record_or_key=record.get_key(),
-                dataset=request.dataset,
-                is_record_optional=True,
-            )
-            if existing_record is not None:
+            # Check existence without loading the record
+            if context.exists_many([record.get_key()], dataset=request.dataset)[0]:
                 raise UserError(f"Record with key {str(record)} already exists.")
 
         if request.old_record_key is not None and request.old_record_key != key_serializer.serialize_key(record):
@@ -0,0 +1,85 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from typing import Dict
+from typing import List
+from pydantic import BaseModel
+from cl.runtime.db.instrumented.db_call_stats import latency_bucket_bounds
+from cl.runtime.db.instrumented.instrumented_db import InstrumentedDb
+from cl.runtime.routers.user_request import UserRequest
+
+
+class DbMetricsResponseItem(BaseModel):
+    """Single item of the list returned by the /health/metrics route."""
+
+    db_id: str
+    """Identifier of the instrumented database."""
+
+    method: str
+    """Name of the database method."""
+
+    key_type: str
+    """Name of the key type."""
+
+    call_count: int
+    """Number of calls including those that raised an error."""
+
+    error_count: int
+    """Number of calls that raised an error."""
+
+    row_count: int
+    """Number of records returned by loads or passed to saves and deletes."""
+
+    total_seconds: float
+    """Total wall clock time of the calls in seconds."""
+
+    max_seconds: float
+    """Longest wall clock time of a single call in seconds."""
+
+    p50_seconds: float | None
+    """Upper bound of the latency bucket containing the median."""
+
+    p99_seconds: float | None
+    """Upper bound of the latency bucket containing the 99th percentile."""
+
+    latency_buckets: Dict[str, int]
+    """Number of calls in each latency bucket by its upper bound in seconds, 'inf' for the last bucket."""
+
+    bytes_per_row: float | None
+    """Mean size of a serialized record in bytes estimated from the sampled calls."""
+
+    @classmethod
+    def get_db_metrics(cls, request: UserRequest) -> List[DbMetricsResponseItem]:
+        """Implements /health/metrics route."""
+
+        bucket_names = [str(x) for x in latency_bucket_bounds] + ["inf"]
+        return [
+            DbMetricsResponseItem(
+                db_id=stats.db_id,
+                method=stats.method,
+                key_type=stats.key_type,
+                call_count=stats.call_count,
+                error_count=stats.error_count,
+                row_count=stats.row_count,
+                total_seconds=stats.total_seconds,
+                max_seconds=stats.max_seconds,
+                # Quantiles in the last bucket are reported as None because JSON does not support infinity
+                p50_seconds=(p50 if (p50 := stats.get_latency_quantile(0.5)) != float("inf") else None),
+                p99_seconds=(p99 if (p99 := stats.get_latency_quantile(0.99)) != float("inf") else None),
+                latency_buckets=dict(zip(bucket_names, stats.bucket_counts)),
+                bytes_per_row=stats.get_bytes_per_row(),
+            )
+            for stats in InstrumentedDb.get_all_stats()
+        ]
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import List
 from fastapi import APIRouter
 from fastapi import Header
+from cl.runtime.routers.health.db_metrics_response_item import DbMetricsResponseItem
 from cl.runtime.routers.health.health_response import HealthResponse
 from cl.runtime.routers.user_request import UserRequest
 
@@ -24,3 +26,11 @@ router = APIRouter()
 async def get_health(user: str = Header(None, description="User identifier or identity token")) -> HealthResponse:
     """Information about system health."""
     return HealthResponse.get_health(UserRequest(user=user))
+
+
+@router.get("/health/metrics", response_model=List[DbMetricsResponseItem])
+async def get_db_metrics(
+    user: str = Header(None, description="User identifier or identity token")
+) -> List[DbMetricsResponseItem]:
+    """Call counts, latency, rows and record size for each method and key type of instrumented databases."""
+    return DbMetricsResponseItem.get_db_metrics(UserRequest(user=user))
@@ -36,7 +36,7 @@ def get_type_to_records_map(request: SavePermanentlyRequest) -> DefaultDict[Type
     key_serializer = StringSerializer()
 
     key_objs = [key_serializer.deserialize_key(key, request_type.get_key_type()) for key in request.keys]
-    records = Context.current().load_many(key_objs, ignore_not_found=True)
+    records = Context.current().load_many(request_type, key_objs)
 
     # TODO (Bohdan): Implement with_dependencies logic.
     # if request.with_dependencies:
@@ -77,13 +77,13 @@ class SavePermanentlyResponse(BaseModel):
     def _write_records(cls, file_path: Path, records: Iterable[TRecord]) -> None:
         """Write serialized records on the disk."""
 
-        file_extension = file_path.stem
+        file_extension = file_path.suffix.removeprefix(".")
 
         serializer = FlatDictSerializer()  # TODO (Bohdan): Provide a proper serializer
         serialized_records = [serializer.serialize_data(record) for record in records]
 
         if file_extension == "csv":
-            df = pd.DataFrame([serialized_records])
+            df = pd.DataFrame(serialized_records)
             df.to_csv(file_path, mode="w", index=False, header=True)
         else:
             raise ValueError(f"File extension {file_extension} is not supported.")
@@ -0,0 +1,34 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pydantic import BaseModel
+
+
+class SearchRequest(BaseModel):
+    """Request data type for the /storage/search route."""
+
+    type_: str
+    """The type of records."""
+
+    query: str
+    """Text to search for in the search fields of the records."""
+
+    limit: int = 100
+    """Maximum number of records in the response."""
+
+    module: str | None = None
+    """Dot-delimited module string."""
+
+    dataset: str | None = None
+    """Dataset string, root dataset if not specified."""
@@ -0,0 +1,54 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from typing import Any
+from typing import Dict
+from typing import List
+from pydantic import BaseModel
+from pydantic import Field
+from cl.runtime.context.context import Context
+from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.routers.schema.type_request import TypeRequest
+from cl.runtime.routers.schema.type_response_util import TypeResponseUtil
+from cl.runtime.routers.storage.search_request import SearchRequest
+from cl.runtime.serialization.ui_dict_serializer import UiDictSerializer
+
+SearchResponseSchema = Dict[str, Any]
+SearchResponseData = List[Dict[str, Any]]
+
+
+class SearchResponse(BaseModel):
+    """Response data type for the /storage/search route."""
+
+    schema_: SearchResponseSchema = Field(..., alias="schema")
+    """Schema field of the response data type for the /storage/search route."""
+
+    data: SearchResponseData
+    """Records where one of the search fields contains the query, in the table format."""
+
+    @classmethod
+    def get_records(cls, request: SearchRequest) -> SearchResponse:
+        """Implements /storage/search route."""
+
+        # Default response when running locally without authorization
+        type_decl_dict = TypeResponseUtil.get_type(TypeRequest(name=request.type_, module=request.module, user="root"))
+        record_type = ClassInfo.get_class_type(f"{request.module}.{request.type_}")
+
+        # Search using the full-text search index where supported by the database
+        records = Context.current().search(record_type, request.query, limit=request.limit, dataset=request.dataset)
+
+        ui_serializer = UiDictSerializer()
+        serialized_records = tuple(ui_serializer.serialize_record_for_table(record) for record in records)
+        return SearchResponse(schema=type_decl_dict, data=serialized_records).dict(by_alias=True)
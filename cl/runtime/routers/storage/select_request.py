@@ -36,3 +36,9 @@ class SelectRequest(BaseModel):
 
     table_format: bool = False
     """If true, response will be returned in the table format."""
+
+    page_size: int | None = None
+    """Maximum number of records in the response, all records are returned if not specified."""
+
+    page_token: str | None = None
+    """Token returned with the previous page to load the next page, the first page is returned if not specified."""
@@ -39,6 +39,9 @@ class SelectResponse(BaseModel):
     data: SelectResponseData
     """Data field of the response data type for the /storage/select route."""
 
+    next_page_token: str | None = None
+    """Token to pass as 'page_token' to load the next page, None if this is the last page or paging is not used."""
+
     @classmethod
     def get_records(cls, request: SelectRequest) -> SelectResponse:
         """Implements /storage/select route."""
@@ -60,9 +63,14 @@ class SelectResponse(BaseModel):
                 f"Database {db.__class__.__name__} doesn't have load_all()."
             )
 
-        # load records by type
-        records = db.load_all(record_type)
-        records = list(records)
+        # Load records by type, one page at a time if page size is specified
+        next_page_token = None
+        if request.page_size is not None:
+            page = db.load_page(record_type, after_key=request.page_token, limit=request.page_size)
+            records = page.records
+            next_page_token = page.next_token
+        else:
+            records = list(db.load_all(record_type))
 
         # TODO: Refactor the code below
 
@@ -71,4 +79,6 @@ class SelectResponse(BaseModel):
         # TODO (Roman): check if we are calling /select somewhere other than the main grid.
         serialized_records = tuple(ui_serializer.serialize_record_for_table(record) for record in records)
 
-        return SelectResponse(schema=type_decl_dict, data=serialized_records).dict(by_alias=True)
+        return SelectResponse(schema=type_decl_dict, data=serialized_records, next_page_token=next_page_token).dict(
+            by_alias=True
+        )
@@ -20,6 +20,7 @@ from fastapi import Header
 from fastapi import Query
 from fastapi.responses import ORJSONResponse
 from starlette.requests import Request
+from cl.runtime import Context
 from cl.runtime.routers.storage.dataset_response import DatasetResponse
 from cl.runtime.routers.storage.datasets_request import DatasetsRequest
 from cl.runtime.routers.storage.env_response import EnvResponse
@@ -27,6 +28,8 @@ from cl.runtime.routers.storage.record_request import RecordRequest
 from cl.runtime.routers.storage.record_response import RecordResponse
 from cl.runtime.routers.storage.save_permanently_request import SavePermanentlyRequest
 from cl.runtime.routers.storage.save_permanently_response import SavePermanentlyResponse
+from cl.runtime.routers.storage.search_request import SearchRequest
+from cl.runtime.routers.storage.search_response import SearchResponse
 from cl.runtime.routers.storage.select_request import SelectRequest
 from cl.runtime.routers.storage.select_response import SelectResponse
 from cl.runtime.routers.user_request import UserRequest
@@ -67,10 +70,11 @@ async def get_record(
     user: str = Header(None, description="User identifier or identity token"),
 ) -> RecordResponse:
     """Schema and data for a single record specified by a key."""
-    return RecordResponse.get_record(
+    return await Context.current().run_in_executor(
+        RecordResponse.get_record,
         RecordRequest(
             type=type, key=key, module=module, dataset=dataset, ignore_record_absence=ignore_record_absence, user=user
-        )
+        ),
     )
 
 
@@ -85,15 +89,43 @@ async def storage_select(
     skip: int = Query(0, description="Number of skipped records from the beginning of the list."),
     module: str = Query(None, description="Dot-delimited module string."),
     table_format: bool = Query(False, description="If true, response will be returned in the table format."),
+    page_size: int = Query(None, description="Number of records on the page, all records are returned if not set."),
+    page_token: str = Query(None, description="Token returned with the previous page to load the next page."),
 ) -> SelectResponse:
     """
     Get entities by query with schema information.
     """
 
-    return SelectResponse.get_records(
+    return await Context.current().run_in_executor(
+        SelectResponse.get_records,
         request=SelectRequest(
-            type_=type_, query_dict=query_dict, threshold=threshold, skip=skip, module=module, table_format=table_format
-        )
+            type_=type_,
+            query_dict=query_dict,
+            threshold=threshold,
+            skip=skip,
+            module=module,
+            table_format=table_format,
+            page_size=page_size,
+            page_token=page_token,
+        ),
+    )
+
+
+@router.get(path="/search", response_class=ORJSONResponse)
+async def storage_search(
+    type_: str = Query(..., alias="type", description="The type of records."),
+    query: str = Query(..., description="Text to search for in the search fields of the records."),
+    limit: int = Query(100, description="Maximum number of records in the response."),
+    module: str = Query(None, description="Dot-delimited module string."),
+    dataset: str = Query(None, description="Dataset string, root dataset if not specified."),
+) -> SearchResponse:
+    """
+    Get records where one of the search fields contains the query with schema information.
+    """
+
+    return await Context.current().run_in_executor(
+        SearchResponse.get_records,
+        request=SearchRequest(type_=type_, query=query, limit=limit, module=module, dataset=dataset),
     )
 
 
@@ -101,4 +133,4 @@ async def storage_select(
 async def save_permanently(request: Request, body: SavePermanentlyRequest) -> SavePermanentlyResponse:
     """Save records to the database on the disk."""
 
-    return SavePermanentlyResponse.save_permanently(request=body)
+    return await Context.current().run_in_executor(SavePermanentlyResponse.save_permanently, request=body)
@@ -41,9 +41,9 @@ async def tasks_run(request: Request, payload: RunRequest):
 
         # Run tasks without blocking the process
         payload.headers = headers
-        return RunResponseItem.run_tasks(payload)
+        return await Context.current().run_in_executor(RunResponseItem.run_tasks, payload)
     except Exception as e:
-        Context.current().save_one(LogMessage(message=str(e)))
+        await Context.current().asave_one(LogMessage(message=str(e)))
         raise e
 
 
@@ -61,13 +61,13 @@ async def tasks_cancel_all():
 
 @router.post("/run/status", response_model=List[TaskStatusResponseItem])
 async def tasks_status(payload: TaskStatusRequest):
-    return TaskStatusResponseItem.get_task_statuses(request=payload)
+    return await Context.current().run_in_executor(TaskStatusResponseItem.get_task_statuses, request=payload)
 
 
 @router.post("/run/result", response_model=List[TaskResultResponseItem])
 async def tasks_result(payload: TaskResultRequest):
     try:
-        return TaskResultResponseItem.get_task_results(request=payload)
+        return await Context.current().run_in_executor(TaskResultResponseItem.get_task_results, request=payload)
     except Exception as e:
-        Context.current().save_one(LogMessage(message=str(e)))
+        await Context.current().asave_one(LogMessage(message=str(e)))
         raise e
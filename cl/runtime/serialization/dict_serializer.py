@@ -13,10 +13,16 @@
 # limitations under the License.
 
 import sys
+import types
+import typing
 from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
+from operator import attrgetter
+from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import FrozenSet
 from typing import List
 from typing import Tuple
 from typing import Type
@@ -43,6 +49,30 @@ _type_dict: Dict[str, Type] = None
 class_hierarchy_slots_dict: Dict[Type, Tuple] = dict()
 """Dictionary of slots in class hierarchy in the order of declaration from base to derived."""
 
+_type_plan_dict: Dict[Type, "DictSerializerPlan"] = dict()
+"""Dictionary of serialization plans using the serialized type as key."""
+
+_pascal_slots_dict: Dict[Type, Tuple[str, ...]] = dict()
+"""Dictionary of slots converted to PascalCase using the serialized type as key."""
+
+_snake_names_dict: Dict[Type, Dict[str, str]] = dict()
+"""Dictionary of slot names indexed by PascalCase name using the serialized type as key."""
+
+_primitive_type_names_dict: Dict[Type, FrozenSet[str]] = dict()
+"""Dictionary of primitive type names for each serializer class, cached as frozenset for fast lookup."""
+
+TFieldCodec = Tuple[Type | None, Callable[[Any, Any], Any] | None]
+"""Declared field type and the function serializing values of exactly this type, None if returned as is."""
+
+_field_codecs_dict: Dict[Tuple[Type, Type], Tuple[TFieldCodec, ...]] = dict()
+"""Dictionary of field codecs using the serializer class and the serialized type as key."""
+
+_enum_names_dict: Dict[Type, Dict[Enum, str]] = dict()
+"""Dictionary of PascalCase item names for each enum type."""
+
+_enum_items_dict: Dict[Type, Dict[str, Enum]] = dict()
+"""Dictionary of enum items indexed by PascalCase name for each enum type."""
+
 collect_slots = sys.version_info.major > 3 or sys.version_info.major == 3 and sys.version_info.minor >= 11
 """For Python 3.11 and later, __slots__ includes fields for this class only, use MRO to include base class slots."""
 
@@ -100,6 +130,94 @@ def _get_class_hierarchy_slots(data_type) -> Tuple[str]:
         return cast(Tuple[str], result)
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
+class DictSerializerPlan:
+    """Per-type data precomputed on first use so that serialization of each object does not rediscover its shape."""
+
+    data_type: Type
+    """Type to which the plan applies."""
+
+    slots: Tuple[str, ...]
+    """Slots in class hierarchy in the order of declaration from base to derived."""
+
+    get_values: Callable[[Any], Tuple]
+    """Return a tuple of slot values in the same order as slots."""
+
+    field_types: Tuple[Type | None, ...]
+    """Declared type of each slot without optional, None if it is not a class or cannot be resolved."""
+
+    is_abstract: bool
+    """True if the type is abstract and cannot be deserialized directly."""
+
+    @classmethod
+    def for_type(cls, data_type: Type) -> "DictSerializerPlan":
+        """Get cached plan for the specified type, create on first use."""
+        if (result := _type_plan_dict.get(data_type, None)) is None:
+            slots = _get_class_hierarchy_slots(data_type)
+            if len(slots) > 1:
+                get_values = attrgetter(*slots)
+            elif len(slots) == 1:
+                slot_getter = attrgetter(slots[0])
+                get_values = lambda obj: (slot_getter(obj),)  # noqa
+            else:
+                get_values = lambda obj: ()  # noqa
+
+            try:
+                type_hints = typing.get_type_hints(data_type)
+            except (NameError, TypeError):
+                # Unresolved forward references, values of all fields are serialized based on their runtime type
+                type_hints = {}
+
+            result = DictSerializerPlan(
+                data_type=data_type,
+                slots=slots,
+                get_values=get_values,
+                field_types=tuple(_get_declared_class(type_hints.get(x, None)) for x in slots),
+                is_abstract=RecordUtil.is_abstract(data_type),
+            )
+            _type_plan_dict[data_type] = result
+        return result
+
+    def get_pascal_slots(self) -> Tuple[str, ...]:
+        """Slots converted to PascalCase keeping trailing underscore, computed on first use for pascalized keys."""
+        if (result := _pascal_slots_dict.get(self.data_type, None)) is None:
+            result = tuple(CaseUtil.snake_to_pascal_case_keep_trailing_underscore(x) for x in self.slots)
+            _pascal_slots_dict[self.data_type] = result
+        return result
+
+    def get_snake_names(self) -> Dict[str, str]:
+        """Slot name indexed by PascalCase name, used to deserialize pascalized keys."""
+        if (result := _snake_names_dict.get(self.data_type, None)) is None:
+            result = dict(zip(self.get_pascal_slots(), self.slots))
+            _snake_names_dict[self.data_type] = result
+        return result
+
+
+def _get_declared_class(field_type: Any) -> Type | None:
+    """Return the class from type annotation without optional, or None if it is not a class."""
+    field_origin = typing.get_origin(field_type)
+    if field_origin is typing.Union or field_origin is types.UnionType:
+        field_args = [x for x in typing.get_args(field_type) if x is not type(None)]
+        field_type = field_args[0] if len(field_args) == 1 else None
+    return field_type if isinstance(field_type, type) and typing.get_origin(field_type) is None else None
+
+
+def _get_enum_names(enum_type: Type) -> Dict[Enum, str]:
+    """Get PascalCase item names for the enum type."""
+    if (result := _enum_names_dict.get(enum_type, None)) is None:
+        result = {x: CaseUtil.upper_to_pascal_case(x.name) for x in enum_type}
+        _enum_names_dict[enum_type] = result
+    return result
+
+
+def _get_enum_items(enum_type: Type) -> Dict[str, Enum]:
+    """Get enum items indexed by PascalCase name for the enum type."""
+    if (result := _enum_items_dict.get(enum_type, None)) is None:
+        result = {v: k for k, v in _get_enum_names(enum_type).items()}
+        _enum_items_dict[enum_type] = result
+    return result
+
+
 # TODO: Add checks for to_node, from_node implementation for custom override of default serializer
 @dataclass(slots=True, kw_only=True)
 class DictSerializer:
@@ -108,6 +226,15 @@ class DictSerializer:
     pascalize_keys: bool = False
     """If true, pascalize keys during serialization."""
 
+    trusted: bool = False
+    """
+    If true, deserialized data is trusted (e.g. it was written to storage by this code) and records are not
+    validated against schema after deserialization. Keep False for data from the UI, CSV files and other sources.
+    """
+
+    trusted_init: bool = True
+    """If false, 'init' methods are not invoked when deserializing trusted data (ignored unless trusted is true)."""
+
     primitive_type_names = ["NoneType", "str", "float", "int", "bool", "date", "time", "datetime", "bytes", "UUID"]
     """Detect primitive type by checking if class name is in this list."""
 
@@ -124,24 +251,33 @@ class DictSerializer:
             select_fields: Fields of data object which will be used for serialization. If None - use all fields.
         """
 
+        primitive_type_names = self._get_primitive_type_names()
         if getattr(data, "__slots__", None) is not None:
             # Slots class, serialize as dictionary
 
             # Invoke 'init' for each class in class hierarchy that implements it, in the order from base to derived
             RecordUtil.init_all(data)
 
-            # Get slots from this class and its bases in the order of declaration from base to derived
-            all_slots = _get_class_hierarchy_slots(data.__class__)
-            # Serialize slot values in the order of declaration except those that are None
-            result = {
-                k if not self.pascalize_keys else CaseUtil.snake_to_pascal_case_keep_trailing_underscore(k): (
-                    v if v.__class__.__name__ in self.primitive_type_names else self.serialize_data(v)
-                )
-                for k in all_slots
-                if (not select_fields or k in select_fields) and (v := getattr(data, k)) is not None
-            }
+            # Get slots and their values using the plan precomputed for this class
+            plan = DictSerializerPlan.for_type(type_ := data.__class__)
+            keys = plan.get_pascal_slots() if self.pascalize_keys else plan.slots
+            field_codecs = self._get_field_codecs(plan)
+
+            # Serialize slot values in the order of declaration except those that are None, use field codec
+            # when the value has the declared type and dispatch on the runtime type otherwise
+            result = {}
+            for slot, k, v, (field_type, field_codec) in zip(plan.slots, keys, plan.get_values(data), field_codecs):
+                if v is None or (select_fields and slot not in select_fields):
+                    continue
+                elif v.__class__ is field_type:
+                    result[k] = v if field_codec is None else field_codec(self, v)
+                elif v.__class__.__name__ in primitive_type_names:
+                    result[k] = v
+                else:
+                    result[k] = self.serialize_data(v)
+
             # To find short name, use 'in' which is faster than 'get' when most types do not have aliases
-            short_name = alias_dict[type_] if (type_ := data.__class__) in alias_dict else type_.__name__
+            short_name = alias_dict[type_] if type_ in alias_dict else type_.__name__
             # Cache type for subsequent reverse lookup
             type_dict = get_type_dict()
             type_dict[short_name] = type_
@@ -151,7 +287,7 @@ class DictSerializer:
         elif isinstance(data, dict):
             # Dictionary, return with serialized values
             result = {
-                k: v if v.__class__.__name__ in self.primitive_type_names else self.serialize_data(v)
+                k: v if v.__class__.__name__ in primitive_type_names else self.serialize_data(v)
                 for k, v in data.items()
             }
             return result
@@ -161,30 +297,22 @@ class DictSerializer:
             if first_item == sentinel_value:
                 # Empty iterable, return None
                 return None
-            elif first_item is not None and first_item.__class__.__name__ in self.primitive_type_names:
+            elif first_item is not None and first_item.__class__.__name__ in primitive_type_names:
                 # Performance optimization to skip deserialization for arrays of primitive types
                 # based on the type of first item (assumes that all remaining items are also primitive)
                 return data
             else:
                 # Serialize each element of the iterable
-                return [
-                    v if v.__class__.__name__ in self.primitive_type_names else self.serialize_data(v) for v in data
-                ]
+                return [v if v.__class__.__name__ in primitive_type_names else self.serialize_data(v) for v in data]
         elif isinstance(data, Enum):
-            # Serialize enum as a dict using enum class short name and item name (rather than item value)
-            # To find short name, use 'in' which is faster than 'get' when most types do not have aliases
-            short_name = alias_dict[type_] if (type_ := type(data)) in alias_dict else type_.__name__
-            # Cache type for subsequent reverse lookup
-            type_dict = get_type_dict()
-            type_dict[short_name] = type_
-            pascal_case_value = CaseUtil.upper_to_pascal_case(data.name)
-            return {"_enum": short_name, "_name": pascal_case_value}
+            return self._serialize_enum(data)
         else:
             raise RuntimeError(f"Cannot serialize data of type '{type(data)}'.")
 
     def deserialize_data(self, data: TDataDict):  # TODO: Check if None should be supported
         """Deserialize object from data, invoke init_all after deserialization."""
 
+        primitive_type_names = self._get_primitive_type_names()
         if isinstance(data, dict):
             # Determine if the dictionary is a serialized dataclass or a dictionary
             if (short_name := data.get("_type", None)) is not None:
@@ -198,7 +326,8 @@ class DictSerializer:
                     )
 
                 # Check if the class is abstract
-                if RecordUtil.is_abstract(deserialized_type):
+                plan = DictSerializerPlan.for_type(deserialized_type)
+                if plan.is_abstract:
                     descendants = RecordUtil.get_non_abstract_descendants(deserialized_type)
                     descendant_names = sorted(set([x.__name__ for x in descendants]))
                     if len(descendant_names) > 0:
@@ -213,17 +342,31 @@ class DictSerializer:
                             f"and there are no descendant records that can."
                         )
 
-                deserialized_fields = {
-                    CaseUtil.pascale_to_snake_case_keep_trailing_underscore(k) if self.pascalize_keys else k: (
-                        v if v.__class__.__name__ in self.primitive_type_names else self.deserialize_data(v)
-                    )
-                    for k, v in data.items()
-                    if k != "_type"
-                }
+                if self.pascalize_keys:
+                    # Use precomputed slot names, convert keys that do not match a slot (error in constructor)
+                    snake_names = plan.get_snake_names()
+                    deserialized_fields = {
+                        (
+                            snake_names[k]
+                            if k in snake_names
+                            else CaseUtil.pascale_to_snake_case_keep_trailing_underscore(k)
+                        ): (v if v.__class__.__name__ in primitive_type_names else self.deserialize_data(v))
+                        for k, v in data.items()
+                        if k != "_type"
+                    }
+                else:
+                    deserialized_fields = {
+                        k: v if v.__class__.__name__ in primitive_type_names else self.deserialize_data(v)
+                        for k, v in data.items()
+                        if k != "_type"
+                    }
                 result = deserialized_type(**deserialized_fields)  # noqa
 
                 # Invoke 'init' for each class in class hierarchy that implements it, in the order from base to derived
-                RecordUtil.init_all(result)
+                if not self.trusted:
+                    RecordUtil.init_all(result)
+                elif self.trusted_init:
+                    RecordUtil.init_all(result, validate=False)
                 return result
             elif (short_name := data.get("_enum", None)) is not None:
                 # If _enum is specified, create an instance of _enum using _name
@@ -235,13 +378,14 @@ class DictSerializer:
                         f"Ensure all serialized enums are included in package import settings."
                     )
                 pascal_case_value = data["_name"]
-                upper_case_value = CaseUtil.pascal_to_upper_case(pascal_case_value)
-                result = deserialized_type[upper_case_value]  # noqa
+                if (result := _get_enum_items(deserialized_type).get(pascal_case_value, None)) is None:
+                    upper_case_value = CaseUtil.pascal_to_upper_case(pascal_case_value)
+                    result = deserialized_type[upper_case_value]  # noqa
                 return result
             else:
                 # Otherwise return a dictionary with recursively deserialized values
                 result = {
-                    k: v if v.__class__.__name__ in self.primitive_type_names else self.deserialize_data(v)
+                    k: v if v.__class__.__name__ in primitive_type_names else self.deserialize_data(v)
                     for k, v in data.items()
                 }
                 return result
@@ -251,21 +395,59 @@ class DictSerializer:
             if first_item == sentinel_value:
                 # Empty iterable, return None
                 return None
-            elif first_item is not None and first_item.__class__.__name__ in self.primitive_type_names:
+            elif first_item is not None and first_item.__class__.__name__ in primitive_type_names:
                 # Performance optimization to skip deserialization for arrays of primitive types
                 # based on the type of first item (assumes that all remaining items are also primitive)
                 return data
             else:
                 # Deserialize each element of the iterable
-                return [
-                    v if v.__class__.__name__ in self.primitive_type_names else self.deserialize_data(v) for v in data
-                ]
+                return [v if v.__class__.__name__ in primitive_type_names else self.deserialize_data(v) for v in data]
 
         elif is_key(data) or is_record(data):
             return data
         else:
             raise RuntimeError(f"Cannot deserialize data of type '{type(data)}'.")
 
+    def _serialize_enum(self, data: Enum) -> TDataDict:
+        """Serialize enum as a dict using enum class short name and item name (rather than item value)."""
+        # To find short name, use 'in' which is faster than 'get' when most types do not have aliases
+        short_name = alias_dict[type_] if (type_ := type(data)) in alias_dict else type_.__name__
+        # Cache type for subsequent reverse lookup
+        type_dict = get_type_dict()
+        type_dict[short_name] = type_
+        return {"_enum": short_name, "_name": _get_enum_names(type_)[data]}
+
+    def _get_field_codecs(self, plan: DictSerializerPlan) -> Tuple[TFieldCodec, ...]:
+        """
+        Get codec for each slot of the plan type chosen from its declared type, for this serializer class.
+        Primitive values are returned as is, enums are serialized directly unless serialize_data is overridden,
+        and other values are passed to serialize_data.
+        """
+        serializer_type = self.__class__
+        if (result := _field_codecs_dict.get((serializer_type, plan.data_type), None)) is None:
+            primitive_type_names = self._get_primitive_type_names()
+            is_overridden = serializer_type.serialize_data is not DictSerializer.serialize_data
+            field_codecs = []
+            for field_type in plan.field_types:
+                if field_type is None:
+                    field_codecs.append((None, None))
+                elif field_type.__name__ in primitive_type_names:
+                    field_codecs.append((field_type, None))
+                elif issubclass(field_type, Enum) and not is_overridden:
+                    field_codecs.append((field_type, DictSerializer._serialize_enum))
+                else:
+                    field_codecs.append((field_type, serializer_type.serialize_data))
+            result = tuple(field_codecs)
+            _field_codecs_dict[(serializer_type, plan.data_type)] = result
+        return result
+
+    def _get_primitive_type_names(self) -> FrozenSet[str]:
+        """Get primitive_type_names of this serializer class as frozenset, which is faster to search than a list."""
+        if (result := _primitive_type_names_dict.get(type_ := self.__class__, None)) is None:
+            result = frozenset(self.primitive_type_names)
+            _primitive_type_names_dict[type_] = result
+        return result
+
     @classmethod
     def _serialize_primitive(cls, value: TPrimitive, class_name: str) -> TPrimitive:
         """Serialize primitive value applying the applicable conversion rules."""
@@ -15,30 +15,43 @@
 import base64
 import datetime as dt
 import json
+from dataclasses import dataclass
 from typing import List
 from uuid import UUID
 from cl.runtime.records.protocols import TDataDict
+from cl.runtime.records.protocols import is_record
 from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
 from cl.runtime.serialization.string_value_parser_enum import StringValueCustomTypeEnum
 from cl.runtime.serialization.string_value_parser_enum import StringValueParser
 
+_base_primitive_type_names = frozenset(DictSerializer.primitive_type_names)
+"""Primitive type names of the base serializer, which are returned as is or converted to string by this serializer."""
 
+
+@dataclass(slots=True, kw_only=True)
 class FlatDictSerializer(DictSerializer):
     """
     Serialization for slot-based classes to flat dict (without nested fields).
     Complex types serialize as a json string.
     """
 
+    bytes_as_blob: bool = False
+    """
+    If true, non-empty bytes in the top level fields of a record other than key fields are returned as bytes
+    for storage as BLOB, otherwise they are returned as base64 string with type prefix.
+    """
+
     primitive_type_names = ["NoneType", "float", "int"]
 
     def serialize_data(self, data, select_fields: List[str] | None = None, *, is_root: bool = False):
         if isinstance(data, str):
             return data
 
-        if data.__class__.__name__ in super().primitive_type_names:
+        if data.__class__.__name__ in _base_primitive_type_names:
             serialized_data = data
         else:
-            serialized_data = super().serialize_data(data, select_fields)
+            serialized_data = super(FlatDictSerializer, self).serialize_data(data, select_fields)
 
         value_custom_type = StringValueParser.get_custom_type(serialized_data)
 
@@ -61,6 +74,13 @@ class FlatDictSerializer(DictSerializer):
                 if handled_serialized_value is not None
                 else serialized_data
             )
+        elif is_root and self.bytes_as_blob and is_record(data):
+            # Key fields keep string format because they are also serialized outside the record for lookup
+            key_slots = _get_class_hierarchy_slots(data.get_key_type())
+            for field_name in serialized_data:
+                if field_name not in key_slots and isinstance(v := getattr(data, field_name, None), bytes) and v:
+                    serialized_data[field_name] = v
+            return serialized_data
         else:
             return serialized_data
 
@@ -87,9 +107,9 @@ class FlatDictSerializer(DictSerializer):
 
             # TODO (Roman): consider to add serialize_primitive() method and override it
             # return deserialized primitives to avoid infinity recursion
-            if converted_data.__class__.__name__ in super().primitive_type_names:
+            if converted_data.__class__.__name__ in _base_primitive_type_names:
                 return converted_data
         else:
             converted_data = data
 
-        return super().deserialize_data(converted_data)
+        return super(FlatDictSerializer, self).deserialize_data(converted_data)
@@ -0,0 +1,311 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import datetime as dt
+import json
+import types
+import typing
+from enum import Enum
+from inspect import isclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Literal
+from typing import Tuple
+from typing import Type
+from uuid import UUID
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.primitive.date_util import DateUtil
+from cl.runtime.records.protocols import TDataDict
+from cl.runtime.records.protocols import is_key
+from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
+from cl.runtime.serialization.dict_serializer import alias_dict
+from cl.runtime.serialization.dict_serializer import get_type_dict
+from cl.runtime.serialization.string_serializer import StringSerializer
+from cl.runtime.serialization.string_value_parser_enum import StringValueCustomTypeEnum
+from cl.runtime.serialization.string_value_parser_enum import StringValueParser
+
+TColumnKind = Literal[
+    "str", "int", "float", "bool", "date", "datetime", "time", "uuid", "bytes", "enum", "key", "nested"
+]
+"""Kind of the column used to store a field, 'nested' fields are stored together in the data column."""
+
+column_affinities: Dict[str, str] = {
+    "str": "TEXT",
+    "int": "INTEGER",
+    "float": "REAL",
+    "bool": "INTEGER",
+    "date": "INTEGER",
+    "datetime": "TEXT",
+    "time": "TEXT",
+    "uuid": "TEXT",
+    "bytes": "BLOB",
+    "enum": "TEXT",
+    "key": "TEXT",
+}
+"""SQL column type for each column kind except 'nested'."""
+
+data_field_name = "_data"
+"""Name of the field holding the fields that do not have a typed column as a single JSON blob."""
+
+_primitive_column_kinds: Dict[Type, TColumnKind] = {
+    str: "str",
+    int: "int",
+    float: "float",
+    bool: "bool",
+    dt.date: "date",
+    dt.datetime: "datetime",
+    dt.time: "time",
+    UUID: "uuid",
+    bytes: "bytes",
+}
+"""Column kind for each primitive type."""
+
+_column_kinds_dict: Dict[Type, Dict[str, TColumnKind]] = {}
+"""Dictionary of column kinds for each field of the type."""
+
+_field_types_dict: Dict[Tuple[Type, str], Type] = {}
+"""Dictionary of field types without optional using the type and field name as key."""
+
+_key_serializer = StringSerializer()
+"""Serializer for embedded keys."""
+
+_dict_serializer = DictSerializer()
+"""Serializer for the record and its nested fields, used directly to avoid calling the overrides recursively."""
+
+_trusted_dict_serializer = DictSerializer(trusted=True)
+"""Serializer for the record and its nested fields when the data is trusted."""
+
+_trusted_no_init_dict_serializer = DictSerializer(trusted=True, trusted_init=False)
+"""Serializer for the record and its nested fields when the data is trusted and 'init' methods are not invoked."""
+
+
+def _get_column_kind(field_type: Any) -> TColumnKind:
+    """Get column kind from field type annotation obtained using get_type_hints."""
+
+    # Strip optional from field type, note two possible forms of origin for optional, typing.Union and types.UnionType
+    field_origin = typing.get_origin(field_type)
+    if field_origin is typing.Union or field_origin is types.UnionType:
+        non_optional_args = [x for x in typing.get_args(field_type) if x is not type(None)]
+        if len(non_optional_args) != 1:
+            # Union of several types is stored as nested
+            return "nested"
+        field_type = non_optional_args[0]
+
+    if (result := _primitive_column_kinds.get(field_type, None)) is not None:
+        return result
+    elif isclass(field_type) and issubclass(field_type, Enum):
+        return "enum"
+    elif isclass(field_type) and is_key(field_type):
+        return "key"
+    else:
+        return "nested"
+
+
+def _encode_json_default(value: Any) -> str:
+    """Encode primitive types not supported by JSON as strings with type prefix."""
+    if (custom_type := StringValueParser.get_custom_type(value)) in (
+        StringValueCustomTypeEnum.DATE,
+        StringValueCustomTypeEnum.DATETIME,
+        StringValueCustomTypeEnum.TIME,
+    ):
+        return StringValueParser.add_type_prefix(value.isoformat(), custom_type)
+    elif custom_type == StringValueCustomTypeEnum.UUID:
+        return StringValueParser.add_type_prefix(str(value), custom_type)
+    elif custom_type == StringValueCustomTypeEnum.BYTES:
+        return StringValueParser.add_type_prefix(base64.b64encode(value).decode(), custom_type)
+    else:
+        raise RuntimeError(f"Cannot serialize data of type '{type(value)}' to JSON.")
+
+
+def _decode_json_value(value: Any) -> Any:
+    """Restore primitive types encoded as strings with type prefix inside JSON."""
+    if isinstance(value, str):
+        converted_value, custom_type = StringValueParser.parse(value)
+        if custom_type == StringValueCustomTypeEnum.DATE:
+            return dt.date.fromisoformat(converted_value)
+        elif custom_type == StringValueCustomTypeEnum.DATETIME:
+            return dt.datetime.fromisoformat(converted_value)
+        elif custom_type == StringValueCustomTypeEnum.TIME:
+            return dt.time.fromisoformat(converted_value)
+        elif custom_type == StringValueCustomTypeEnum.UUID:
+            return UUID(converted_value)
+        elif custom_type == StringValueCustomTypeEnum.BYTES:
+            return base64.b64decode(converted_value.encode())
+        else:
+            return value
+    elif isinstance(value, dict):
+        return {k: _decode_json_value(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_decode_json_value(v) for v in value]
+    else:
+        return value
+
+
+class TypedFlatDictSerializer(DictSerializer):
+    """
+    Serialization for slot-based classes to flat dict with native SQL values for primitive fields,
+    embedded keys and enums, and a single JSON blob for all other fields of the record.
+    """
+
+    @classmethod
+    def get_column_kinds(cls, data_type: Type) -> Dict[str, TColumnKind]:
+        """Column kind for each field of the type based on its type annotation."""
+        if (result := _column_kinds_dict.get(data_type, None)) is None:
+            try:
+                type_hints = typing.get_type_hints(data_type)
+            except NameError:
+                # Unresolved forward references, store the type as nested
+                type_hints = {}
+            result = {
+                field_name: _get_column_kind(type_hints[field_name]) if field_name in type_hints else "nested"
+                for field_name in _get_class_hierarchy_slots(data_type)
+            }
+            _column_kinds_dict[data_type] = result
+        return result
+
+    def serialize_data(self, data, select_fields: List[str] | None = None, *, is_root: bool = False):
+        if not is_root:
+            return self._serialize_value(data)
+
+        # Fields are serialized using DictSerializer which invokes 'init' methods
+        serialized_data = _dict_serializer.serialize_data(data, select_fields)
+        column_kinds = self.get_column_kinds(type(data))
+
+        result = {}
+        nested_data = {}
+        for field_name, serialized_value in serialized_data.items():
+            if field_name == "_type":
+                result[field_name] = serialized_value
+            elif (column_kind := column_kinds.get(field_name, "nested")) == "nested":
+                nested_data[field_name] = serialized_value
+            elif (column_value := self._serialize_value(getattr(data, field_name), column_kind)) is not None:
+                result[field_name] = column_value
+            else:
+                # Value does not match the declared type, store as nested
+                nested_data[field_name] = serialized_value
+
+        if nested_data:
+            result[data_field_name] = json.dumps(nested_data, default=_encode_json_default, separators=(",", ":"))
+        return result
+
+    def deserialize_data(self, data: TDataDict):
+        # Non-root values are returned without conversion because column kind is not known
+        if not isinstance(data, dict) or (short_name := data.get("_type", None)) is None:
+            return self._get_dict_serializer().deserialize_data(data)
+
+        deserialized_type = get_type_dict().get(short_name, None)
+        column_kinds = self.get_column_kinds(deserialized_type) if deserialized_type is not None else {}
+
+        # Convert typed columns to the form produced by DictSerializer and merge with nested data
+        serialized_data = {"_type": short_name}
+        for field_name, value in data.items():
+            if field_name == "_type" or value is None:
+                continue
+            elif field_name == data_field_name:
+                serialized_data.update(_decode_json_value(json.loads(value)))
+            else:
+                serialized_data[field_name] = self._deserialize_value(
+                    value, column_kinds.get(field_name, "nested"), deserialized_type, field_name
+                )
+        return self._get_dict_serializer().deserialize_data(serialized_data)
+
+    def _get_dict_serializer(self) -> DictSerializer:
+        """Serializer for the fields, uses the trust settings of this serializer."""
+        if self.trusted:
+            return _trusted_dict_serializer if self.trusted_init else _trusted_no_init_dict_serializer
+        else:
+            return _dict_serializer
+
+    @classmethod
+    def _serialize_value(cls, value: Any, column_kind: TColumnKind | None = None) -> Any:
+        """
+        Serialize value to the form stored in the column, return None if it cannot be stored in a typed column.
+        When column_kind is None, it is determined from the value, which is used for keys and filter values.
+        """
+        if value is None:
+            return None
+        if column_kind is None:
+            if isinstance(value, Enum):
+                column_kind = "enum"
+            elif is_key(value):
+                column_kind = "key"
+            else:
+                column_kind = _primitive_column_kinds.get(type(value), "nested")
+
+        # Check value type against column kind because an annotation does not enforce the type at runtime
+        if column_kind == "str" and isinstance(value, str):
+            return value
+        elif column_kind == "bool" and isinstance(value, bool):
+            return int(value)
+        elif column_kind in ("int", "float") and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        elif column_kind == "date" and type(value) is dt.date:
+            return DateUtil.to_iso_int(value)
+        elif column_kind in ("datetime", "time") and isinstance(value, (dt.datetime, dt.time)):
+            return value.isoformat()
+        elif column_kind == "uuid" and isinstance(value, UUID):
+            return str(value)
+        elif column_kind == "bytes" and isinstance(value, bytes):
+            return value
+        elif column_kind == "enum" and isinstance(value, Enum):
+            return CaseUtil.upper_to_pascal_case(value.name)
+        elif column_kind == "key" and is_key(value):
+            return _key_serializer.serialize_key(value, add_type_prefix=True)
+        elif column_kind == "nested" and hasattr(value, "__iter__") and next(iter(value), None) is None:
+            # Empty containers are not stored, consistent with DictSerializer
+            return None
+        elif column_kind == "nested":
+            raise RuntimeError(
+                f"Value of type {type(value).__name__} is stored in a JSON blob and cannot be used "
+                f"as a key field or in a database filter."
+            )
+        else:
+            return None
+
+    @classmethod
+    def _deserialize_value(cls, value: Any, column_kind: TColumnKind, data_type: Type, field_name: str) -> Any:
+        """Deserialize value stored in the column to the form produced by DictSerializer."""
+        if column_kind == "bool":
+            return bool(value)
+        elif column_kind == "date":
+            return DateUtil.from_iso_int(value)
+        elif column_kind == "datetime":
+            return dt.datetime.fromisoformat(value)
+        elif column_kind == "time":
+            return dt.time.fromisoformat(value)
+        elif column_kind == "uuid":
+            return UUID(value)
+        elif column_kind == "enum":
+            # Get enum type from the annotation and return in the form produced by DictSerializer
+            enum_type = cls._get_field_type(data_type, field_name)
+            short_name = alias_dict[enum_type] if enum_type in alias_dict else enum_type.__name__
+            get_type_dict()[short_name] = enum_type
+            return {"_enum": short_name, "_name": value}
+        elif column_kind == "key":
+            return _key_serializer.deserialize_key(value)
+        else:
+            return value
+
+    @classmethod
+    def _get_field_type(cls, data_type: Type, field_name: str) -> Type:
+        """Get field type from the annotation without optional, cached after the first call for each field."""
+        if (result := _field_types_dict.get((data_type, field_name), None)) is None:
+            result = typing.get_type_hints(data_type)[field_name]
+            if (field_origin := typing.get_origin(result)) is typing.Union or field_origin is types.UnionType:
+                result = next(x for x in typing.get_args(result) if x is not type(None))
+            _field_types_dict[(data_type, field_name)] = result
+        return result
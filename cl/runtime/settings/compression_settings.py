@@ -0,0 +1,60 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from typing_extensions import Self
+from cl.runtime.db.compression_codec_enum import CompressionCodecEnum
+from cl.runtime.settings.settings import Settings
+
+
+@dataclass(slots=True, kw_only=True)
+class CompressionSettings(Settings):
+    """Compression of large string and binary field values stored in a database."""
+
+    codec: str = "zstd"
+    """Codec used to compress new values (zstd, zlib, or none), values are read irrespective of this setting."""
+
+    threshold: int = 4096
+    """Values whose size is at least this number of bytes for binary or characters for string values are compressed."""
+
+    level: int | None = None
+    """Compression level, codec default is used if not specified."""
+
+    def init(self) -> Self:
+        """Similar to __init__ but can use fields set after construction, return self to enable method chaining."""
+
+        # Convert codec to lowercase and validate its value
+        self.codec = self.codec.lower()
+        valid_codecs = [x.name.lower() for x in CompressionCodecEnum]
+        if self.codec not in valid_codecs:
+            raise RuntimeError(
+                f"Invalid compression codec: {self.codec}, permitted values are: {', '.join(valid_codecs)}."
+            )
+
+        # Validate integer fields
+        if not isinstance(self.threshold, int) or self.threshold < 1:
+            raise RuntimeError(f"{type(self).__name__} field 'threshold' must be a positive int.")
+        if self.level is not None and not isinstance(self.level, int):
+            raise RuntimeError(f"{type(self).__name__} field 'level' must be an int or None.")
+
+        # Return self to enable method chaining
+        return self
+
+    @classmethod
+    def get_prefix(cls) -> str:
+        return "runtime_compression"
+
+    def get_codec(self) -> CompressionCodecEnum:
+        """Codec used to compress new values."""
+        return CompressionCodecEnum[self.codec.upper()]
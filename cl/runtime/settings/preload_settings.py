@@ -19,6 +19,7 @@ from typing_extensions import Self
 from cl.runtime.configs.config import Config
 from cl.runtime.context.context import Context
 from cl.runtime.file.csv_file_reader import CsvFileReader
+from cl.runtime.file.snapshot_util import SnapshotUtil
 from cl.runtime.settings.settings import Settings
 
 
@@ -33,6 +34,8 @@ class PreloadSettings(Settings):
     Notes:
         - Each element of 'dir_path' will be searched for csv, yaml, and json subdirectories
         - For CSV, the data is in csv/.../ClassName.csv where ... is optional dataset
+        - For Parquet and Arrow snapshots, the data is in KeyClassName.parquet or KeyClassName.arrow anywhere
+          under the directory, see SnapshotUtil
         - For YAML, the data is in yaml/ClassName/.../KeyToken1;KeyToken2.yaml where ... is optional dataset
         - For JSON, the data is in json/ClassName/.../KeyToken1;KeyToken2.json where ... is optional dataset
     """
@@ -60,6 +63,10 @@ class PreloadSettings(Settings):
         csv_files = self._get_files("csv")
         [CsvFileReader(file_path=csv_file).read_and_save() for csv_file in csv_files]
 
+        # Process Parquet and Arrow snapshot preloads
+        snapshot_files = self._get_files("parquet") + self._get_files("arrow")
+        [SnapshotUtil.import_file(snapshot_file) for snapshot_file in snapshot_files]
+
         # TODO: Process YAML and JSON preloads
 
         # Execute run_config on all preloaded Config records
@@ -0,0 +1,83 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from typing import Dict
+from typing import List
+from typing import Type
+from typing_extensions import Self
+from cl.runtime.records.protocols import is_record
+from cl.runtime.schema.schema import Schema
+from cl.runtime.settings.settings import Settings
+
+_record_fields_dict: Dict[Type, List[str]] = {}
+"""Search fields for each record type, including the fields specified for its base types."""
+
+_table_fields_dict: Dict[Type, List[str]] = {}
+"""Search fields for each key type, including the fields of all record types stored in its table."""
+
+
+@dataclass(slots=True, kw_only=True)
+class SearchSettings(Settings):
+    """Text fields included in the full-text search index."""
+
+    fields: Dict[str, List[str]] | None = None
+    """
+    List of string fields to search for each record type, specified as dictionary indexed by type short name.
+
+    Notes:
+        - The fields specified for a base type are also searched in each derived type
+        - The search index is maintained on save, records saved before a field is added are indexed on next search
+    """
+
+    def init(self) -> Self:
+        """Similar to __init__ but can use fields set after construction, return self to enable method chaining."""
+
+        # Convert to dict of lists if a single field is specified as string for some types
+        if self.fields is None:
+            self.fields = {}
+        elif not isinstance(self.fields, dict):
+            raise RuntimeError(f"{type(self).__name__} field 'fields' must be a dictionary indexed by type name.")
+        self.fields = {k: [v] if isinstance(v, str) else list(v) for k, v in self.fields.items()}
+
+        # Return self to enable method chaining
+        return self
+
+    @classmethod
+    def get_prefix(cls) -> str:
+        return "runtime_search"
+
+    def get_record_fields(self, record_type: Type) -> List[str]:
+        """Search fields for the record type including the fields specified for its base types."""
+        if (result := _record_fields_dict.get(record_type, None)) is None:
+            # Base class fields come first, each field is included once
+            result = list(
+                dict.fromkeys(
+                    field_name
+                    for base_type in reversed(record_type.__mro__)
+                    for field_name in self.fields.get(base_type.__name__, ())
+                )
+            )
+            _record_fields_dict[record_type] = result
+        return result
+
+    def get_table_fields(self, key_type: Type) -> List[str]:
+        """Search fields for the table of the key type, including the fields of all record types stored in it."""
+        if (result := _table_fields_dict.get(key_type, None)) is None:
+            record_types = sorted(
+                (x for x in Schema.get_type_successors(key_type) if is_record(x)), key=lambda x: x.__name__
+            )
+            result = list(dict.fromkeys(field_name for x in record_types for field_name in self.get_record_fields(x)))
+            _table_fields_dict[key_type] = result
+        return result
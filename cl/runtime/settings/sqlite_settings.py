@@ -0,0 +1,77 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from typing_extensions import Self
+from cl.runtime.settings.settings import Settings
+
+
+@dataclass(slots=True, kw_only=True)
+class SqliteSettings(Settings):
+    """Pragmas applied to each new SQLite connection."""
+
+    journal_mode: str = "wal"
+    """Journal mode, WAL allows readers to run concurrently with a single writer."""
+
+    synchronous: str = "normal"
+    """Synchronous flag, 'normal' is safe with WAL and avoids fsync on every commit."""
+
+    cache_size: int = -64000
+    """Page cache size in pages if positive or in KiB if negative, following SQLite conventions."""
+
+    mmap_size: int = 268435456
+    """Maximum number of bytes of the database file mapped into memory, zero to disable memory-mapped I/O."""
+
+    busy_timeout: int = 5000
+    """Time in milliseconds to wait for a lock held by another connection before raising 'database is locked'."""
+
+    executor_max_workers: int = 4
+    """Maximum number of threads (and therefore connections) used by the async methods of each SqliteDb instance."""
+
+    def init(self) -> Self:
+        """Similar to __init__ but can use fields set after construction, return self to enable method chaining."""
+
+        # Convert journal mode and synchronous flag to lowercase and validate their values
+        self.journal_mode = self.journal_mode.lower()
+        valid_journal_modes = ["delete", "truncate", "persist", "memory", "wal", "off"]
+        if self.journal_mode not in valid_journal_modes:
+            raise RuntimeError(
+                f"Invalid SQLite journal mode: {self.journal_mode}, "
+                f"permitted values are: {', '.join(valid_journal_modes)}."
+            )
+        self.synchronous = self.synchronous.lower()
+        valid_synchronous = ["off", "normal", "full", "extra"]
+        if self.synchronous not in valid_synchronous:
+            raise RuntimeError(
+                f"Invalid SQLite synchronous flag: {self.synchronous}, "
+                f"permitted values are: {', '.join(valid_synchronous)}."
+            )
+
+        # Validate integer pragmas
+        for field_name in ["cache_size", "mmap_size", "busy_timeout", "executor_max_workers"]:
+            if not isinstance(getattr(self, field_name), int):
+                raise RuntimeError(f"{type(self).__name__} field '{field_name}' must be an int.")
+        if self.mmap_size < 0:
+            raise RuntimeError(f"{type(self).__name__} field 'mmap_size' must not be negative.")
+        if self.busy_timeout < 0:
+            raise RuntimeError(f"{type(self).__name__} field 'busy_timeout' must not be negative.")
+        if self.executor_max_workers < 1:
+            raise RuntimeError(f"{type(self).__name__} field 'executor_max_workers' must be positive.")
+
+        # Return self to enable method chaining
+        return self
+
+    @classmethod
+    def get_prefix(cls) -> str:
+        return "runtime_sqlite"
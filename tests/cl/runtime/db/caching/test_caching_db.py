@@ -0,0 +1,128 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.caching.cache_policy import CachePolicy
+from cl.runtime.db.caching.caching_db import CachingDb
+from cl.runtime.db.local.local_cache import LocalCache
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.records.class_info import ClassInfo
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassRecordKey
+from stubs.cl.runtime import StubDataclassSingleton
+
+
+def test_version_invalidation():
+    """Test that writes bypassing the cache are detected using table version stamps."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        caching_db = CachingDb(db_id=context.db.db_id, db=context.db, version_check_interval=0.0)
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+        caching_db.save_many(records)
+        assert context.db.get_table_version(StubDataclassRecordKey) == 1
+
+        # The first load caches the records, the second load is served from cache
+        keys = [x.get_key() for x in records]
+        assert caching_db.load_many(StubDataclassRecord, keys) == records
+        loaded_records = caching_db.load_many(StubDataclassRecord, keys)
+        assert loaded_records == records
+        assert caching_db.get_stats().hits == 3
+
+        # Same object is returned by subsequent loads because it is cached
+        assert caching_db.load_one(StubDataclassRecord, keys[0]) is loaded_records[0]
+
+        # Write by another process is detected using the version stamp of the table
+        updated_record = StubDataclassDerivedRecord(id="id0")
+        context.db.save_one(updated_record)
+        assert caching_db.load_one(StubDataclassRecord, keys[0]) == updated_record
+
+        # Records of other tables remain cached
+        caching_db.save_one(StubDataclassSingleton())
+        caching_db.load_one(StubDataclassSingleton, StubDataclassSingleton().get_key())
+        context.db.save_one(StubDataclassRecord(id="id3"))
+        hits = caching_db.get_stats().hits
+        caching_db.load_one(StubDataclassSingleton, StubDataclassSingleton().get_key())
+        assert caching_db.get_stats().hits == hits + 1
+
+        # Delete is written to both the database and the cache
+        caching_db.delete_many(keys[1:])
+        assert caching_db.load_many(StubDataclassRecord, keys) == [updated_record, None, None]
+        assert list(context.db.load_many(StubDataclassRecord, keys)) == [updated_record, None, None]
+
+
+def test_dataset_invalidation():
+    """Test that writes to a dataset remove the records cached for its descendant datasets."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        caching_db = CachingDb(db_id=context.db.db_id, db=context.db, version_check_interval=None)
+        record = StubDataclassDerivedRecord(id="abc", derived_str_field="old")
+        caching_db.save_one(record, dataset="\\parent")
+
+        # The record is found in the parent dataset by hierarchical lookup and cached for the child dataset
+        key = record.get_key()
+        assert caching_db.load_one(StubDataclassDerivedRecord, key, dataset="\\parent\\child") == record
+
+        # Save to the parent dataset is visible in the child dataset without version comparison
+        new_record = StubDataclassDerivedRecord(id="abc", derived_str_field="new")
+        caching_db.save_one(new_record, dataset="\\parent")
+        assert caching_db.load_one(StubDataclassDerivedRecord, key, dataset="\\parent\\child") == new_record
+
+        # Delete from the parent dataset is visible in the child dataset
+        caching_db.delete_one(StubDataclassRecordKey, key, dataset="\\parent")
+        assert (
+            caching_db.load_one(StubDataclassDerivedRecord, key, dataset="\\parent\\child", is_record_optional=True)
+            is None
+        )
+
+
+def test_policies():
+    """Test TTL, pinning and eviction using a database without version stamps."""
+
+    local_cache = LocalCache(db_id="temp;test_policies")
+    caching_db = CachingDb(db_id=local_cache.db_id, db=local_cache, max_records=2)
+    records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+    caching_db.save_many(records)
+
+    # Only the two most recently saved records remain cached
+    keys = [x.get_key() for x in records]
+    assert caching_db.load_many(StubDataclassRecord, keys) == records
+    assert caching_db.get_stats().hits == 2
+    assert caching_db.get_stats().evictions == 2
+
+    # Pinned records are not evicted
+    caching_db.set_policy(StubDataclassRecord, CachePolicy(is_pinned=True))
+    caching_db.load_many(StubDataclassRecord, keys)
+    caching_db.load_many(StubDataclassRecord, keys)
+    assert caching_db.get_stats().hits == 5
+
+    # Records expire after TTL
+    caching_db.set_policy(StubDataclassRecord, CachePolicy(ttl=0.0))
+    caching_db.load_many(StubDataclassRecord, keys)
+    caching_db.load_many(StubDataclassRecord, keys)
+    assert caching_db.get_stats().hits == 5
+
+    # Records of the types without policy are not cached
+    caching_db.set_policy(StubDataclassRecord, None)
+    caching_db.load_many(StubDataclassRecord, keys)
+    caching_db.load_many(StubDataclassRecord, keys)
+    assert caching_db.get_stats().hits == 5
+    assert caching_db.get_stats().misses == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,100 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.instrumented.instrumented_db import InstrumentedDb
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.records.class_info import ClassInfo
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassRecordKey
+from stubs.cl.runtime import StubDataclassSingleton
+
+
+def test_stats():
+    """Test counters for each method and key type."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        instrumented_db = InstrumentedDb(db_id=context.db.db_id, db=context.db, span_sample_rate=1.0).init()
+        instrumented_db.reset_stats()
+
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+        keys = [x.get_key() for x in records]
+        instrumented_db.save_many(records)
+        instrumented_db.save_many([StubDataclassRecord(id="id3"), StubDataclassSingleton()])
+        assert instrumented_db.load_many(StubDataclassRecord, keys) == records
+        assert len(list(instrumented_db.load_all(StubDataclassRecord))) == 4
+        with pytest.raises(UserError):
+            instrumented_db.load_one(StubDataclassRecord, StubDataclassRecordKey(id="missing"))
+        instrumented_db.delete_many(keys)
+
+        stats_dict = {(x.method, x.key_type): x for x in instrumented_db.get_stats()}
+        assert set(stats_dict) == {
+            ("save_many", "StubDataclassRecordKey"),
+            ("save_many", "Multiple"),
+            ("load_many", "StubDataclassRecordKey"),
+            ("load_all", "StubDataclassRecordKey"),
+            ("load_one", "StubDataclassRecordKey"),
+            ("delete_many", "StubDataclassRecordKey"),
+        }
+
+        save_stats = stats_dict[("save_many", "StubDataclassRecordKey")]
+        assert save_stats.call_count == 1
+        assert save_stats.row_count == 3
+        assert sum(save_stats.bucket_counts) == 1
+        assert save_stats.sampled_count == 1
+        assert save_stats.get_bytes_per_row() > 0
+
+        assert stats_dict[("load_all", "StubDataclassRecordKey")].row_count == 4
+        assert stats_dict[("load_all", "StubDataclassRecordKey")].sampled_count == 1
+        assert stats_dict[("delete_many", "StubDataclassRecordKey")].sampled_count == 0
+        assert stats_dict[("load_one", "StubDataclassRecordKey")].error_count == 1
+        assert stats_dict[("delete_many", "StubDataclassRecordKey")].row_count == 3
+
+        # Counters are reset when the database is dropped
+        instrumented_db.delete_all_and_drop_db()
+        assert instrumented_db.get_stats() == []
+
+
+def test_lazy_load():
+    """Test counters for a lazy result that is released before or after iteration."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        instrumented_db = InstrumentedDb(db_id=context.db.db_id, db=context.db, span_sample_rate=1.0).init()
+        instrumented_db.save_many([StubDataclassRecord(id=f"id{i}") for i in range(2)])
+        instrumented_db.reset_stats()
+
+        # The call is counted when the result is released without iterating, no size sample without rows
+        result = instrumented_db.load_all(StubDataclassRecord)
+        del result
+        load_all_stats = instrumented_db.get_stats()[0]
+        assert load_all_stats.call_count == 1
+        assert load_all_stats.row_count == 0
+        assert load_all_stats.sampled_count == 0
+
+        # The call is counted once after the result is exhausted
+        assert len(list(instrumented_db.load_all(StubDataclassRecord))) == 2
+        load_all_stats = instrumented_db.get_stats()[0]
+        assert load_all_stats.call_count == 2
+        assert load_all_stats.row_count == 2
+        assert load_all_stats.sampled_count == 1
+
+        instrumented_db.delete_all_and_drop_db()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
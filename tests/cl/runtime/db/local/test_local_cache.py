@@ -13,7 +13,15 @@
 # limitations under the License.
 
 import pytest
+from cl.runtime.context.testing_context import TestingContext
 from cl.runtime.db.local.local_cache import LocalCache
+from cl.runtime.db.local.local_cache_eviction_policy_enum import LocalCacheEvictionPolicyEnum
+from cl.runtime.log.log_message import LogMessage
+from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from stubs.cl.runtime import StubDataclassComposite
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassRecordKey
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_record import StubDataclassRecord
 
 
@@ -46,5 +54,134 @@ def test_smoke():
     assert cache.load_one(StubDataclassRecord, key) is record  # In case of local cache only, also the same object
 
 
+def test_load_all_and_load_filter():
+    """Test 'load_all', 'load_filter' and delete methods using LocalCache as the database for TestingContext."""
+
+    db_class = ClassInfo.get_class_path(LocalCache)
+    with TestingContext(db_class=db_class) as context:
+        base_records = [StubDataclassRecord(id=f"base{i}") for i in range(2)]
+        matching_records = [StubDataclassDerivedRecord(id=f"a{i}", derived_str_field="a") for i in range(2)]
+        non_matching_records = [StubDataclassDerivedRecord(id=f"b{i}", derived_str_field="b") for i in range(2)]
+        context.save_many(non_matching_records + base_records + matching_records)
+
+        # Load all records of a type and its subtypes sorted by key
+        assert context.load_all(StubDataclassRecord) == matching_records + non_matching_records + base_records
+        assert context.load_all(StubDataclassDerivedRecord) == matching_records + non_matching_records
+
+        # Filter by a primitive field
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_str_field="a")
+        assert context.load_filter(StubDataclassDerivedRecord, filter_obj) == matching_records
+
+        # Filter by embedded key
+        composite_samples = [
+            StubDataclassComposite(primitive="abc1", embedded_1=StubDataclassRecordKey(id="x")),
+            StubDataclassComposite(primitive="abc2", embedded_1=StubDataclassRecordKey(id="y")),
+        ]
+        context.save_many(composite_samples)
+        filter_obj = StubDataclassComposite(primitive=None, embedded_1=StubDataclassRecordKey(id="y"), embedded_2=None)
+        assert context.load_filter(StubDataclassComposite, filter_obj) == composite_samples[1:]
+
+        # Replacing a record with a record of another type updates the secondary index
+        context.save_one(StubDataclassDerivedRecord(id="base0"))
+        assert len(context.load_all(StubDataclassDerivedRecord)) == 5
+
+        # Delete records
+        context.delete_one(StubDataclassRecordKey, base_records[1].get_key())
+        context.delete_many([x.get_key() for x in matching_records])
+        assert context.load_all(StubDataclassRecord) == non_matching_records + [StubDataclassDerivedRecord(id="base0")]
+        assert context.load_one(StubDataclassRecord, matching_records[0].get_key(), is_record_optional=True) is None
+
+
+def test_exists_many_and_count():
+    """Test existence checks and counts, which do not change lookup counters."""
+
+    local_cache = LocalCache(db_id="temp;test_exists_many_and_count")
+    base_records = [StubDataclassRecord(id=f"base{i}") for i in range(3)]
+    derived_records = [StubDataclassDerivedRecord(id=f"a{i}", derived_str_field="a") for i in range(2)]
+    local_cache.save_many(base_records + derived_records)
+
+    keys = [base_records[0].get_key(), StubDataclassRecordKey(id="missing"), None, derived_records[1].get_key()]
+    assert local_cache.exists_many(keys) == [True, False, False, True]
+    assert local_cache.count(StubDataclassRecord) == 5
+    assert local_cache.count(StubDataclassDerivedRecord) == 2
+    assert (
+        local_cache.count(StubDataclassDerivedRecord, StubDataclassDerivedRecord(id=None, derived_str_field="b")) == 0
+    )
+    assert local_cache.count(StubDataclassComposite) == 0
+    assert local_cache.get_stats().hits == 0
+    assert local_cache.get_stats().misses == 0
+
+
+def test_load_page():
+    """Test loading records one page at a time."""
+
+    local_cache = LocalCache(db_id="temp;test_load_page")
+    records = [StubDataclassRecord(id=f"id{i:02}") for i in range(0, 25, 2)]
+    records += [StubDataclassDerivedRecord(id=f"id{i:02}") for i in range(1, 25, 2)]
+    local_cache.save_many(records)
+
+    # Load all records in descending order one page at a time using the token
+    loaded_records = []
+    next_token = None
+    while True:
+        page = local_cache.load_page(
+            StubDataclassRecord, after_key=next_token, limit=10, order=IndexSortOrderEnum.DESCENDING
+        )
+        loaded_records.extend(page.records)
+        if (next_token := page.next_token) is None:
+            break
+    assert loaded_records == sorted(records, key=lambda x: x.id, reverse=True)
+
+    # Start after a key object and load only the subtypes of the specified type
+    page = local_cache.load_page(StubDataclassDerivedRecord, after_key=StubDataclassRecordKey(id="id20"), limit=3)
+    assert [x.id for x in page.records] == ["id21", "id23"]
+    assert page.next_token is None
+
+
+def test_search():
+    """Test searching the records in memory."""
+
+    local_cache = LocalCache(db_id="temp;test_search")
+    records = [LogMessage(message=x, level="Info").init() for x in ["SOFR 3M", "Fixed rate", "sofr 3m compounded"]]
+    local_cache.save_many(records)
+    assert local_cache.search(LogMessage, "Sofr 3M") == [records[0], records[2]]
+    assert local_cache.search(LogMessage, "3m", limit=1) == [records[0]]
+    assert local_cache.search(LogMessage, "LIBOR") == []
+
+
+@pytest.mark.parametrize("eviction_policy", list(LocalCacheEvictionPolicyEnum))
+def test_eviction(eviction_policy: LocalCacheEvictionPolicyEnum):
+    """Test eviction when the number of records exceeds the limit."""
+
+    cache = LocalCache(db_id="temp;test_eviction", max_records=3, eviction_policy=eviction_policy)
+    records = [StubDataclassRecord(id=f"id{i}") for i in range(4)]
+    cache.save_many(records[:3])
+
+    # Access the first record twice and the second record once
+    cache.load_many(StubDataclassRecord, [records[0].get_key(), records[1].get_key(), records[0].get_key()])
+
+    # LRU evicts the least recently used record, LFU evicts the record with the fewest accesses
+    cache.save_one(records[3])
+    loaded_records = cache.load_many(StubDataclassRecord, [x.get_key() for x in records])
+    assert cache.get_record_count() == 3
+    assert loaded_records == [records[0], records[1], None, records[3]]
+
+    # Make the second record least recently used but more frequently used than the fourth record
+    cache.load_many(StubDataclassRecord, [records[1].get_key(), records[0].get_key(), records[3].get_key()])
+    cache.save_one(StubDataclassRecord(id="id4"))
+    loaded_records = cache.load_many(StubDataclassRecord, [x.get_key() for x in records])
+    if eviction_policy == LocalCacheEvictionPolicyEnum.LRU:
+        assert loaded_records == [records[0], None, None, records[3]]
+    else:
+        assert loaded_records == [records[0], records[1], None, None]
+
+    # Check counters, records passed instead of keys are not counted
+    stats = cache.get_stats()
+    assert stats.hits == 11
+    assert stats.misses == 3
+    assert stats.evictions == 2
+    assert stats.get_hit_ratio() == 11 / 14
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
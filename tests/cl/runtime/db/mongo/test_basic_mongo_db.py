@@ -13,13 +13,42 @@
 # limitations under the License.
 
 import pytest
+import mongomock
 from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.mongo import basic_mongo_db
 from cl.runtime.db.mongo.basic_mongo_db import BasicMongoDb
+from cl.runtime.log.log_message import LogMessage
 from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.schema.type_index_decl import TypeIndexDecl
 from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassSingleton
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_record import StubDataclassRecord
 
 
+@pytest.fixture
+def mongo_mock(monkeypatch):
+    """Use MongoMock client for the default client URI of BasicMongoDb."""
+
+    # PyMongo 4.11+ passes 'sort' to bulk replace which MongoMock does not accept, it is not used by BasicMongoDb
+    add_replace = mongomock.collection.BulkOperationBuilder.add_replace
+    monkeypatch.setattr(
+        mongomock.collection.BulkOperationBuilder,
+        "add_replace",
+        lambda self, *args, sort=None, **kwargs: add_replace(self, *args, **kwargs),
+    )
+
+    client_uri = BasicMongoDb(db_id="temp").client_uri
+    basic_mongo_db._client_dict[client_uri] = mongomock.MongoClient()
+    basic_mongo_db._db_dict.clear()
+    basic_mongo_db._indexed_collections.clear()
+    yield
+    basic_mongo_db._client_dict.pop(client_uri, None)
+    basic_mongo_db._db_dict.clear()
+    basic_mongo_db._indexed_collections.clear()
+
+
 @pytest.mark.skip("Requires MongoDB server.")  # TODO: Switch test to MongoMock
 def test_check_db_id():
     """Test '_get_db_name' method."""
@@ -108,5 +137,170 @@ def test_smoke():
         assert context.load_one(StubDataclassRecord, key) == record  # Not the same object but equal
 
 
+def test_load_many(mongo_mock):
+    """Test 'load_many' method."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        # Use small batch size to load keys from the same collection using several queries
+        context.db.load_batch_size = 2
+
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(5)]
+        singleton = StubDataclassSingleton()
+        context.save_many(records + [singleton])
+
+        # Records and None are returned without lookup, keys are loaded in input order, None for missing keys
+        missing_key = StubDataclassRecord(id="missing").get_key()
+        keys = [records[3].get_key(), singleton.get_key(), None, missing_key, records[0], records[1].get_key()]
+        loaded_records = context.load_many(StubDataclassRecord, keys)
+        assert loaded_records == [records[3], singleton, None, None, records[0], records[1]]
+        assert loaded_records[4] is records[0]
+
+        # Duplicate keys are loaded once and returned for each position
+        loaded_records = context.load_many(StubDataclassRecord, [x.get_key() for x in records] * 2)
+        assert loaded_records == records * 2
+
+
+def test_save_many_and_delete_many(mongo_mock):
+    """Test 'save_many' and 'delete_many' methods."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(5)]
+        singleton = StubDataclassSingleton()
+        context.save_many(records + [singleton])
+        assert context.load_many(StubDataclassRecord, [x.get_key() for x in records]) == records
+
+        # Saving again replaces existing documents instead of inserting duplicates
+        context.save_many(records)
+        collection = context.db._get_collection(StubDataclassRecord().get_key_type())
+        assert collection.count_documents({}) == len(records)
+
+        # Unique index on '_key' and index on '_type' are created on first write
+        index_info = collection.index_information()
+        assert index_info["_key_1"]["key"] == [("_key", 1)]
+        assert index_info["_key_1"]["unique"]
+        assert index_info["_type_1"]["key"] == [("_type", 1)]
+
+        # Delete several records using a single query, missing keys are ignored
+        missing_key = StubDataclassRecord(id="missing").get_key()
+        context.delete_many([records[0].get_key(), records[2].get_key(), missing_key])
+        loaded_records = context.load_many(StubDataclassRecord, [x.get_key() for x in records])
+        assert loaded_records == [None, records[1], None, records[3], records[4]]
+
+        # Version stamp is incremented by each save_many and delete_many
+        assert context.db.get_table_version(StubDataclassRecord.get_key_type()) == 3
+
+
+def test_exists_many_and_count(mongo_mock):
+    """Test 'exists_many' and 'count' methods."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        base_records = [StubDataclassRecord(id=f"base{i}") for i in range(3)]
+        derived_records = [StubDataclassDerivedRecord(id=f"a{i}", derived_str_field="a") for i in range(2)]
+        context.save_many(base_records + derived_records + [StubDataclassSingleton()])
+
+        missing_key = StubDataclassRecord(id="missing").get_key()
+        singleton_key = StubDataclassSingleton().get_key()
+        keys = [base_records[0].get_key(), missing_key, None, singleton_key, derived_records[1].get_key()]
+        assert context.exists_many(keys) == [True, False, False, True, True]
+
+        assert context.count(StubDataclassRecord) == 5
+        assert context.count(StubDataclassDerivedRecord) == 2
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_str_field="a")
+        assert context.count(StubDataclassDerivedRecord, filter_obj) == 2
+
+
+def test_load_page(mongo_mock):
+    """Test 'load_page' method."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassRecord(id=f"id{i:02}") for i in range(0, 25, 2)]
+        records += [StubDataclassDerivedRecord(id=f"id{i:02}") for i in range(1, 25, 2)]
+        context.save_many(records)
+
+        # Load all records one page at a time using the token
+        loaded_records = []
+        page = context.load_page(StubDataclassRecord, limit=10)
+        loaded_records.extend(page.records)
+        while page.next_token is not None:
+            page = context.load_page(StubDataclassRecord, after_key=page.next_token, limit=10)
+            loaded_records.extend(page.records)
+        assert loaded_records == sorted(records, key=lambda x: x.id)
+
+        # Descending order and subtypes of the specified type only
+        page = context.load_page(StubDataclassDerivedRecord, limit=2, order=IndexSortOrderEnum.DESCENDING)
+        assert [x.id for x in page.records] == ["id23", "id21"]
+        assert page.next_token is not None
+
+
+def test_create_index(mongo_mock):
+    """Test 'create_index' method."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        index_decl = TypeIndexDecl(
+            name="derived_field_index",
+            elements=[IndexDecl(name="derived_str_field", direction=IndexSortOrderEnum.DESCENDING)],
+        )
+        context.db.create_index(StubDataclassDerivedRecord, index_decl)
+
+        # Creating the same index again has no effect
+        context.db.create_index(StubDataclassDerivedRecord, index_decl)
+        collection = context.db._get_collection(StubDataclassDerivedRecord.get_key_type())
+        index_info = collection.index_information()
+        assert index_info["derived_field_index"]["key"] == [("derived_str_field", -1)]
+        assert "_key_1" in index_info
+
+
+def test_search_index(mongo_mock):
+    """Test creating text index on the search fields."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        context.save_one(LogMessage(message="SOFR 3M", level="Info"))
+        collection = context.db._get_collection(LogMessage.get_key_type())
+        index_info = collection.index_information()
+        assert "_search" in index_info
+
+
+def test_compression(mongo_mock):
+    """Test compression of large field values."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        large_str = "Rate is SOFR 3M plus spread. " * 1000
+        record = StubDataclassDerivedRecord(derived_str_field=large_str)
+        context.save_one(record)
+        assert context.load_one(StubDataclassDerivedRecord, record.get_key()) == record
+        assert context.load_all(StubDataclassDerivedRecord) == [record]
+        filter_obj = StubDataclassDerivedRecord(derived_str_field=large_str)
+        assert context.db.load_filter(StubDataclassDerivedRecord, filter_obj) == [record]
+        assert context.db.count(StubDataclassDerivedRecord, filter_obj) == 1
+
+        # Large values are stored as compressed binary except for the search fields
+        collection = context.db._get_collection(StubDataclassDerivedRecord.get_key_type())
+        document = collection.find_one({})
+        assert isinstance(document["derived_str_field"], bytes)
+        assert len(document["derived_str_field"]) < len(large_str) / 10
+        context.save_one(LogMessage(message=large_str, level="Info"))
+        collection = context.db._get_collection(LogMessage.get_key_type())
+        assert collection.find_one({})["message"] == large_str
+
+
+@pytest.mark.skip("Requires MongoDB server.")  # TODO: Switch test to MongoMock when it supports text search
+def test_search():
+    """Test 'search' method."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [LogMessage(message=x, level="Info") for x in ["SOFR 3M", "Fixed rate", "sofr 3m compounded"]]
+        context.save_many(records)
+        assert context.search(LogMessage, "SOFR 3m") == sorted([records[0], records[2]], key=lambda x: x.timestamp)
+        assert context.search(LogMessage, "LIBOR") == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,133 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import fakeredis
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.redis import redis_db
+from cl.runtime.db.redis.redis_db import RedisDb
+from cl.runtime.records.class_info import ClassInfo
+from stubs.cl.runtime import StubDataclassComposite
+from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassDictFields
+from stubs.cl.runtime import StubDataclassDictListFields
+from stubs.cl.runtime import StubDataclassListDictFields
+from stubs.cl.runtime import StubDataclassListFields
+from stubs.cl.runtime import StubDataclassNestedFields
+from stubs.cl.runtime import StubDataclassOptionalFields
+from stubs.cl.runtime import StubDataclassOtherDerivedRecord
+from stubs.cl.runtime import StubDataclassPrimitiveFields
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassRecordKey
+from stubs.cl.runtime import StubDataclassSingleton
+
+
+@pytest.fixture
+def redis_mock():
+    """Use FakeRedis client for the default client URI of RedisDb."""
+    client_uri = RedisDb(db_id="temp").client_uri
+    redis_db._client_dict[client_uri] = fakeredis.FakeRedis()
+    yield
+    redis_db._client_dict.pop(client_uri, None)
+
+
+def test_complex_records(redis_mock):
+    """Test save and load for records with fields of all supported types."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        samples = [
+            StubDataclassRecord(id="abc1"),
+            StubDataclassNestedFields(id="abc2"),
+            StubDataclassComposite(),
+            StubDataclassDerivedRecord(id="abc3"),
+            StubDataclassDerivedFromDerivedRecord(id="abc4"),
+            StubDataclassOtherDerivedRecord(id="abc5"),
+            StubDataclassListFields(id="abc6"),
+            StubDataclassOptionalFields(id="abc7"),
+            StubDataclassDictFields(id="abc8"),
+            StubDataclassDictListFields(id="abc9"),
+            StubDataclassListDictFields(id="abc10"),
+            StubDataclassPrimitiveFields(key_str_field="abc11"),
+            StubDataclassSingleton(),
+        ]
+        context.save_many(samples)
+
+        # Load records of several types using a single call, records and None are returned without lookup
+        sample_keys = [sample.get_key() for sample in samples]
+        missing_key = StubDataclassRecordKey(id="missing")
+        loaded_records = context.load_many(StubDataclassRecord, sample_keys + [missing_key, None, samples[0]])
+        assert loaded_records == samples + [None, None, samples[0]]
+        assert loaded_records[-1] is samples[0]
+
+
+def test_load_all_and_load_filter(redis_mock):
+    """Test 'load_all' and 'load_filter' methods."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        # Use small batch size to load records using several commands
+        context.db.batch_size = 2
+
+        base_records = [StubDataclassRecord(id=f"base{i}") for i in reversed(range(3))]
+        derived_records = [StubDataclassDerivedRecord(id=f"derived{i}", derived_str_field=f"{i % 2}") for i in range(3)]
+        context.save_many(derived_records + base_records)
+
+        # Records are loaded in key order, records of other types in the same table are excluded
+        assert context.load_all(StubDataclassRecord) == list(reversed(base_records)) + derived_records
+        assert context.load_all(StubDataclassDerivedRecord) == derived_records
+
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_str_field="0")
+        assert context.load_filter(StubDataclassDerivedRecord, filter_obj) == [derived_records[0], derived_records[2]]
+
+
+def test_delete(redis_mock):
+    """Test delete methods, table version and dropping the database."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+        context.save_many(records)
+        context.delete_one(StubDataclassRecordKey, records[0].get_key())
+        context.delete_many([x.get_key() for x in records[1:]])
+        assert context.load_many(StubDataclassRecord, [x.get_key() for x in records]) == [None, None, None]
+        assert context.load_all(StubDataclassRecord) == []
+        assert context.db.get_table_version(StubDataclassRecordKey) == 3
+
+        # Other databases on the same server are not affected when the database is dropped
+        other_db = RedisDb(db_id="temp;other")
+        other_db.save_one(records[0])
+        context.db.delete_all_and_drop_db()
+        assert context.db.get_table_version(StubDataclassRecordKey) == 0
+        assert other_db.load_all(StubDataclassRecord) == [records[0]]
+        other_db.delete_all_and_drop_db()
+
+
+def test_exists_many(redis_mock):
+    """Test 'exists_many' method."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassRecord(id="abc1"), StubDataclassDerivedRecord(id="abc2"), StubDataclassSingleton()]
+        context.save_many(records)
+
+        keys = [x.get_key() for x in records] + [StubDataclassRecordKey(id="missing"), None]
+        assert context.exists_many(keys) == [True, True, True, False, False]
+        context.delete_many([records[0].get_key()])
+        assert context.exists_many(keys) == [False, True, True, False, False]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
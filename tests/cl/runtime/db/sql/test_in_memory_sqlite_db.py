@@ -0,0 +1,91 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import os
+from concurrent.futures import ThreadPoolExecutor
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.sql.in_memory_sqlite_db import InMemorySqliteDb
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.records.class_info import ClassInfo
+from stubs.cl.runtime import StubDataclassRecord
+
+
+def test_smoke():
+    """Test sharing, backup, and deletion of in-memory database."""
+
+    db_class = ClassInfo.get_class_path(InMemorySqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        record = StubDataclassRecord(id="abc")
+        context.save_one(record)
+
+        # Data is shared by instances with the same db_id and is not written to disk
+        db = InMemorySqliteDb(db_id=context.db.db_id)
+        assert db.load_one(StubDataclassRecord, record.get_key()) == record
+        file_db = SqliteDb(db_id=context.db.db_id)
+        assert not os.path.exists(file_db._get_db_file())  # noqa
+
+        # Backup is saved to the file used by SqliteDb with the same db_id
+        file_path = db.backup_to_file()
+        try:
+            assert file_db.load_one(StubDataclassRecord, record.get_key()) == record
+        finally:
+            file_db.delete_all_and_drop_db()
+        assert not os.path.exists(file_path)
+
+        # Data is discarded when the connections are closed
+        db.close_connection()
+        assert db.is_empty()
+
+
+def test_backup_on_error():
+    """Test saving the database to disk when a test fails."""
+
+    db_class = ClassInfo.get_class_path(InMemorySqliteDb)
+    record = StubDataclassRecord(id="abc")
+    with pytest.raises(RuntimeError):
+        with TestingContext(db_class=db_class) as context:
+            context.save_one(record)
+            raise RuntimeError("Test failure.")
+
+    file_db = SqliteDb(db_id=context.db.db_id)
+    try:
+        assert file_db.load_one(StubDataclassRecord, record.get_key()) == record
+    finally:
+        file_db.delete_all_and_drop_db()
+
+
+def test_concurrent_write():
+    """Test saving and loading records from several threads, each with its own connection."""
+
+    db_class = ClassInfo.get_class_path(InMemorySqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        db = context.db
+
+        def save_and_load(thread_index: int):
+            # Each thread writes its own records and reads all records concurrently with other threads
+            samples = [StubDataclassRecord(id=f"thread{thread_index}_{i}") for i in range(50)]
+            for sample in samples:
+                db.save_one(sample)
+                list(db.load_all(StubDataclassRecord))
+            db.save_many(samples)
+            assert list(db.load_many(StubDataclassRecord, [x.get_key() for x in samples])) == samples
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(save_and_load, range(8)))
+        assert len(list(db.load_all(StubDataclassRecord))) == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,76 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import os
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.sql.sharded_sqlite_db import ShardedSqliteDb
+from cl.runtime.log.log_message import LogMessage
+from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.settings.project_settings import ProjectSettings
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassSingleton
+
+
+def test_smoke():
+    """Test saving, loading, and deleting records stored in different shards."""
+
+    db_class = ClassInfo.get_class_path(ShardedSqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassRecord(id="abc"), StubDataclassDerivedRecord(id="def"), StubDataclassSingleton()]
+        context.save_many(records)
+        keys = [x.get_key() for x in records]
+
+        # Each key type is stored in a separate file
+        db_dir = ProjectSettings.get_databases_dir()
+        for shard_name in ["StubDataclassRecordKey", "StubDataclassSingletonKey"]:
+            assert os.path.exists(os.path.join(db_dir, f"{context.db.db_id}.{shard_name}.sqlite"))
+
+        # Methods that access more than one shard
+        assert context.exists_many([keys[0], None, keys[2]]) == [True, False, True]
+        context.delete_many([keys[1], keys[2]])
+        assert context.exists_many(keys) == [True, False, False]
+
+        # Methods that access one shard
+        assert context.load_many(StubDataclassRecord, [keys[0], None, keys[1]]) == [records[0], None, None]
+        assert list(context.load_all(StubDataclassRecord)) == [records[0]]
+        assert context.count(StubDataclassRecord) == 1
+        assert context.db.get_table_version(StubDataclassRecord.get_key_type()) == 2
+        assert not context.db.is_empty()
+
+    # Files of all shards are deleted on exit from the testing context
+    assert not ShardedSqliteDb(db_id=context.db.db_id)._get_existing_shard_db_ids()  # noqa
+
+
+def test_shard_names():
+    """Test storing the tables for several key types in the same shard."""
+
+    db_class = ClassInfo.get_class_path(ShardedSqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        db = ShardedSqliteDb(
+            db_id=context.db.db_id,
+            shard_names={"StubDataclassRecordKey": "main", "StubDataclassSingletonKey": "main"},
+        )
+        db.save_many([StubDataclassRecord(), StubDataclassSingleton(), LogMessage(message="Message").init()])
+        assert db._get_existing_shard_db_ids() == [  # noqa
+            f"{context.db.db_id}.LogMessageKey",
+            f"{context.db.db_id}.main",
+        ]
+        assert db.count(StubDataclassSingleton) == 1
+        db.close_connection()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
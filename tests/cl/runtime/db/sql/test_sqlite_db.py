@@ -13,12 +13,20 @@
 # limitations under the License.
 
 import pytest
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Iterable
 from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.sql.sqlite_connection_pool import SqliteConnectionPool
 from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.db.sql.sqlite_db import dict_factory
+from cl.runtime.db.sql.sqlite_schema_manager import SqliteSchemaManager
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.log.log_message import LogMessage
 from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from stubs.cl.runtime import StubDataclassComposite
 from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
 from stubs.cl.runtime import StubDataclassDerivedRecord
@@ -31,6 +39,7 @@ from stubs.cl.runtime import StubDataclassOptionalFields
 from stubs.cl.runtime import StubDataclassOtherDerivedRecord
 from stubs.cl.runtime import StubDataclassPrimitiveFields
 from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassRecordKey
 from stubs.cl.runtime import StubDataclassSingleton
 
 
@@ -86,6 +95,48 @@ def test_complex_records():
         assert loaded_records == samples
 
 
+def test_typed_columns():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        context.db.typed_columns = True
+        samples = [
+            StubDataclassRecord(id="abc1"),
+            StubDataclassNestedFields(id="abc2"),
+            StubDataclassComposite(),
+            StubDataclassDerivedRecord(id="abc3"),
+            StubDataclassDerivedFromDerivedRecord(id="abc4"),
+            StubDataclassOtherDerivedRecord(id="abc5"),
+            StubDataclassListFields(id="abc6"),
+            StubDataclassOptionalFields(id="abc7"),
+            StubDataclassDictFields(id="abc8"),
+            StubDataclassDictListFields(id="abc9"),
+            StubDataclassListDictFields(id="abc10"),
+            StubDataclassPrimitiveFields(key_str_field="abc11"),
+            StubDataclassSingleton(),
+        ]
+        context.save_many(samples)
+
+        sample_keys = [sample.get_key() for sample in samples]
+        loaded_records = [context.load_one(type(key), key) for key in sample_keys]
+        assert loaded_records == samples
+
+        # Only the columns for the requested type hierarchy are selected
+        loaded_records = list(context.load_all(StubDataclassDerivedRecord))
+        assert loaded_records == [samples[3], samples[4]]
+
+        # Filter by embedded key stored in a typed column
+        filter_obj = StubDataclassComposite(primitive=None, embedded_1=samples[2].embedded_1, embedded_2=None)
+        assert list(context.load_filter(StubDataclassComposite, filter_obj)) == [samples[2]]
+
+        # Primitive columns have SQL types
+        cursor = context.db._get_connection().cursor()
+        cursor.execute('PRAGMA table_info("StubDataclassPrimitiveFieldsKey");')
+        column_types = {x["name"]: x["type"] for x in cursor.fetchall()}
+        assert column_types["StubDataclassPrimitiveFields.obj_date_field"] == "INTEGER"
+        assert column_types["StubDataclassPrimitiveFields.obj_float_field"] == "REAL"
+        assert column_types["_data"] == "BLOB"
+
+
 def test_basic_operations():
     db_class = ClassInfo.get_class_path(SqliteDb)
     with TestingContext(db_class=db_class) as context:
@@ -178,6 +229,157 @@ def test_load_all():
         assert _assert_equals_iterable_without_ordering(derived_samples, loaded_records)
 
 
+def test_load_all_order():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Use small fetch size to read the result in several chunks
+        context.db.fetch_size = 2
+
+        samples = [StubDataclassRecord(id=f"id{i}") for i in reversed(range(5))]
+        context.save_many(samples)
+
+        # Records are sorted by key on the database side
+        loaded_records = list(context.load_all(StubDataclassRecord))
+        assert loaded_records == sorted(samples, key=lambda x: x.id)
+
+
+def test_save_many_in_chunks():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Use small batch size to write full chunks and the remaining rows by separate statements
+        context.db.save_batch_size = 3
+
+        samples = [StubDataclassRecord(id=f"id{i}") for i in range(10)] + [StubDataclassSingleton()]
+        context.save_many(samples)
+        assert list(context.load_all(StubDataclassRecord)) == samples[:-1]
+        assert list(context.load_all(StubDataclassSingleton)) == samples[-1:]
+
+        # Delete also splits keys into chunks
+        context.delete_many([x.get_key() for x in samples[:7]])
+        assert list(context.load_all(StubDataclassRecord)) == samples[7:-1]
+
+
+def test_metadata_cache():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        sample = StubDataclassRecord()
+        context.save_one(sample)
+
+        # Steady-state load runs a single statement without catalog queries
+        statements = []
+        context.db._get_connection().set_trace_callback(statements.append)
+        assert context.load_one(StubDataclassRecord, sample.get_key()) == sample
+        context.db._get_connection().set_trace_callback(None)
+        assert len(statements) == 1
+        assert statements[0].startswith("SELECT")
+
+        # Columns are added to an existing table using ALTER TABLE
+        schema_manager = context.db._get_schema_manager()
+        schema_manager.create_table("StubTable", ["a"])
+        schema_manager.create_table("StubTable", ["a", "b"])
+        cursor = context.db._get_connection().cursor()
+        cursor.execute('PRAGMA table_info("StubTable");')
+        assert [x["name"] for x in cursor.fetchall()] == ["a", "b"]
+
+        # Cache is updated when table is deleted
+        schema_manager.delete_table_by_name("StubTable")
+        assert not schema_manager.table_exists("StubTable")
+
+
+def test_columns_added_by_other_process():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        base_record = StubDataclassRecord(id="base")
+        context.save_one(base_record)
+
+        # Drop the column for a derived field to get a table created by code without the derived type
+        schema_manager = context.db._get_schema_manager()
+        table_name = schema_manager.table_name_for_type(StubDataclassRecord)
+        column = schema_manager.get_columns_mapping(StubDataclassRecordKey)["derived_str_field"]
+        context.db._get_connection().execute(f'ALTER TABLE "{table_name}" DROP COLUMN "{column}";')
+        schema_manager.invalidate_cache()
+        assert list(context.load_all(StubDataclassRecord)) == [base_record]
+        assert column not in schema_manager.get_select_columns(table_name, StubDataclassRecord)
+
+        # Another process adds the column, it is selected without invalidating the cache in this process
+        other_pool = SqliteConnectionPool(db_file=context.db._get_db_file(), row_factory=dict_factory)
+        try:
+            SqliteSchemaManager(connection_pool=other_pool).create_table(table_name, [column])
+        finally:
+            other_pool.close_all()
+        assert column in schema_manager.get_select_columns(table_name, StubDataclassRecord)
+
+        # Saving a derived record does not add the column again
+        derived_record = StubDataclassDerivedRecord(id="derived", derived_str_field="abc")
+        context.save_one(derived_record)
+        assert list(context.load_all(StubDataclassRecord)) == [base_record, derived_record]
+
+
+def test_load_filter():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        matching_records = [StubDataclassDerivedRecord(id=f"a{i}", derived_str_field="a") for i in range(2)]
+        non_matching_records = [StubDataclassDerivedRecord(id=f"b{i}", derived_str_field="b") for i in range(2)]
+        context.save_many(non_matching_records + matching_records)
+
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_str_field="a")
+        loaded_records = list(context.load_filter(StubDataclassDerivedRecord, filter_obj))
+        assert loaded_records == matching_records
+
+        # Filter by embedded key
+        composite_samples = [
+            StubDataclassComposite(primitive="abc1", embedded_1=StubDataclassRecordKey(id="x")),
+            StubDataclassComposite(primitive="abc2", embedded_1=StubDataclassRecordKey(id="y")),
+        ]
+        context.save_many(composite_samples)
+        filter_obj = StubDataclassComposite(primitive=None, embedded_1=StubDataclassRecordKey(id="y"), embedded_2=None)
+        loaded_records = list(context.load_filter(StubDataclassComposite, filter_obj))
+        assert loaded_records == composite_samples[1:]
+
+
+def test_load_filter_auto_index():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        context.save_many([StubDataclassDerivedRecord(id=f"id{i}", derived_str_field=f"{i % 2}") for i in range(4)])
+
+        def get_index_names():
+            cursor = context.db._get_connection().cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index';")
+            return [x["name"] for x in cursor.fetchall()]
+
+        # Index is created when the same filter fields are queried repeatedly
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_str_field="0")
+        list(context.load_filter(StubDataclassDerivedRecord, filter_obj))
+        assert "StubDataclassRecordKey_derived_str_field_index" not in get_index_names()
+        list(context.load_filter(StubDataclassDerivedRecord, filter_obj))
+        assert "StubDataclassRecordKey_derived_str_field_index" in get_index_names()
+
+
+def test_concurrent_threads():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        db = context.db
+
+        # WAL journal mode is applied from settings
+        assert db._get_connection().execute("PRAGMA journal_mode;").fetchone()["journal_mode"] == "wal"
+
+        def save_and_load(thread_index: int):
+            # Each thread writes its own records and reads all records concurrently with other threads
+            samples = [StubDataclassRecord(id=f"thread{thread_index}_{i}") for i in range(10)]
+            for sample in samples:
+                db.save_one(sample)
+                list(db.load_all(StubDataclassRecord))
+            assert list(db.load_many(StubDataclassRecord, [x.get_key() for x in samples])) == samples
+            return db._get_connection()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            connections = list(executor.map(save_and_load, range(4)))
+
+        # Each thread uses its own connection
+        assert len(set(id(x) for x in connections)) == 4
+        assert len(list(db.load_all(StubDataclassRecord))) == 40
+
+
 @pytest.mark.skip("Performance test.")
 def test_performance():
     db_class = ClassInfo.get_class_path(SqliteDb)
@@ -226,5 +428,255 @@ def test_singleton():
         assert all_records[0] == other_singleton_sample
 
 
+def test_datasets():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        root_records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+        override = StubDataclassDerivedRecord(id="id1", derived_str_field="override")
+        child_record = StubDataclassRecord(id="id3")
+        context.save_many(root_records)
+        context.save_one(override, dataset="\\a")
+        context.save_one(child_record, dataset="\\a\\b")
+
+        # The most specific dataset in the lookup list is used for each key
+        keys = [StubDataclassRecordKey(id=f"id{i}") for i in range(4)]
+        assert list(context.load_many(StubDataclassRecord, keys)) == root_records + [None]
+        assert list(context.load_many(StubDataclassRecord, keys, dataset="\\a")) == [
+            root_records[0],
+            override,
+            root_records[2],
+            None,
+        ]
+        expected_records = [root_records[0], override, root_records[2], child_record]
+        assert list(context.load_many(StubDataclassRecord, keys, dataset="\\a\\b")) == expected_records
+        assert list(context.load_all(StubDataclassRecord, dataset="\\a\\b")) == expected_records
+        assert list(context.load_all(StubDataclassDerivedRecord, dataset="\\a")) == [override]
+        assert list(context.load_all(StubDataclassDerivedRecord)) == []
+
+        # Filter is applied to the most specific version of each record
+        filter_obj = StubDataclassRecord(id="id1")
+        assert list(context.load_filter(StubDataclassRecord, filter_obj)) == [root_records[1]]
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_str_field="override")
+        assert list(context.load_filter(StubDataclassDerivedRecord, filter_obj, dataset="\\a\\b")) == [override]
+
+        # Singletons are stored once per dataset
+        context.save_one(StubDataclassSingleton(str_field="root"))
+        context.save_one(StubDataclassSingleton(str_field="child"), dataset="\\a")
+        singleton_key = StubDataclassSingleton().get_key()
+        assert context.load_one(StubDataclassSingleton, singleton_key).str_field == "root"
+        assert context.load_one(StubDataclassSingleton, singleton_key, dataset="\\a\\b").str_field == "child"
+
+        # Deleting a record in the child dataset makes the record in the parent dataset visible
+        context.delete_many([override.get_key(), singleton_key], dataset="\\a")
+        assert context.load_one(StubDataclassRecord, override.get_key(), dataset="\\a") == root_records[1]
+        assert context.load_one(StubDataclassSingleton, singleton_key, dataset="\\a").str_field == "root"
+
+
+def test_table_without_dataset_column():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Create table in the format used before the dataset column was added
+        connection = context.db._get_connection()
+        with connection:
+            connection.execute('CREATE TABLE "StubDataclassRecordKey" ("_type", "StubDataclassRecordKey.id");')
+            connection.execute(
+                'CREATE UNIQUE INDEX "StubDataclassRecordKey_key_index" '
+                'ON "StubDataclassRecordKey" ("StubDataclassRecordKey.id");'
+            )
+            connection.execute('INSERT INTO "StubDataclassRecordKey" VALUES ("StubDataclassRecord", "abc");')
+
+        # Existing rows are in the root dataset, the unique index is recreated to include the dataset column
+        record = StubDataclassRecord(id="abc")
+        child_record = StubDataclassDerivedRecord(id="abc")
+        context.save_one(child_record, dataset="\\a")
+        assert context.load_one(StubDataclassRecord, record.get_key()) == record
+        assert context.load_one(StubDataclassRecord, record.get_key(), dataset="\\a") == child_record
+
+
+@pytest.mark.parametrize("typed_columns", [False, True])
+def test_load_page(typed_columns: bool):
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        db = SqliteDb(db_id=context.db.db_id, typed_columns=typed_columns)
+        records = [StubDataclassRecord(id=f"id{i:02}") for i in range(0, 25, 2)]
+        records += [StubDataclassDerivedRecord(id=f"id{i:02}") for i in range(1, 25, 2)]
+        db.save_many(records)
+        sorted_records = sorted(records, key=lambda x: x.id)
+
+        # Load all records one page at a time using the token
+        loaded_records = []
+        page = db.load_page(StubDataclassRecord, limit=10)
+        loaded_records.extend(page.records)
+        while page.next_token is not None:
+            assert len(page.records) == 10
+            page = db.load_page(StubDataclassRecord, after_key=page.next_token, limit=10)
+            loaded_records.extend(page.records)
+        assert loaded_records == sorted_records
+
+        # Descending order starting after a key object, only subtypes of the specified type are loaded
+        page = db.load_page(
+            StubDataclassDerivedRecord,
+            after_key=StubDataclassRecordKey(id="id20"),
+            limit=3,
+            order=IndexSortOrderEnum.DESCENDING,
+        )
+        assert [x.id for x in page.records] == ["id19", "id17", "id15"]
+
+        # Override in the child dataset is visible on the page of the child dataset only
+        override = StubDataclassDerivedRecord(id="id00", derived_str_field="override")
+        db.save_one(override, dataset="child")
+        assert db.load_page(StubDataclassRecord, limit=1, dataset="child").records == [override]
+        assert db.load_page(StubDataclassRecord, limit=1).records == [sorted_records[0]]
+
+        # Page of an empty table
+        page = db.load_page(StubDataclassSingleton, limit=10)
+        assert page.records == []
+        assert page.next_token is None
+
+
+@pytest.mark.parametrize("typed_columns", [False, True])
+def test_exists_many_and_count(typed_columns: bool):
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        db = SqliteDb(db_id=context.db.db_id, typed_columns=typed_columns)
+        base_records = [StubDataclassRecord(id=f"base{i}") for i in range(3)]
+        derived_records = [StubDataclassDerivedRecord(id=f"a{i}", derived_str_field="a") for i in range(2)]
+        db.save_many(base_records + derived_records)
+
+        # Keys of several types including missing keys and None
+        missing_key = StubDataclassRecordKey(id="missing")
+        singleton_key = StubDataclassSingleton().get_key()
+        keys = [base_records[0].get_key(), missing_key, None, singleton_key, derived_records[1].get_key()]
+        assert db.exists_many(keys) == [True, False, False, False, True]
+        db.save_one(StubDataclassSingleton())
+        assert db.exists_many(keys) == [True, False, False, True, True]
+
+        # Count records of a type and its subtypes, with and without filter
+        assert db.count(StubDataclassRecord) == 5
+        assert db.count(StubDataclassDerivedRecord) == 2
+        assert db.count(StubDataclassDerivedRecord, StubDataclassDerivedRecord(id=None, derived_str_field="a")) == 2
+        assert db.count(StubDataclassDerivedRecord, StubDataclassDerivedRecord(id=None, derived_str_field="b")) == 0
+        assert db.count(StubDataclassComposite) == 0
+
+        # Records in the parent dataset are visible in the child dataset but not the other way around
+        child_record = StubDataclassRecord(id="child")
+        db.save_one(child_record, dataset="child")
+        db.save_one(StubDataclassDerivedRecord(id="base0"), dataset="child")
+        assert db.exists_many([child_record.get_key(), missing_key], dataset="child") == [True, False]
+        assert db.exists_many([child_record.get_key()]) == [False]
+        assert db.count(StubDataclassRecord, dataset="child") == 6
+        assert db.count(StubDataclassDerivedRecord, dataset="child") == 3
+        assert db.count(StubDataclassRecord) == 5
+
+
+@pytest.mark.parametrize("typed_columns", [False, True])
+def test_search(typed_columns: bool):
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        db = SqliteDb(db_id=context.db.db_id, typed_columns=typed_columns)
+        messages = ["Rate is SOFR 3M plus spread", "Fixed rate", "sofr 3m compounded", "Notional 100% in USD_LIBOR"]
+        records = [LogMessage(message=x, level="Info") for x in messages]
+        db.save_many(records)
+        sorted_records = sorted(records, key=lambda x: x.timestamp)
+
+        # Case-insensitive substring search using the index, and using LIKE for the queries shorter than three symbols
+        assert db.search(LogMessage, "SOFR 3m") == [x for x in sorted_records if "sofr 3m" in x.message.lower()]
+        assert db.search(LogMessage, "3m", limit=1) == [x for x in sorted_records if "3m" in x.message.lower()][:1]
+        assert db.search(LogMessage, "0%") == [records[3]]
+        assert db.search(LogMessage, "D_L") == [records[3]]
+        assert db.search(LogMessage, "D_") == [records[3]]
+        assert db.search(LogMessage, "LIBOR 3M") == []
+
+        # Index is updated when a record is replaced or deleted
+        db.save_one(LogMessage(timestamp=records[1].timestamp, message="Fixed rate vs SOFR 3M", level="Info"))
+        assert len(db.search(LogMessage, "SOFR 3m")) == 3
+        db.delete_many([records[0].get_key(), records[2].get_key()])
+        assert [x.message for x in db.search(LogMessage, "SOFR 3m")] == ["Fixed rate vs SOFR 3M"]
+        assert db.search(LogMessage, "Fixed") == db.search(LogMessage, "FIXED")
+
+        # Record in the child dataset replaces the parent record which matches the query
+        db.save_one(LogMessage(timestamp=records[1].timestamp, message="Fixed rate", level="Info"), dataset="child")
+        assert db.search(LogMessage, "SOFR", dataset="child") == []
+        assert len(db.search(LogMessage, "SOFR")) == 1
+
+        # Records saved before the search table is created are indexed when it is created
+        schema_manager = db._get_schema_manager()  # noqa
+        schema_manager.update_search_table("LogMessageKey", [])
+        schema_manager.invalidate_cache()
+        assert len(db.search(LogMessage, "SOFR")) == 1
+
+        # Search fields must be specified for the type
+        with pytest.raises(UserError):
+            db.search(StubDataclassRecord, "abc")
+
+
+@pytest.mark.parametrize("typed_columns", [False, True])
+def test_compression(typed_columns: bool):
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        db = SqliteDb(db_id=context.db.db_id, typed_columns=typed_columns)
+        large_str = "Rate is SOFR 3M plus spread. " * 1000
+        large_bytes = bytes(range(256)) * 100
+        record = StubDataclassPrimitiveFields(obj_str_field=large_str, obj_bytes_field=large_bytes)
+        db.save_one(record)
+        assert db.load_one(StubDataclassPrimitiveFields, record.get_key()) == record
+        assert list(db.load_all(StubDataclassPrimitiveFields)) == [record]
+        filter_obj = StubDataclassPrimitiveFields(obj_str_field=large_str, obj_bytes_field=large_bytes)
+        assert list(db.load_filter(StubDataclassPrimitiveFields, filter_obj)) == [record]
+
+        # Large values are stored as compressed binary
+        columns_mapping = db._get_schema_manager().get_columns_mapping(record.get_key_type())  # noqa
+        str_column, bytes_column = columns_mapping["obj_str_field"], columns_mapping["obj_bytes_field"]
+        cursor = db._get_connection().cursor()  # noqa
+        cursor.execute(f'SELECT "{str_column}", "{bytes_column}" FROM "StubDataclassPrimitiveFieldsKey";')
+        row = cursor.fetchone()
+        assert isinstance(row[str_column], bytes) and len(row[str_column]) < len(large_str) / 10
+        assert isinstance(row[bytes_column], bytes) and len(row[bytes_column]) < len(large_bytes) / 10
+
+        # Small binary values are stored as BLOB without base64 encoding
+        small_record = StubDataclassPrimitiveFields(key_str_field="small", obj_bytes_field=bytes([1, 2, 3]))
+        db.save_one(small_record)
+        cursor.execute(
+            f'SELECT "{bytes_column}" FROM "StubDataclassPrimitiveFieldsKey" WHERE "{bytes_column}" = ?;',
+            (bytes([1, 2, 3]),),
+        )
+        assert cursor.fetchone()[bytes_column] == bytes([1, 2, 3])
+        assert db.load_one(StubDataclassPrimitiveFields, small_record.get_key()) == small_record
+
+        # Search fields are not compressed so that the search table triggers do not depend on custom SQL functions
+        message = LogMessage(message=large_str + "Fixed rate", level="Info")
+        db.save_one(message)
+        assert db.search(LogMessage, "fixed rate") == [message]
+        message_column = db._get_schema_manager().get_columns_mapping(LogMessage.get_key_type())["message"]  # noqa
+        cursor.execute(f'SELECT "{message_column}" FROM "LogMessageKey";')
+        assert cursor.fetchone()[message_column] == message.message
+
+
+def test_async_methods():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassRecord(id=f"abc{i}") for i in range(10)]
+        keys = [x.get_key() for x in records]
+
+        async def run_concurrently():
+            # Save and load using the async methods, the current context remains visible inside the executor
+            await context.asave_many(records)
+            loaded_one = await context.aload_one(StubDataclassRecord, keys[0])
+            loaded_many = await asyncio.gather(*[context.aload_many(StubDataclassRecord, keys) for _ in range(10)])
+            loaded_all = await context.aload_all(StubDataclassRecord)
+            await context.adelete_many(keys[:5])
+            loaded_after_delete = await context.aload_many(StubDataclassRecord, keys)
+            return loaded_one, loaded_many, loaded_all, loaded_after_delete
+
+        loaded_one, loaded_many, loaded_all, loaded_after_delete = asyncio.run(run_concurrently())
+        assert loaded_one == records[0]
+        assert all(x == records for x in loaded_many)
+        assert sorted(loaded_all, key=lambda x: x.id) == sorted(records, key=lambda x: x.id)
+        assert loaded_after_delete == [None] * 5 + records[5:]
+
+        # Async methods use the dedicated executor of the database
+        assert isinstance(context.db.get_executor(), ThreadPoolExecutor)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,67 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import os
+from cl.runtime.db.compression_util import CompressionUtil
+from cl.runtime.db.compression_util import compressed_value_prefix
+from cl.runtime.settings.compression_settings import CompressionSettings
+
+
+@pytest.mark.parametrize("codec", ["zstd", "zlib", "none"])
+def test_roundtrip(monkeypatch, codec: str):
+    """Test compressing and restoring values using each codec."""
+
+    compression_settings = CompressionSettings(codec=codec, threshold=100).init()
+    monkeypatch.setattr(CompressionSettings, "instance", classmethod(lambda cls: compression_settings))
+
+    large_str = "Rate is SOFR 3M plus spread, " * 100
+    large_bytes = bytes(range(256)) * 10
+    for value in [large_str, large_bytes]:
+        compressed_value = CompressionUtil.compress_value(value)
+        if codec == "none":
+            assert compressed_value is value
+        else:
+            assert isinstance(compressed_value, bytes)
+            assert len(compressed_value) < len(value)
+        assert CompressionUtil.decompress_value(compressed_value) == value
+
+    # Values below the threshold, values that do not compress, and other types are not modified
+    random_bytes = os.urandom(1000)
+    for value in ["abc", b"abc", random_bytes, 12345, None]:
+        assert CompressionUtil.compress_value(value) is value
+
+    # Values stored without compression are read unchanged
+    for value in [large_str, large_bytes, b"\x89PNG"]:
+        assert CompressionUtil.decompress_value(value) is value
+
+    # Binary value starting with the prefix is stored with a header to avoid ambiguity
+    value = compressed_value_prefix + b"abc"
+    compressed_value = CompressionUtil.compress_value(value)
+    assert compressed_value != value
+    assert CompressionUtil.decompress_value(compressed_value) == value
+
+
+def test_settings():
+    """Test validation of compression settings."""
+
+    assert CompressionSettings(codec="ZLIB").init().codec == "zlib"
+    with pytest.raises(RuntimeError):
+        CompressionSettings(codec="gzip").init()
+    with pytest.raises(RuntimeError):
+        CompressionSettings(threshold=0).init()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,104 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import time
+from cl.runtime.context.context import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.local.local_cache import LocalCache
+from cl.runtime.db.write_behind.write_behind_db import WriteBehindDb
+from cl.runtime.log.log_message import LogMessage
+from stubs.cl.runtime import StubDataclassRecord
+
+
+def test_buffering():
+    """Test that buffered records are written on flush, before reads, and on batch size."""
+
+    with TestingContext() as context:
+        db = WriteBehindDb(db_id=context.db.db_id, db=context.db, record_types=[LogMessage], flush_interval=None)
+
+        # Records of other types are written immediately
+        db.save_one(StubDataclassRecord(id="abc"))
+        assert context.db.load_one(StubDataclassRecord, StubDataclassRecord(id="abc").get_key()) is not None
+
+        # Records are buffered and repeated saves of the same key are coalesced
+        messages = [LogMessage(message=f"Message {i}").init() for i in range(3)]
+        db.save_many(messages)
+        db.save_one(messages[0])
+        assert db.get_pending_count() == 3
+        assert context.db.count(LogMessage) == 0
+
+        # Read of a buffered type writes the buffer first
+        assert db.count(LogMessage) == 3
+        assert db.get_pending_count() == 0
+
+        # Records are written when the batch size is reached
+        db.max_batch_size = 2
+        db.save_one(LogMessage(message="Message 3"))
+        assert db.get_pending_count() == 1
+        db.save_one(LogMessage(message="Message 4"))
+        assert db.get_pending_count() == 0
+        assert context.db.count(LogMessage) == 5
+
+
+def test_flush_interval():
+    """Test that buffered records are written by the background thread."""
+
+    with TestingContext() as context:
+        db = WriteBehindDb(db_id=context.db.db_id, db=context.db, record_types=[LogMessage], flush_interval=0.05)
+        db.save_one(LogMessage(message="Message"))
+        for _ in range(200):
+            if context.db.count(LogMessage) == 1:
+                break
+            time.sleep(0.05)
+        assert context.db.count(LogMessage) == 1
+        assert db.get_pending_count() == 0
+
+
+def test_context_exit():
+    """Test that buffered records are written on exit from the context."""
+
+    with TestingContext() as context:
+        db = WriteBehindDb(db_id=context.db.db_id, db=context.db, record_types=[LogMessage], flush_interval=None)
+        with Context(db=db) as inner_context:
+            inner_context.save_one(LogMessage(message="Message"))
+            assert context.db.count(LogMessage) == 0
+        assert context.db.count(LogMessage) == 1
+
+
+def test_failed_write(monkeypatch):
+    """Test that records are returned to the buffer when the write fails."""
+
+    with TestingContext() as context:
+        db = WriteBehindDb(db_id=context.db.db_id, db=context.db, record_types=[LogMessage], flush_interval=None)
+        message = LogMessage(message="Message").init()
+        db.save_one(message)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("Write failed.")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(type(context.db), "save_many", fail)
+            with pytest.raises(RuntimeError):
+                db.flush()
+        assert db.get_pending_count() == 1
+
+        # The next attempt writes the record
+        db.flush()
+        assert db.get_pending_count() == 0
+        assert context.db.load_one(LogMessage, message.get_key()) == message
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,89 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import shutil
+from pathlib import Path
+from typing import List
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.file.snapshot_format_enum import SnapshotFormatEnum
+from cl.runtime.file.snapshot_util import SnapshotUtil
+from cl.runtime.records.protocols import RecordProtocol
+from stubs.cl.runtime import StubDataclassComposite
+from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassListFields
+from stubs.cl.runtime import StubDataclassNestedFields
+from stubs.cl.runtime import StubDataclassOptionalFields
+from stubs.cl.runtime import StubDataclassOtherDerivedRecord
+from stubs.cl.runtime import StubDataclassPrimitiveFields
+from stubs.cl.runtime import StubDataclassRecord
+
+stub_entries: List[List[RecordProtocol]] = [  # noqa
+    [StubDataclassRecord(id=f"abc1_n{i}") for i in range(5)]
+    + [StubDataclassDerivedRecord(id=f"abc2_n{i}") for i in range(5)]
+    + [StubDataclassDerivedFromDerivedRecord(id=f"abc3_n{i}") for i in range(5)]
+    + [StubDataclassOtherDerivedRecord(id=f"abc4_n{i}") for i in range(5)],
+    [StubDataclassNestedFields(id=f"abc5_n{i}") for i in range(5)],
+    [StubDataclassComposite(primitive=f"abc{i}") for i in range(5)],
+    [StubDataclassListFields(id=f"abc6_n{i}") for i in range(5)],
+    [StubDataclassOptionalFields(id=f"abc7_n{i}") for i in range(5)],
+    [StubDataclassPrimitiveFields(key_str_field=f"abc8_n{i}", obj_int_field=i) for i in range(5)],
+]
+"""Stub entries for testing, records in the same list are stored in the same table."""
+
+
+@pytest.mark.parametrize("file_format", [SnapshotFormatEnum.PARQUET, SnapshotFormatEnum.ARROW])
+def test_roundtrip(file_format: SnapshotFormatEnum):
+    """Test exporting tables to snapshot files and importing them back."""
+
+    dir_path = Path(__file__).parent.joinpath(f"test_snapshot_util_{file_format.name.lower()}")
+    with TestingContext() as context:
+        try:
+            for entries in stub_entries:
+                context.save_many(entries)
+
+            # Export with small batch size to test writing several batches to the same file
+            key_types = [type(entries[0]).get_key_type() for entries in stub_entries]
+            file_paths = SnapshotUtil.export_all(
+                str(dir_path), key_types=key_types, file_format=file_format, batch_size=3
+            )
+            assert len(file_paths) == len(stub_entries)
+
+            # Import to a different dataset and compare to the original records
+            imported_count = SnapshotUtil.import_all(str(dir_path), dataset="Snapshot", batch_size=4)
+            assert imported_count == sum(len(entries) for entries in stub_entries)
+            for key_type in key_types:
+                expected_records = list(context.load_all(key_type))
+                actual_records = list(context.load_all(key_type, dataset="Snapshot"))
+                assert actual_records == expected_records
+        finally:
+            shutil.rmtree(dir_path, ignore_errors=True)
+
+
+def test_export_all():
+    """Test exporting all non-empty tables in the schema."""
+
+    dir_path = Path(__file__).parent.joinpath("test_snapshot_util_all")
+    with TestingContext() as context:
+        try:
+            context.save_many(stub_entries[0])
+            file_paths = SnapshotUtil.export_all(str(dir_path))
+            assert [Path(x).name for x in file_paths] == ["StubDataclassRecordKey.parquet"]
+        finally:
+            shutil.rmtree(dir_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
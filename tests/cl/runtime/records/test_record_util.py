@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import pytest
+from typing import Dict
+from typing import List
 from typing_extensions import Self
 from cl.runtime.db.protocols import TKey
 from cl.runtime.records.record_util import RecordUtil
@@ -101,6 +103,28 @@ def test_is_instance():
     assert RecordUtil._is_instance(None, bool | None)
 
 
+def test_compile_is_instance():
+    """Test that compiled type checks have the same result as RecordUtil._is_instance."""
+
+    samples = [
+        (True, bool),
+        (1, float),
+        (1.0, float | None),
+        ("abc", int | None),
+        (["a", "b"], List[str]),
+        (["a", 1], List[str]),
+        ([1.0, None], List[float | None]),
+        ([["a"], ["b"]], List[List[str]]),
+        ({"a": 1.0}, Dict[str, float]),
+        ({"a": "b"}, Dict[str, float]),
+        ({"a": [1]}, Dict[str, List[int]]),
+        ([1], Dict[str, float]),
+    ]
+
+    for value, field_type in samples:
+        assert RecordUtil._compile_is_instance(field_type)(value) == bool(RecordUtil._is_instance(value, field_type))
+
+
 def test_validate():
     """Test RecordUtil.validate method."""
 
@@ -124,6 +148,12 @@ def test_validate():
     for sample in samples:
         RecordUtil.validate(sample)
 
+    # Type mismatch
+    sample = StubDataclassListFields(id="abc12")
+    sample.str_list = ["abc", 1]
+    with pytest.raises(RuntimeError):
+        RecordUtil.validate(sample)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
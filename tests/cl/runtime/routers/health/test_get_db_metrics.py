@@ -0,0 +1,54 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.instrumented.instrumented_db import InstrumentedDb
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.routers.health import health_router
+from stubs.cl.runtime import StubDataclassRecord
+
+
+def test_api():
+    """Test REST API for /health/metrics route."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        instrumented_db = InstrumentedDb(db_id=context.db.db_id, db=context.db)
+        instrumented_db.reset_stats()
+        instrumented_db.save_many([StubDataclassRecord(id=f"id{i}") for i in range(3)])
+
+        test_app = FastAPI()
+        test_app.include_router(health_router.router, prefix="", tags=["Health Check"])
+        with TestClient(test_app) as test_client:
+            response = test_client.get("/health/metrics")
+            assert response.status_code == 200
+            result = [x for x in response.json() if x["db_id"] == context.db.db_id]
+
+            # Check result
+            assert len(result) == 1
+            assert result[0]["method"] == "save_many"
+            assert result[0]["key_type"] == "StubDataclassRecordKey"
+            assert result[0]["call_count"] == 1
+            assert result[0]["row_count"] == 3
+            assert sum(result[0]["latency_buckets"].values()) == 1
+
+        instrumented_db.reset_stats()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,58 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.log.log_message import LogMessage
+from cl.runtime.routers.storage import storage_router
+from cl.runtime.routers.storage.search_request import SearchRequest
+from cl.runtime.routers.storage.search_response import SearchResponse
+
+
+def test_method():
+    """Test coroutine for /storage/search route."""
+
+    with TestingContext() as context:
+        # Save test records
+        context.save_many([LogMessage(message=x, level="Info") for x in ["SOFR 3M", "Fixed rate", "sofr 3m"]])
+
+        request_obj = SearchRequest(type_="LogMessage", module="cl.runtime.log.log_message", query="SOFR 3M")
+        result = SearchResponse.get_records(request_obj)
+
+        # Check if there are only "schema" and "data"
+        assert list(result.keys()) == ["schema", "data"]
+        assert [x["Message"] for x in result["data"]] == ["SOFR 3M", "sofr 3m"]
+
+
+def test_api():
+    """Test REST API for /storage/search route."""
+
+    with TestingContext() as context:
+        test_app = FastAPI()
+        test_app.include_router(storage_router.router, prefix="/storage", tags=["Storage"])
+        with TestClient(test_app) as test_client:
+            # Save test records
+            context.save_many([LogMessage(message=x, level="Info") for x in ["SOFR 3M", "Fixed rate", "sofr 3m"]])
+
+            request_params = {"type": "LogMessage", "module": "cl.runtime.log.log_message", "query": "3m", "limit": 1}
+            response = test_client.get("/storage/search", params=request_params)
+            assert response.status_code == 200
+            result = response.json()
+            assert [x["Message"] for x in result["data"]] == ["SOFR 3M"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -14,6 +14,8 @@
 
 import pytest
 from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.dict_serializer import DictSerializerPlan
+from cl.runtime.serialization.dict_serializer import alias_dict
 from stubs.cl.runtime import StubDataclassComposite
 from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
 from stubs.cl.runtime import StubDataclassDerivedRecord
@@ -62,5 +64,46 @@ def test_data_serialization():
         pass
 
 
+def test_plan():
+    """Test serialization with the cached per-type plan, including pascalized keys and selected fields."""
+
+    plan = DictSerializerPlan.for_type(StubDataclassDerivedRecord)
+    assert DictSerializerPlan.for_type(StubDataclassDerivedRecord) is plan
+    assert plan.field_types == (str, str)
+    assert plan.slots == ("id", "derived_str_field")
+    assert plan.get_pascal_slots() == ("Id", "DerivedStrField")
+
+    obj = StubDataclassDerivedRecord()
+    pascal_serializer = DictSerializer(pascalize_keys=True)
+    serialized = pascal_serializer.serialize_data(obj)
+    assert list(serialized.keys()) == ["Id", "DerivedStrField", "_type"]
+    assert pascal_serializer.deserialize_data(serialized) == obj
+
+    serialized = DictSerializer().serialize_data(obj, select_fields=["derived_str_field"])
+    assert serialized == {"derived_str_field": obj.derived_str_field, "_type": "StubDataclassDerivedRecord"}
+
+    # Alias registered after the plan is created is used
+    alias_dict[StubDataclassDerivedRecord] = "DerivedRecordAlias"
+    try:
+        serialized = DictSerializer().serialize_data(obj)
+        assert serialized["_type"] == "DerivedRecordAlias"
+        assert DictSerializer().deserialize_data(serialized) == obj
+    finally:
+        del alias_dict[StubDataclassDerivedRecord]
+
+
+def test_trusted():
+    """Test that trusted deserialization skips validation."""
+
+    # Field type does not match the declaration
+    serialized = {"id": 123, "_type": "StubDataclassRecord"}
+
+    with pytest.raises(RuntimeError):
+        DictSerializer().deserialize_data(serialized)
+
+    record = DictSerializer(trusted=True).deserialize_data(serialized)
+    assert record.id == 123
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,79 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.serialization.typed_flat_dict_serializer import TypedFlatDictSerializer
+from stubs.cl.runtime import StubDataclassComposite
+from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassDictFields
+from stubs.cl.runtime import StubDataclassDictListFields
+from stubs.cl.runtime import StubDataclassListDictFields
+from stubs.cl.runtime import StubDataclassListFields
+from stubs.cl.runtime import StubDataclassNestedFields
+from stubs.cl.runtime import StubDataclassOptionalFields
+from stubs.cl.runtime import StubDataclassOtherDerivedRecord
+from stubs.cl.runtime import StubDataclassPrimitiveFields
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassSingleton
+
+
+def test_data_serialization():
+    sample_types = [
+        StubDataclassRecord,
+        StubDataclassNestedFields,
+        StubDataclassComposite,
+        StubDataclassDerivedRecord,
+        StubDataclassDerivedFromDerivedRecord,
+        StubDataclassOtherDerivedRecord,
+        StubDataclassListFields,
+        StubDataclassOptionalFields,
+        StubDataclassDictFields,
+        StubDataclassDictListFields,
+        StubDataclassListDictFields,
+        StubDataclassPrimitiveFields,
+        StubDataclassSingleton,
+    ]
+
+    serializer = TypedFlatDictSerializer()
+
+    for sample_type in sample_types:
+        obj_1 = sample_type()
+        serialized_1 = serializer.serialize_data(obj_1, is_root=True)
+        obj_2 = serializer.deserialize_data(serialized_1)
+        serialized_2 = serializer.serialize_data(obj_2, is_root=True)
+
+        assert obj_1 == obj_2
+        assert serialized_1 == serialized_2
+
+
+def test_typed_values():
+    serializer = TypedFlatDictSerializer()
+
+    # Primitive fields are stored as native values, dates as ISO int, bool as int and enums by item name
+    serialized = serializer.serialize_data(StubDataclassPrimitiveFields(), is_root=True)
+    assert serialized["obj_date_field"] == 20030501
+    assert serialized["obj_bool_field"] == 1
+    assert serialized["obj_enum_field"] == "EnumValue1"
+    assert "_data" not in serialized
+
+    # Embedded keys are stored as key strings and other nested fields as a single JSON blob
+    serialized = serializer.serialize_data(StubDataclassListFields(), is_root=True)
+    assert set(serialized.keys()) == {"_type", "id", "_data"}
+    serialized = serializer.serialize_data(StubDataclassComposite(), is_root=True)
+    assert isinstance(serialized["embedded_1"], str)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
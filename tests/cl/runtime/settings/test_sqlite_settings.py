@@ -0,0 +1,29 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.settings.sqlite_settings import SqliteSettings
+
+
+def test_defaults():
+    """Test defaults for SqliteSettings class."""
+
+    sqlite_settings = SqliteSettings.instance()
+    assert sqlite_settings.journal_mode == "wal"
+    assert sqlite_settings.synchronous == "normal"
+    assert sqlite_settings.busy_timeout == 5000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])